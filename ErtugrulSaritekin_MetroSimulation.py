@@ -1,13 +1,41 @@
-from collections import defaultdict, deque
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import csv
+import gc
+import hashlib
 import heapq
+import json
+import mmap
+import operator
 import os
-from typing import Dict, List, Set, Tuple, Optional
+import random
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional
+
+# NumPy isteğe bağlı; varsa tüm çiftler tabloları vektörel Floyd–Warshall ile hesaplanır
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# PIL isteğe bağlı; Tkinter olmadan PNG harita çizimi (metro_harita.png_kaydet) için yeterlidir
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
 
 # Tkinter ve PIL kütüphanelerini isteğe bağlı olarak içe aktar
 try:
     import tkinter as tk
     from tkinter import Canvas, Label, Button, Frame, Toplevel
-    from PIL import Image, ImageTk
+    from PIL import ImageTk
     TKINTER_AVAILABLE = True
 except ImportError:
     TKINTER_AVAILABLE = False
@@ -15,6 +43,8 @@ except ImportError:
     print("Metin tabanlı arayüz kullanılacak.")
 
 class Istasyon:
+    __slots__ = ("idx", "ad", "hat", "komsular", "x", "y")
+
     def __init__(self, idx: str, ad: str, hat: str, x: float = 0, y: float = 0):
         self.idx = idx
         self.ad = ad
@@ -30,123 +60,2875 @@ class Istasyon:
         """İki istasyon arasındaki Öklid mesafesini hesaplar"""
         return ((self.x - diger_istasyon.x) ** 2 + (self.y - diger_istasyon.y) ** 2) ** 0.5
 
+# Hat değiştirirken rota süresine eklenen aktarma süresi (dakika)
+AKTARMA_SURESI = 2
+
+INF = float("inf")
+
+def _sure_degeri(sure: float):
+    """Tam sayı olan süreleri int olarak döndürür (27.0 yerine 27)"""
+    return int(sure) if sure != INF and sure == int(sure) else sure
+
+class AramaIstatistigi:
+    """Tek bir aramanın iş yükü sayaçları
+    
+    Arama motorlarına istatistik parametresi olarak verilir; verilmezse
+    sayaçlar yalnızca yerel değişkenlerde kalır. Motorlar arama sayaçlarını,
+    MetroAgi ise sorgu düzeyindeki alanları (motor, rota uzunluğu, süre) doldurur.
+    """
+    __slots__ = ("genisletilen", "incelenen_kenar", "kuyruk_ekleme", "kuyruk_tepe",
+                 "eski_atlanan", "motor", "rota_uzunlugu", "sure_ms")
+
+    def __init__(self):
+        self.genisletilen = 0  # Kuyruktan alınıp işlenen istasyon sayısı
+        self.incelenen_kenar = 0  # Genişletilen istasyonlardan incelenen kenar sayısı
+        self.kuyruk_ekleme = 0  # Kuyruğa/yığına eklenen kayıt sayısı
+        self.kuyruk_tepe = 0  # Kuyruğun ulaştığı en büyük boyut
+        self.eski_atlanan = 0  # Daha iyi etiketi bulunduğu için atlanan eski kayıtlar
+        self.motor = ""  # Sorguyu yanıtlayan motor (bfs, a_yildiz, tablo, ch, onbellek, ...)
+        self.rota_uzunlugu = 0  # Bulunan rotadaki istasyon sayısı (rota yoksa 0)
+        self.sure_ms = 0.0  # Sorgunun duvar saati süresi (milisaniye)
+
+    def sayaclari_yaz(self, genisletilen: int, incelenen_kenar: int, kuyruk_ekleme: int,
+                      kuyruk_tepe: int, eski_atlanan: int) -> None:
+        self.genisletilen = genisletilen
+        self.incelenen_kenar = incelenen_kenar
+        self.kuyruk_ekleme = kuyruk_ekleme
+        self.kuyruk_tepe = kuyruk_tepe
+        self.eski_atlanan = eski_atlanan
+
+    def sozluk(self) -> Dict[str, object]:
+        return {alan: getattr(self, alan) for alan in self.__slots__}
+
+class DerlenmisAg:
+    """Metro ağının dizi tabanlı (CSR) derlenmiş gösterimi
+    
+    Her istasyon yoğun bir tamsayı indeksi alır. i. istasyonun kenarları
+    hedefler/sureler/maliyetler/kenar_hatlari dizilerinin
+    ofsetler[i]:ofsetler[i + 1] aralığında tutulur. Arama algoritmaları
+    Istasyon nesneleri yerine bu dizilerle çalışır.
+    """
+    __slots__ = ("idler", "indeksler", "hat_adlari", "dugum_hatlari", "xler", "yler",
+                 "ofsetler", "hedefler", "sureler", "maliyetler", "kenar_hatlari",
+                 "sezgisel_olcek")
+
+    def __init__(self, istasyonlar: List[Istasyon]):
+        self.idler: List[str] = [istasyon.idx for istasyon in istasyonlar]
+        self.indeksler: Dict[str, int] = {idx: i for i, idx in enumerate(self.idler)}
+        
+        hat_indeksleri: Dict[str, int] = {}
+        for istasyon in istasyonlar:
+            hat_indeksleri.setdefault(istasyon.hat, len(hat_indeksleri))
+        self.hat_adlari: List[str] = list(hat_indeksleri)
+        self.dugum_hatlari = array("q", (hat_indeksleri[istasyon.hat] for istasyon in istasyonlar))
+        self.xler = array("d", (istasyon.x for istasyon in istasyonlar))
+        self.yler = array("d", (istasyon.y for istasyon in istasyonlar))
+        
+        # Komşuluk listelerini CSR dizilerine dönüştür (komşu sırası korunur)
+        self.ofsetler = array("q", [0])
+        self.hedefler = array("q")
+        self.sureler = array("d")  # Ham seyahat süresi
+        self.maliyetler = array("d")  # Aktarma süresi eklenmiş arama maliyeti
+        self.kenar_hatlari = array("q")  # Kenarın hattı, aktarma kenarı ise -1
+        for i, istasyon in enumerate(istasyonlar):
+            hat = self.dugum_hatlari[i]
+            for komsu, sure in istasyon.komsular:
+                j = self.indeksler[komsu.idx]
+                self.hedefler.append(j)
+                self.sureler.append(sure)
+                if self.dugum_hatlari[j] == hat:
+                    self.maliyetler.append(sure)
+                    self.kenar_hatlari.append(hat)
+                else:
+                    self.maliyetler.append(sure + AKTARMA_SURESI)
+                    self.kenar_hatlari.append(-1)
+            self.ofsetler.append(len(self.hedefler))
+        self.sezgisel_olcek = self._sezgisel_olcegi_hesapla()
+
+    @classmethod
+    def _dizilerden(cls, idler: List[str], hat_adlari: List[str], dugum_hatlari, xler, yler,
+                    ofsetler, hedefler, sureler, maliyetler, kenar_hatlari,
+                    sezgisel_olcek: float) -> "DerlenmisAg":
+        """Hazır dizilerden (örneğin anlık görüntüden) derlenmiş ağ oluşturur"""
+        ag = cls.__new__(cls)
+        ag.idler = idler
+        ag.indeksler = {idx: i for i, idx in enumerate(idler)}
+        ag.hat_adlari = hat_adlari
+        ag.dugum_hatlari = dugum_hatlari
+        ag.xler = xler
+        ag.yler = yler
+        ag.ofsetler = ofsetler
+        ag.hedefler = hedefler
+        ag.sureler = sureler
+        ag.maliyetler = maliyetler
+        ag.kenar_hatlari = kenar_hatlari
+        ag.sezgisel_olcek = sezgisel_olcek
+        return ag
+
+    def _sezgisel_olcegi_hesapla(self) -> float:
+        """Ağdaki en hızlı kenarın birim mesafe başına dakika değerini bulur
+        
+        Her kenarın maliyeti, uçları arasındaki Öklid mesafesinin bu ölçekle
+        çarpımından küçük olamaz. Bu yüzden ölçeklenmiş Öklid mesafesi hiçbir
+        zaman gerçek kalan süreyi aşmaz (kabul edilebilir sezgisel).
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        xler, yler = self.xler, self.yler
+        olcek = INF
+        for u in range(len(self.idler)):
+            for e in range(ofsetler[u], ofsetler[u + 1]):
+                v = hedefler[e]
+                mesafe = ((xler[u] - xler[v]) ** 2 + (yler[u] - yler[v]) ** 2) ** 0.5
+                if mesafe > 0:
+                    olcek = min(olcek, maliyetler[e] / mesafe)
+        return 0.0 if olcek == INF else olcek
+
+    def __len__(self) -> int:
+        return len(self.idler)
+
+    def kenarlar(self, u: int, v: int) -> List[int]:
+        """u'dan v'ye giden (kaldırılmamış) kenarların indeksleri"""
+        hedefler = self.hedefler
+        return [e for e in range(self.ofsetler[u], self.ofsetler[u + 1]) if hedefler[e] == v and u != v]
+
+    def kenar_maliyeti(self, u: int, v: int) -> float:
+        """u ile v arasındaki en ucuz kenarın maliyeti; kenar yoksa INF"""
+        return min((self.maliyetler[e] for e in self.kenarlar(u, v)), default=INF)
+
+    def _kenar_suresi_ata(self, u: int, e: int, sure: float) -> None:
+        """u'dan çıkan e kenarının süresini ve arama maliyetini günceller
+
+        Maliyet düşerse sezgisel ölçek, kabul edilebilir kalması için
+        gerekirse küçültülür; artışlarda ölçek geçerliliğini korur.
+        """
+        v = self.hedefler[e]
+        maliyet = sure + (AKTARMA_SURESI if self.kenar_hatlari[e] < 0 else 0)
+        self.sureler[e] = sure
+        self.maliyetler[e] = maliyet
+        mesafe = ((self.xler[u] - self.xler[v]) ** 2 + (self.yler[u] - self.yler[v]) ** 2) ** 0.5
+        if mesafe > 0 and maliyet / mesafe < self.sezgisel_olcek:
+            self.sezgisel_olcek = maliyet / mesafe
+
+    def _kenari_kaldir(self, u: int, e: int) -> None:
+        """Kenarı CSR yapısını bozmadan kaldırır
+
+        Kenar u'nun kendisine yönlendirilir ve maliyeti INF yapılır. u arama
+        sırasında zaten ziyaret edilmiş olduğundan BFS'ler, INF maliyet
+        yüzünden de Dijkstra/A* aramaları bu kenarı ek bir denetim olmadan atlar.
+        """
+        self.hedefler[e] = u
+        self.sureler[e] = INF
+        self.maliyetler[e] = INF
+
+    @staticmethod
+    def _rota_olustur(onceki: array, dugum: int) -> List[int]:
+        """Önceki-düğüm dizisini izleyerek rotayı sondan başa doğru kurar"""
+        rota = [dugum]
+        while onceki[dugum] != dugum:
+            dugum = onceki[dugum]
+            rota.append(dugum)
+        rota.reverse()
+        return rota
+
+    def bfs(self, baslangic: int, hedef: int,
+            istatistik: Optional[AramaIstatistigi] = None) -> Optional[List[int]]:
+        """En az duraklı rotayı istasyon indeksleri listesi olarak bulur
+        
+        Kuyrukta rota kopyaları yerine yalnızca indeksler tutulur; her istasyonun
+        önceki istasyonu kaydedilir ve rota hedefe ulaşıldığında bir kez kurulur.
+        """
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        onceki = array("q", [-1]) * len(self.idler)
+        onceki[baslangic] = baslangic
+        kuyruk = deque([baslangic])
+        sonuc = None
+        genisletilen = incelenen = tepe = 0
+        izle = istatistik is not None  # Kuyruk tepesi yalnızca istenirse izlenir
+        
+        while kuyruk:
+            if izle and len(kuyruk) > tepe:
+                tepe = len(kuyruk)
+            guncel = kuyruk.popleft()
+            genisletilen += 1
+            if guncel == hedef:
+                sonuc = self._rota_olustur(onceki, hedef)
+                break
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                if onceki[komsu] == -1:
+                    onceki[komsu] = guncel
+                    kuyruk.append(komsu)
+        
+        if izle:
+            # Her eklenen kayıt ya çıkarılmış ya da hâlâ kuyruktadır
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + len(kuyruk), tepe, 0)
+        return sonuc
+
+    def cift_yonlu_bfs(self, baslangic: int, hedef: int,
+                       istatistik: Optional[AramaIstatistigi] = None) -> Optional[List[int]]:
+        """En az duraklı rotayı başlangıç ve hedeften aynı anda ilerleyerek bulur
+        
+        Her adımda sınırı küçük olan taraf bir seviye genişletilir. Seviye
+        tamamlandığında iki arama buluşmuşsa, bulunan en kısa birleşim rotası
+        döndürülür. Uzak istasyonlarda tek yönlü aramaya göre çok daha az
+        istasyon ziyaret edilir.
+        """
+        if baslangic == hedef:
+            if istatistik is not None:
+                istatistik.sayaclari_yaz(0, 0, 0, 0, 0)
+            return [baslangic]
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        n = len(self.idler)
+        onceki_ileri = array("q", [-1]) * n
+        onceki_geri = array("q", [-1]) * n
+        mesafe_ileri = array("q", [0]) * n
+        mesafe_geri = array("q", [0]) * n
+        onceki_ileri[baslangic] = baslangic
+        onceki_geri[hedef] = hedef
+        sinir_ileri = [baslangic]
+        sinir_geri = [hedef]
+        sonuc = None
+        genisletilen = incelenen = tepe = 0
+        ekleme = 2
+        
+        while sinir_ileri and sinir_geri:
+            if len(sinir_ileri) + len(sinir_geri) > tepe:
+                tepe = len(sinir_ileri) + len(sinir_geri)
+            if len(sinir_ileri) <= len(sinir_geri):
+                sinir, onceki, mesafe = sinir_ileri, onceki_ileri, mesafe_ileri
+                diger_onceki, diger_mesafe = onceki_geri, mesafe_geri
+                ileri = True
+            else:
+                sinir, onceki, mesafe = sinir_geri, onceki_geri, mesafe_geri
+                diger_onceki, diger_mesafe = onceki_ileri, mesafe_ileri
+                ileri = False
+            
+            # Sınırı bir seviye genişlet, buluşma noktalarının en iyisini sakla
+            yeni_sinir = []
+            en_iyi = None  # (toplam uzunluk, bu taraftaki düğüm, diğer taraftaki düğüm)
+            genisletilen += len(sinir)
+            for guncel in sinir:
+                bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+                incelenen += bit - bas
+                for e in range(bas, bit):
+                    komsu = hedefler[e]
+                    if diger_onceki[komsu] != -1:
+                        uzunluk = mesafe[guncel] + 1 + diger_mesafe[komsu]
+                        if en_iyi is None or uzunluk < en_iyi[0]:
+                            en_iyi = (uzunluk, guncel, komsu)
+                    if onceki[komsu] == -1:
+                        onceki[komsu] = guncel
+                        mesafe[komsu] = mesafe[guncel] + 1
+                        yeni_sinir.append(komsu)
+            ekleme += len(yeni_sinir)
+            
+            if en_iyi is not None:
+                _, bu_taraf, diger_taraf = en_iyi
+                if ileri:
+                    yari1 = self._rota_olustur(onceki_ileri, bu_taraf)
+                    yari2 = self._rota_olustur(onceki_geri, diger_taraf)
+                else:
+                    yari1 = self._rota_olustur(onceki_ileri, diger_taraf)
+                    yari2 = self._rota_olustur(onceki_geri, bu_taraf)
+                yari2.reverse()
+                sonuc = yari1 + yari2
+                break
+            
+            if ileri:
+                sinir_ileri = yeni_sinir
+            else:
+                sinir_geri = yeni_sinir
+        
+        if istatistik is not None:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, ekleme, tepe, 0)
+        return sonuc
+
+    def en_az_aktarma_dijkstra(self, baslangic: int, hedef: int,
+                               istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[int], int, float]]:
+        """En az hat değişimli rotayı aktarma seviyeleri üzerinde bulur
+
+        Aynı hat üzerindeki kenarların maliyeti 0, hat değiştiren (aktarma)
+        kenarların maliyeti 1'dir. İstasyonlar (aktarma sayısı, süre) sırasıyla
+        kesinleşir: k. seviye, k aktarmayla ulaşılan istasyonlardan başlayan
+        ve yalnızca 0 maliyetli kenarları izleyen bir Dijkstra'dır; aktarma
+        kenarları bir sonraki seviyenin başlangıç kümesine yazılır. Böylece
+        aynı aktarma sayısındaki rotalar arasında süresi kısa olan seçilir.
+
+        Her istasyon bir kez genişletilir; süre eşitliğini bozma yığın
+        gerektirdiğinden karmaşıklık O(m log n)'dir. Yalnızca aktarma sayısı
+        gerekseydi düz 0-1 BFS doğrusal zamanda çalışırdı, ama süreyi
+        iyileştiren her gevşetmede istasyon yeniden kuyruğa girer ve en kötü
+        durum doğrusal olmaktan çıkar.
+
+        (indeks listesi, aktarma sayısı, toplam süre) döndürür.
+        """
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        maliyetler, kenar_hatlari = self.maliyetler, self.kenar_hatlari
+        n = len(self.idler)
+        aktarma = array("q", [-1]) * n
+        sure = array("d", [INF]) * n
+        onceki = array("q", [-1]) * n
+        aktarma[baslangic] = 0
+        sure[baslangic] = 0.0
+        onceki[baslangic] = baslangic
+        k = 0
+        pq = [(0.0, baslangic)]  # Geçerli seviyenin (süre, istasyon) yığını
+        sonraki_seviye = []
+        bulundu = False
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+
+        while pq and not bulundu:
+            while pq:
+                if izle and len(pq) + len(sonraki_seviye) > tepe:
+                    tepe = len(pq) + len(sonraki_seviye)
+                t, guncel = heapq.heappop(pq)
+                if k != aktarma[guncel] or t != sure[guncel]:
+                    eski += 1
+                    continue  # Daha iyi bir etiketle güncellenmiş, eski kayıt
+                genisletilen += 1
+                if guncel == hedef:
+                    bulundu = True
+                    break
+                bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+                incelenen += bit - bas
+                for e in range(bas, bit):
+                    komsu = hedefler[e]
+                    hat_degisimi = kenar_hatlari[e] < 0
+                    yeni_k = k + 1 if hat_degisimi else k
+                    yeni_t = t + maliyetler[e]
+                    eski_k = aktarma[komsu]
+                    if eski_k == -1 or yeni_k < eski_k or (yeni_k == eski_k and yeni_t < sure[komsu]):
+                        aktarma[komsu] = yeni_k
+                        sure[komsu] = yeni_t
+                        onceki[komsu] = guncel
+                        if hat_degisimi:
+                            sonraki_seviye.append((yeni_t, komsu))
+                        else:
+                            heapq.heappush(pq, (yeni_t, komsu))
+            if not bulundu:
+                k += 1
+                pq, sonraki_seviye = sonraki_seviye, []
+                heapq.heapify(pq)
+
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen,
+                                     genisletilen + eski + len(pq) + len(sonraki_seviye), tepe, eski)
+        if aktarma[hedef] == -1:
+            return None
+        return (self._rota_olustur(onceki, hedef), aktarma[hedef], sure[hedef])
+
+    def pareto_arama(self, baslangic: int, hedef: int,
+                     istatistik: Optional[AramaIstatistigi] = None) -> List[Tuple[List[int], float, int]]:
+        """(toplam süre, hat değişimi) için Pareto cephesini tek aramada bulur
+
+        Etiket düzeltmeli (label-setting) çok kriterli bir A*'dır. Etiketler
+        kuyruktan (f, aktarma) sırasıyla çıktığı için bir istasyonda daha önce
+        kesinleşmiş her etiketin süresi yenisinden küçük ya da eşittir; bu
+        yüzden yeni etiketin baskın olmaması için aktarması o istasyondaki en
+        az aktarmadan küçük olmalıdır. Baskınlık denetimi böylece istasyon
+        başına tek bir sayıya iner; hedefte kesinleşmiş aktarma sayısına
+        ulaşan etiketler de budanır.
+
+        Etiketler (süre, istasyon, önceki etiket) paralel dizilerinde tutulur;
+        aktarma sayısı yalnızca kuyruk kaydında taşınır. Sonuç süresi artan,
+        aktarması azalan (indeks listesi, süre, aktarma) listesidir: ilki en
+        hızlı, sonuncusu en az aktarmalı rotadır.
+        """
+        return self.coklu_pareto_arama([baslangic], {hedef}, self.xler[hedef], self.yler[hedef],
+                                       self.sezgisel_olcek, istatistik)
+
+    def coklu_pareto_arama(self, baslangiclar: Iterable[int], bitisler: Set[int],
+                           hx: float, hy: float, olcek: float,
+                           istatistik: Optional[AramaIstatistigi] = None) -> List[Tuple[List[int], float, int]]:
+        """pareto_arama'nın çok kaynaklı ve çok hedefli biçimi
+
+        Tüm başlangıç istasyonları süre 0 ve aktarma 0 ile kuyruğa girer;
+        bitislerden herhangi birinde kesinleşen etiket cepheye eklenir ve
+        hedefteki en az aktarma sayısı tüm bitişler için ortaktır. Sezgisel
+        coklu_a_yildiz'daki gibi (hx, hy) noktasına Öklid mesafesinin olcek
+        ile çarpımıdır; bitişler farklı konumlardaysa olcek 0 verilmelidir.
+        Sonuç pareto_arama ile aynı biçimdedir; rotalar seçilen başlangıç ve
+        bitiş istasyonlarıyla başlar ve biter.
+        """
+        ofsetler, hedefler = self.ofsetler, self.hedefler
+        maliyetler, kenar_hatlari = self.maliyetler, self.kenar_hatlari
+        xler, yler = self.xler, self.yler
+        en_az_aktarma = array("q", [sys.maxsize]) * len(self.idler)
+        hedef_en_az = sys.maxsize  # Herhangi bir bitişte kesinleşmiş en az aktarma
+
+        etiket_sure = array("d")
+        etiket_dugum = array("q")
+        etiket_onceki = array("q")
+        pq = []
+        for baslangic in baslangiclar:
+            etiket_sure.append(0.0)
+            etiket_dugum.append(baslangic)
+            etiket_onceki.append(-1)
+            pq.append((olcek * ((xler[baslangic] - hx) ** 2 + (yler[baslangic] - hy) ** 2) ** 0.5,
+                       0, len(etiket_dugum) - 1))
+        heapq.heapify(pq)
+        cephe = []
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+
+        while pq:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            _, k, etiket = heapq.heappop(pq)
+            guncel = etiket_dugum[etiket]
+            if k >= en_az_aktarma[guncel] or k >= hedef_en_az:
+                eski += 1
+                continue  # Aynı istasyonda ya da hedefte baskın bir etiket kesinleşmiş
+            en_az_aktarma[guncel] = k
+            genisletilen += 1
+            t = etiket_sure[etiket]
+            if guncel in bitisler:
+                hedef_en_az = k
+                rota = []
+                while etiket != -1:
+                    rota.append(etiket_dugum[etiket])
+                    etiket = etiket_onceki[etiket]
+                rota.reverse()
+                cephe.append((rota, t, k))
+                if k == 0:
+                    break  # Daha az aktarmalı bir rota olamaz
+                continue
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_k = k + 1 if kenar_hatlari[e] < 0 else k
+                if yeni_k >= en_az_aktarma[komsu] or yeni_k >= hedef_en_az:
+                    continue
+                yeni_t = t + maliyetler[e]
+                if yeni_t == INF:
+                    continue  # Kaldırılmış kenar
+                etiket_sure.append(yeni_t)
+                etiket_dugum.append(komsu)
+                etiket_onceki.append(etiket)
+                h_score = olcek * ((xler[komsu] - hx) ** 2 + (yler[komsu] - hy) ** 2) ** 0.5
+                heapq.heappush(pq, (yeni_t + h_score, yeni_k, len(etiket_dugum) - 1))
+
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        return cephe
+
+    def a_yildiz(self, baslangic: int, hedef: int,
+                 istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[int], float]]:
+        """En hızlı rotayı (indeks listesi, toplam süre) olarak bulur
+        
+        En iyi g değeri ve önceki istasyon dizilerde tutulur; öncelik kuyruğuna
+        rota kopyası yerine yalnızca (f, g, indeks) eklenir ve g değeri
+        güncelliğini yitirmiş kayıtlar atlanır. Sezgisel, Öklid mesafesinin
+        sezgisel_olcek (dakika/birim) ile çarpımıdır; kabul edilebilir ve
+        tutarlı olduğundan bulunan rota her zaman en hızlısıdır.
+        
+        Aktarma süresi arama durumunun parçasıdır: her istasyon tek bir hatta
+        ait olduğundan istasyon indeksi o anki hattı da belirler ve hat
+        değiştiren kenarların maliyetine AKTARMA_SURESI eklenmiştir.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        xler, yler = self.xler, self.yler
+        hx, hy = xler[hedef], yler[hedef]
+        olcek = self.sezgisel_olcek
+        n = len(self.idler)
+        g = array("d", [INF]) * n
+        onceki = array("q", [-1]) * n
+        g[baslangic] = 0.0
+        onceki[baslangic] = baslangic
+        
+        h_score = olcek * ((xler[baslangic] - hx) ** 2 + (yler[baslangic] - hy) ** 2) ** 0.5
+        pq = [(h_score, 0.0, baslangic)]
+        sonuc = None
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+        
+        while pq:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            _, g_score, guncel = heapq.heappop(pq)
+            if g_score > g[guncel]:
+                eski += 1
+                continue  # Eski kayıt
+            genisletilen += 1
+            if guncel == hedef:
+                sonuc = (self._rota_olustur(onceki, hedef), g_score)
+                break
+            
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_g_score = g_score + maliyetler[e]
+                if yeni_g_score < g[komsu]:
+                    g[komsu] = yeni_g_score
+                    onceki[komsu] = guncel
+                    h_score = olcek * ((xler[komsu] - hx) ** 2 + (yler[komsu] - hy) ** 2) ** 0.5
+                    heapq.heappush(pq, (yeni_g_score + h_score, yeni_g_score, komsu))
+        
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        return sonuc
+
+    def alt_a_yildiz(self, baslangic: int, hedef: int, yer_isaretleri: "YerIsaretleri",
+                     istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[int], float]]:
+        """a_yildiz'in yer işaretleri (ALT) sezgiseliyle çalışan biçimi
+
+        Sezgisel, üçgen eşitsizliğinden gelen max |d(L, t) - d(L, u)| alt
+        sınırı ile Öklid sezgiselinin büyüğüdür. İkisi de kabul edilebilir ve
+        tutarlı olduğundan büyüğü de öyledir; bulunan rota a_yildiz'inkiyle
+        aynı sürededir, ama uzun rotalarda çok daha az istasyon genişletilir.
+        Her istasyonun sezgisel değeri bir kez hesaplanır.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        xler, yler = self.xler, self.yler
+        hx, hy = xler[hedef], yler[hedef]
+        olcek = self.sezgisel_olcek
+        k = len(yer_isaretleri.yer_isaretleri)
+        tablo = yer_isaretleri.mesafeler
+        hedef_mesafeleri = tablo[hedef * k:(hedef + 1) * k].tolist()
+        # Hedefe ulaşamayan yer işaretleri (başka bileşendekiler) sınır vermez
+        kullanilan = [(i, d) for i, d in enumerate(hedef_mesafeleri) if d < INF]
+        tumu = len(kullanilan) == k
+        n = len(self.idler)
+        g = array("d", [INF]) * n
+        h = array("d", [-1.0]) * n
+        onceki = array("q", [-1]) * n
+        g[baslangic] = 0.0
+        onceki[baslangic] = baslangic
+
+        def sezgisel(u: int) -> float:
+            b = u * k
+            if tumu:
+                alt_sinir = max(map(abs, map(operator.sub, tablo[b:b + k], hedef_mesafeleri)), default=0.0)
+            else:
+                alt_sinir = max((abs(tablo[b + i] - d) for i, d in kullanilan), default=0.0)
+            oklid = olcek * ((xler[u] - hx) ** 2 + (yler[u] - hy) ** 2) ** 0.5
+            return alt_sinir if alt_sinir > oklid else oklid
+
+        h[baslangic] = sezgisel(baslangic)
+        pq = [(h[baslangic], 0.0, baslangic)]
+        sonuc = None
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+
+        while pq:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            _, g_score, guncel = heapq.heappop(pq)
+            if g_score > g[guncel]:
+                eski += 1
+                continue  # Eski kayıt
+            genisletilen += 1
+            if guncel == hedef:
+                sonuc = (self._rota_olustur(onceki, hedef), g_score)
+                break
+
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_g_score = g_score + maliyetler[e]
+                if yeni_g_score < g[komsu]:
+                    g[komsu] = yeni_g_score
+                    onceki[komsu] = guncel
+                    h_score = h[komsu]
+                    if h_score < 0:
+                        h_score = h[komsu] = sezgisel(komsu)
+                    heapq.heappush(pq, (yeni_g_score + h_score, yeni_g_score, komsu))
+
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        return sonuc
+
+    def coklu_a_yildiz(self, baslangiclar: Dict[int, float], bitisler: Dict[int, float],
+                       hx: float, hy: float, olcek: float,
+                       istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[int], float]]:
+        """Çok kaynaklı ve çok hedefli tek bir A* araması
+
+        baslangiclar her başlangıç istasyonunun başlangıç maliyetini, bitisler
+        her bitiş istasyonundan sonra eklenecek maliyeti (örneğin yürüme
+        süresi) verir. Sezgisel, istasyonun (hx, hy) noktasına Öklid
+        mesafesinin olcek ile çarpımıdır; olcek hem sezgisel_olcek'ten hem de
+        bitiş maliyetinin birim mesafe başına değerinden büyük olmamalıdır.
+        Kuyruktaki en küçük f değeri bulunan en iyi toplamı aştığında arama
+        durur. (indeks listesi, bitiş maliyeti dahil toplam) döndürür.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        xler, yler = self.xler, self.yler
+        g: Dict[int, float] = {}
+        onceki: Dict[int, int] = {}
+        pq = []
+        for dugum, maliyet in baslangiclar.items():
+            if maliyet < g.get(dugum, INF):
+                g[dugum] = maliyet
+                onceki[dugum] = dugum
+                pq.append((maliyet + olcek * ((xler[dugum] - hx) ** 2 + (yler[dugum] - hy) ** 2) ** 0.5,
+                           maliyet, dugum))
+        heapq.heapify(pq)
+        en_iyi, en_iyi_dugum = INF, -1
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+
+        while pq and pq[0][0] < en_iyi:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            _, g_score, guncel = heapq.heappop(pq)
+            if g_score > g[guncel]:
+                eski += 1
+                continue
+            genisletilen += 1
+            toplam = g_score + bitisler.get(guncel, INF)
+            if toplam < en_iyi:
+                en_iyi, en_iyi_dugum = toplam, guncel
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_g = g_score + maliyetler[e]
+                if yeni_g < g.get(komsu, INF):
+                    g[komsu] = yeni_g
+                    onceki[komsu] = guncel
+                    h_score = olcek * ((xler[komsu] - hx) ** 2 + (yler[komsu] - hy) ** 2) ** 0.5
+                    heapq.heappush(pq, (yeni_g + h_score, yeni_g, komsu))
+
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        if en_iyi_dugum == -1:
+            return None
+        rota = [en_iyi_dugum]
+        while onceki[rota[-1]] != rota[-1]:
+            rota.append(onceki[rota[-1]])
+        rota.reverse()
+        return rota, en_iyi
+
+    def dijkstra_agaci(self, kaynak: int, hedef_kumesi: Optional[Set[int]] = None,
+                       istatistik: Optional[AramaIstatistigi] = None) -> Tuple[array, array]:
+        """Kaynaktan tüm istasyonlara en kısa süreleri ve önceki istasyonları bulur
+        
+        Ağ yönsüz olduğundan onceki[u], u'dan kaynağa giden en hızlı rotadaki
+        bir sonraki istasyondur. Ulaşılamayan istasyonların süresi INF,
+        önceki değeri -1'dir. hedef_kumesi verilirse arama, kümedeki tüm
+        istasyonların süresi kesinleştiğinde durur.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        n = len(self.idler)
+        mesafe = array("d", [INF]) * n
+        onceki = array("q", [-1]) * n
+        mesafe[kaynak] = 0.0
+        onceki[kaynak] = kaynak
+        pq = [(0.0, kaynak)]
+        kalan = len(hedef_kumesi) if hedef_kumesi is not None else -1
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+        
+        while pq:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            d, guncel = heapq.heappop(pq)
+            if d > mesafe[guncel]:
+                eski += 1
+                continue
+            genisletilen += 1
+            if kalan > 0 and guncel in hedef_kumesi:
+                kalan -= 1
+                if kalan == 0:
+                    break
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_d = d + maliyetler[e]
+                if yeni_d < mesafe[komsu]:
+                    mesafe[komsu] = yeni_d
+                    onceki[komsu] = guncel
+                    heapq.heappush(pq, (yeni_d, komsu))
+        
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        return mesafe, onceki
+
+    def erisilebilir(self, kaynak: int, butce: float,
+                     istatistik: Optional[AramaIstatistigi] = None) -> Tuple[array, array]:
+        """Kaynaktan butce dakika içinde ulaşılan istasyonları bulur
+
+        Aktarma cezası dahil maliyetlerle sınırlı bir Dijkstra çalışır: süresi
+        bütçeyi aşan istasyonlar kuyruğa hiç girmez, böylece arama yalnızca
+        bütçe çemberindeki istasyonları genişletir. Süreye göre artan sırada
+        (istasyonlar, süreler) dizileri döndürür; kaynak süre 0 ile ilk sıradadır.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        mesafe = {kaynak: 0.0}
+        dugumler = array("q")
+        sureler = array("d")
+        pq = [(0.0, kaynak)]
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+
+        while pq:
+            if izle and len(pq) > tepe:
+                tepe = len(pq)
+            d, guncel = heapq.heappop(pq)
+            if d > mesafe[guncel]:
+                eski += 1
+                continue
+            genisletilen += 1
+            dugumler.append(guncel)
+            sureler.append(d)
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_d = d + maliyetler[e]
+                if yeni_d <= butce and yeni_d < mesafe.get(komsu, INF):
+                    mesafe[komsu] = yeni_d
+                    heapq.heappush(pq, (yeni_d, komsu))
+
+        if izle:
+            istatistik.sayaclari_yaz(genisletilen, incelenen, genisletilen + eski + len(pq), tepe, eski)
+        return dugumler, sureler
+
+    def toplu_erisilebilir(self, kaynaklar: List[int], butce: float) -> "np.ndarray":
+        """Birçok kaynak için erişilebilirliği tek seferde, NumPy ile hesaplar
+
+        (len(kaynaklar), n) boyutlu bir süre matrisi döndürür; bütçeyi aşan
+        ya da ulaşılamayan istasyonların süresi inf'tir. Tüm kaynakların
+        arama sınırları (kaynak, istasyon) çiftleri olarak birlikte tutulur
+        ve her turda yalnızca son turda iyileşen çiftlerin kenarları
+        vektörel olarak gevşetilir (etkin küme Bellman–Ford). Bütçeyi aşan
+        adaylar sınıra girmediğinden iş, erisilebilir'in toplamıyla orantılıdır.
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Toplu erişilebilirlik için NumPy kütüphanesi gerekli.")
+        n = len(self.idler)
+        ofsetler = np.asarray(self.ofsetler, dtype=np.int64)
+        derece = np.diff(ofsetler)
+        hedefler = np.asarray(self.hedefler, dtype=np.int64)
+        maliyetler = np.asarray(self.maliyetler, dtype=np.float64)
+
+        sonuc = np.full((len(kaynaklar), n), np.inf)
+        D = sonuc.reshape(-1)
+        # Sınır, düz matris konumları (satır * n + istasyon) olarak tutulur
+        sinir = np.arange(len(kaynaklar), dtype=np.int64) * n + np.asarray(kaynaklar, dtype=np.int64)
+        D[sinir] = 0.0
+        while sinir.size:
+            dugum = sinir % n
+            adet = derece[dugum]
+            toplam = int(adet.sum())
+            if not toplam:
+                break
+            # Her sınır çiftinin kenarları tek bir dizide açılır
+            kayma = np.repeat(ofsetler[dugum] - (np.cumsum(adet) - adet), adet)
+            kenar = kayma + np.arange(toplam)
+            aday = np.repeat(D[sinir], adet) + maliyetler[kenar]
+            konum = np.repeat(sinir - dugum, adet) + hedefler[kenar]
+            iyi = (aday <= butce) & (aday < D[konum])
+            if not iyi.any():
+                break
+            konum = konum[iyi]
+            np.minimum.at(D, konum, aday[iyi])
+            sinir = np.unique(konum)
+        return sonuc
+
+    def alternatif_rotalar(self, baslangic: int, hedef: int, k: int,
+                           en_fazla_ortaklik: float = 0.8, son_an: Optional[float] = None,
+                           agac: Optional[Tuple[object, object]] = None) -> List[Tuple[List[int], float]]:
+        """En hızlı k rotayı Yen algoritmasıyla bulur; birbirine çok benzeyenleri eler
+
+        Hedeften bir kez ters en kısa yol ağacı kurulur (agac verilmişse o
+        kullanılır: hedefe süre ve hedefe doğru sonraki istasyon dizileri).
+        Her sapma araması bu ağaçtaki kalan süreyi kesin sezgisel olarak
+        kullanan bir A*'dır; sapma istasyonunun ağaçtaki yolu engellenmiş
+        istasyon ve kenarlara değmiyorsa arama yapılmadan doğrudan alınır.
+
+        Bir aday, seçilmiş rotalardan biriyle ortak kenarlarının süresi kendi
+        süresinin en_fazla_ortaklik oranını aşıyorsa elenir. Aktarma
+        istasyonları aynı konumda ayrı düğümler olduğundan düğüm tekrarı
+        içermeyen bir aday da bir istasyondan çıkıp ona başka hattan geri
+        dönebilir; aynı konumdan ardışık olmayan iki kez geçen adaylar da
+        elenir. Elenen adaylar yine de yeni sapmaların kaynağı olur. Aday
+        sayısı 20 * k ile sınırlıdır.
+        son_an (time.perf_counter değeri) geçildiğinde o ana kadar seçilen
+        rotalar döndürülür. Sonuç (indeks listesi, toplam süre) listesidir.
+        """
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        h, sonraki = agac if agac is not None else self.dijkstra_agaci(hedef)
+        if h[baslangic] == INF or k <= 0:
+            return []
+
+        def agac_yolu(dugum: int) -> List[int]:
+            yol = [dugum]
+            while dugum != hedef:
+                dugum = sonraki[dugum]
+                yol.append(dugum)
+            return yol
+
+        def sapma_ara(kaynak: int, engelli: Set[int], engelli_ilk: Set[int]) -> Optional[Tuple[List[int], float]]:
+            yol = agac_yolu(kaynak)
+            if (len(yol) == 1 or yol[1] not in engelli_ilk) and engelli.isdisjoint(yol):
+                return yol, h[kaynak]
+            # Sezgisel kesin olduğundan eşit f değerlerinde g'si büyük olan (hedefe
+            # yakın) kayıt önce çıkarılır; böylece eşit süreli platolar taranmaz
+            g = {kaynak: 0.0}
+            onceki = {kaynak: kaynak}
+            pq = [(h[kaynak], -0.0, kaynak)]
+            while pq:
+                _, eksi_g, guncel = heapq.heappop(pq)
+                g_score = -eksi_g
+                if g_score > g[guncel]:
+                    continue
+                if guncel == hedef:
+                    yol = [hedef]
+                    while yol[-1] != kaynak:
+                        yol.append(onceki[yol[-1]])
+                    yol.reverse()
+                    return yol, g_score
+                for e in range(ofsetler[guncel], ofsetler[guncel + 1]):
+                    komsu = hedefler[e]
+                    if komsu in engelli or h[komsu] == INF or (guncel == kaynak and komsu in engelli_ilk):
+                        continue
+                    yeni_g = g_score + maliyetler[e]
+                    if yeni_g < g.get(komsu, INF):
+                        g[komsu] = yeni_g
+                        onceki[komsu] = guncel
+                        heapq.heappush(pq, (yeni_g + h[komsu], -yeni_g, komsu))
+            return None
+
+        def istasyona_donuyor(rota: List[int]) -> bool:
+            # Aktarma istasyonları aynı konumda ayrı düğümlerdir; ardışık olmayan
+            # bir konum tekrarı aynı istasyondan iki kez geçmek demektir
+            gorulen_konumlar = set()
+            onceki_konum = None
+            for dugum in rota:
+                konum = (self.xler[dugum], self.yler[dugum])
+                if konum != onceki_konum and konum in gorulen_konumlar:
+                    return True
+                gorulen_konumlar.add(konum)
+                onceki_konum = konum
+            return False
+
+        def kenar_sureleri(rota: List[int]) -> Dict[Tuple[int, int], float]:
+            return {(min(a, b), max(a, b)): self.kenar_maliyeti(a, b) for a, b in zip(rota, rota[1:])}
+
+        ilk = agac_yolu(baslangic)
+        bulunanlar = [ilk]
+        secilenler = [(ilk, h[baslangic])]
+        secilen_kenarlar = [kenar_sureleri(ilk)]
+        adaylar: List[Tuple[float, List[int]]] = []
+        gorulen = {tuple(ilk)}
+
+        while len(secilenler) < k and len(bulunanlar) < 20 * k:
+            son = bulunanlar[-1]
+            on_sure = 0.0
+            for i in range(len(son) - 1):
+                if son_an is not None and time.perf_counter() > son_an:
+                    return secilenler
+                kok = son[:i + 1]
+                engelli_ilk = {rota[i + 1] for rota in bulunanlar if rota[:i + 1] == kok and len(rota) > i + 1}
+                sapma = sapma_ara(son[i], set(kok[:-1]), engelli_ilk)
+                if sapma is not None:
+                    aday = kok[:-1] + sapma[0]
+                    if tuple(aday) not in gorulen:
+                        gorulen.add(tuple(aday))
+                        heapq.heappush(adaylar, (on_sure + sapma[1], aday))
+                on_sure += self.kenar_maliyeti(son[i], son[i + 1])
+            if not adaylar:
+                break
+            sure, aday = heapq.heappop(adaylar)
+            bulunanlar.append(aday)
+            if istasyona_donuyor(aday):
+                continue
+            kenarlar = kenar_sureleri(aday)
+            if all(sum(maliyet for kenar, maliyet in kenarlar.items() if kenar in secilen) <= en_fazla_ortaklik * sure
+                   for secilen in secilen_kenarlar):
+                secilenler.append((aday, sure))
+                secilen_kenarlar.append(kenarlar)
+        return secilenler
+
+    def ozet(self) -> bytes:
+        """İstasyonlardan ve bağlantılardan türetilen SHA-256 özeti
+        
+        Diske kaydedilen ön hesaplamaların hangi ağa ait olduğunu
+        doğrulamak için kullanılır.
+        """
+        h = hashlib.sha256()
+        h.update("\0".join(self.idler).encode("utf-8"))
+        h.update("\0".join(self.hat_adlari).encode("utf-8"))
+        for dizi in (self.dugum_hatlari, self.ofsetler, self.hedefler, self.sureler, self.maliyetler):
+            h.update(dizi.tobytes())
+        return h.digest()
+
+class KonumIndeksi:
+    """İstasyon koordinatları için düzgün ızgara (uniform grid) uzamsal indeksi
+
+    Koordinat düzlemi, hücre başına ortalama iki istasyon düşecek boyutta kare
+    hücrelere bölünür. Hücrelerin istasyon indeksleri CSR dizilerinde tutulur:
+    h. hücrenin istasyonları elemanlar[ofsetler[h]:ofsetler[h + 1]] aralığındadır.
+    Sorgular yalnızca ilgili hücrelere bakar; tüm istasyonlar taranmaz.
+    """
+    __slots__ = ("xler", "yler", "min_x", "min_y", "hucre", "sutun", "satir", "ofsetler", "elemanlar")
+
+    def __init__(self, xler, yler):
+        self.xler, self.yler = xler, yler
+        n = len(xler)
+        self.min_x = min(xler, default=0.0)
+        self.min_y = min(yler, default=0.0)
+        genislik = max(xler, default=0.0) - self.min_x
+        yukseklik = max(yler, default=0.0) - self.min_y
+        alan = max(genislik * yukseklik, genislik, yukseklik, 1e-9)
+        self.hucre = (2 * alan / max(n, 1)) ** 0.5
+        self.sutun = int(genislik / self.hucre) + 1
+        self.satir = int(yukseklik / self.hucre) + 1
+
+        # Sayarak sıralama: önce hücre dolulukları, sonra elemanların yerleştirilmesi
+        hucreler = [self._hucre_no(*self._hucre_xy(xler[i], yler[i])) for i in range(n)]
+        self.ofsetler = array("q", [0]) * (self.sutun * self.satir + 1)
+        for h in hucreler:
+            self.ofsetler[h + 1] += 1
+        for h in range(self.sutun * self.satir):
+            self.ofsetler[h + 1] += self.ofsetler[h]
+        konum = self.ofsetler[:-1]
+        self.elemanlar = array("q", [0]) * n
+        for i, h in enumerate(hucreler):
+            self.elemanlar[konum[h]] = i
+            konum[h] += 1
+
+    def _hucre_xy(self, x: float, y: float) -> Tuple[int, int]:
+        """Noktanın hücresi; ızgara dışındaki noktalar en yakın kenar hücreye sıkıştırılır"""
+        cx = min(max(int((x - self.min_x) // self.hucre), 0), self.sutun - 1)
+        cy = min(max(int((y - self.min_y) // self.hucre), 0), self.satir - 1)
+        return cx, cy
+
+    def _hucre_no(self, cx: int, cy: int) -> int:
+        return cy * self.sutun + cx
+
+    def _hucreyi_tara(self, cx: int, cy: int, x: float, y: float, sonuc: List[Tuple[float, int]]) -> None:
+        h = self._hucre_no(cx, cy)
+        xler, yler = self.xler, self.yler
+        for i in self.elemanlar[self.ofsetler[h]:self.ofsetler[h + 1]]:
+            sonuc.append((((xler[i] - x) ** 2 + (yler[i] - y) ** 2) ** 0.5, i))
+
+    def yaricap_icinde(self, x: float, y: float, yaricap: float) -> List[Tuple[float, int]]:
+        """(x, y) noktasına yaricap kadar yakın istasyonları (mesafe, indeks) olarak, yakından uzağa döndürür"""
+        cx1, cy1 = self._hucre_xy(x - yaricap, y - yaricap)
+        cx2, cy2 = self._hucre_xy(x + yaricap, y + yaricap)
+        adaylar: List[Tuple[float, int]] = []
+        for cy in range(cy1, cy2 + 1):
+            for cx in range(cx1, cx2 + 1):
+                self._hucreyi_tara(cx, cy, x, y, adaylar)
+        return sorted(aday for aday in adaylar if aday[0] <= yaricap)
+
+    def en_yakin(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        """(x, y) noktasına en yakın k istasyonu (mesafe, indeks) olarak, yakından uzağa döndürür
+
+        Noktanın hücresinden başlayarak halka halka genişlenir. r. halka
+        tarandıktan sonra taranmamış hücrelerdeki istasyonlar en az r hücre
+        uzaktadır; bulunan k. istasyon bundan yakınsa arama durur.
+        """
+        k = min(k, len(self.xler))
+        if k <= 0:
+            return []
+        cx0, cy0 = self._hucre_xy(x, y)
+        adaylar: List[Tuple[float, int]] = []
+        en_fazla_halka = max(cx0, self.sutun - 1 - cx0, cy0, self.satir - 1 - cy0)
+        for r in range(en_fazla_halka + 1):
+            for cy in range(cy0 - r, cy0 + r + 1):
+                if not 0 <= cy < self.satir:
+                    continue
+                adim = 1 if cy in (cy0 - r, cy0 + r) else 2 * r  # İç satırlarda yalnızca halkanın iki ucu
+                for cx in range(cx0 - r, cx0 + r + 1, max(adim, 1)):
+                    if 0 <= cx < self.sutun:
+                        self._hucreyi_tara(cx, cy, x, y, adaylar)
+            if len(adaylar) >= k:
+                adaylar = heapq.nsmallest(k, adaylar)
+                if adaylar[-1][0] <= r * self.hucre:
+                    break
+        return sorted(adaylar)[:k]
+
+# Ad aramasında Türkçe karakterler ve büyük/küçük harf ayrımı gözetilmez ("asti" -> "AŞTİ")
+_AD_CEVIRI = str.maketrans("ÇĞİIÖŞÜçğıöşüÂâÎîÛû", "CGIIOSUcgiosuAaIiUu")
+
+def _ad_anahtari(ad: str) -> str:
+    return " ".join(ad.translate(_AD_CEVIRI).lower().split())
+
+class IstasyonKompleksleri:
+    """Aynı adı taşıyan istasyonları (aktarma merkezlerinin peronlarını) gruplayan ad indeksi
+
+    Her kompleks, farklı hatlarda aynı adla tanımlanmış istasyonlardan oluşur
+    (ör. Kızılay: K1 ve M2). Ad araması için her kompleks adının her kelime
+    başından itibaren anahtarı bir önek ağacına (trie) eklenir. Önek
+    sorgusu önekin düğümünün altını yakından uzağa tarar; bulanık sorgu
+    düzenleme mesafesi satırını düğümden düğüme taşır ve en küçük değeri
+    sınırı aşan dalları budar. Hiçbiri tüm istasyon listesini taramaz.
+    """
+    __slots__ = ("gruplar", "anahtarlar", "kok")
+
+    def __init__(self, istasyonlar: Iterable[Istasyon]):
+        self.gruplar: Dict[str, List[Istasyon]] = {}
+        self.anahtarlar: Dict[str, str] = {}  # Ad anahtarı -> kompleks adı
+        for istasyon in istasyonlar:
+            ad = self.anahtarlar.setdefault(_ad_anahtari(istasyon.ad), istasyon.ad)
+            self.gruplar.setdefault(ad, []).append(istasyon)
+        # Düğümler karakter -> alt düğüm sözlükleridir; "" anahtarı düğümde biten kompleks adlarını tutar
+        self.kok: Dict[str, object] = {}
+        for anahtar, ad in self.anahtarlar.items():
+            kelimeler = anahtar.split()
+            for i in range(len(kelimeler)):
+                dugum = self.kok
+                for harf in " ".join(kelimeler[i:]):
+                    dugum = dugum.setdefault(harf, {})
+                dugum.setdefault("", []).append(ad)
+
+    def kompleks(self, ad: str) -> List[Istasyon]:
+        """Adı (büyük/küçük harf ve Türkçe karakter farkı gözetmeden) eşleşen kompleksin istasyonları"""
+        return self.gruplar.get(self.anahtarlar.get(_ad_anahtari(ad)), [])
+
+    def onek_ara(self, onek: str, limit: int = 10) -> List[str]:
+        """Herhangi bir kelimesi onek ile başlayan kompleks adları, kısa tamamlamalar önce"""
+        dugum = self.kok
+        for harf in _ad_anahtari(onek):
+            dugum = dugum.get(harf)
+            if dugum is None:
+                return []
+        bulunan: List[str] = []
+        kuyruk = deque([dugum])
+        while kuyruk and len(bulunan) < limit:
+            dugum = kuyruk.popleft()
+            for ad in dugum.get("", ()):
+                if ad not in bulunan:
+                    bulunan.append(ad)
+            kuyruk.extend(dugum[harf] for harf in sorted(dugum) if harf)
+        return bulunan[:limit]
+
+    def bulanik_ara(self, sorgu: str, en_fazla_hata: Optional[int] = None,
+                    limit: int = 10) -> List[Tuple[str, int]]:
+        """Düzenleme mesafesi en_fazla_hata'yı aşmayan kompleks adları (ad, mesafe) olarak
+
+        en_fazla_hata verilmezse beş harfe kadar sorgularda 1, daha uzunlarda 2'dir.
+        """
+        anahtar = _ad_anahtari(sorgu)
+        if en_fazla_hata is None:
+            en_fazla_hata = 1 if len(anahtar) <= 5 else 2
+        bulunan: Dict[str, int] = {}
+
+        def gez(dugum, harf, ust_satir):
+            satir = [ust_satir[0] + 1]
+            for j in range(1, len(anahtar) + 1):
+                satir.append(min(satir[j - 1] + 1, ust_satir[j] + 1, ust_satir[j - 1] + (anahtar[j - 1] != harf)))
+            if satir[-1] <= en_fazla_hata:
+                for ad in dugum.get("", ()):
+                    bulunan[ad] = min(bulunan.get(ad, satir[-1]), satir[-1])
+            if min(satir) <= en_fazla_hata:
+                for alt_harf, alt in dugum.items():
+                    if alt_harf:
+                        gez(alt, alt_harf, satir)
+
+        ilk_satir = list(range(len(anahtar) + 1))
+        for harf, alt in self.kok.items():
+            gez(alt, harf, ilk_satir)
+        return sorted(bulunan.items(), key=lambda ad_hata: (ad_hata[1], ad_hata[0]))[:limit]
+
+    def ara(self, sorgu: str, limit: int = 10) -> List[str]:
+        """Etkileşimli arama: önce tam eşleşme, sonra önek, sonra bulanık eşleşmeler"""
+        bulunan = [self.anahtarlar[_ad_anahtari(sorgu)]] if _ad_anahtari(sorgu) in self.anahtarlar else []
+        for ad in self.onek_ara(sorgu, limit):
+            if ad not in bulunan:
+                bulunan.append(ad)
+        if len(bulunan) < limit:
+            for ad, _ in self.bulanik_ara(sorgu, limit=limit):
+                if ad not in bulunan:
+                    bulunan.append(ad)
+        return bulunan[:limit]
+
+# Ön hesaplama dosyaları: başlık, dizi tanımları ve 8 bayta hizalı dizi verileri
+_DOSYA_BASLIGI = struct.Struct("<8sIB32sI")  # imza, sürüm, küçük endian mı, ağ özeti, dizi sayısı
+_DIZI_BASLIGI = struct.Struct("<c7xQ")  # tip kodu, eleman sayısı
+
+def _ikili_dosya_yaz(yol: str, imza: bytes, surum: int, ozet: bytes, diziler: List) -> None:
+    """Dizileri sürümlü ikili dosyaya yazar (önce geçici dosyaya, sonra yerine)"""
+    gecici_yol = yol + ".tmp"
+    with open(gecici_yol, "wb") as f:
+        f.write(_DOSYA_BASLIGI.pack(imza, surum, sys.byteorder == "little", ozet, len(diziler)))
+        for dizi in diziler:
+            tip = getattr(dizi, "typecode", None) or dizi.format
+            f.write(_DIZI_BASLIGI.pack(tip.encode("ascii"), len(dizi)))
+        for dizi in diziler:
+            f.write(b"\0" * (-f.tell() % 8))
+            f.write(memoryview(dizi).cast("B"))
+    os.replace(gecici_yol, yol)
+
+def _ikili_dosya_oku(yol: str, imza: bytes, surum: int,
+                     ozet: Optional[bytes] = None) -> Optional[Tuple[bytes, List[memoryview], mmap.mmap]]:
+    """_ikili_dosya_yaz ile yazılmış dosyayı mmap ile eşler
+    
+    (ağ özeti, diziler, mmap) döndürür. Diziler dosyaya yazılmayan
+    (ACCESS_COPY) bellek görünümleridir; sayfalar yalnızca okundukça yüklenir.
+    Dosya yoksa, imzası/sürümü/bayt sırası uymuyorsa ya da ozet verilip
+    dosyadakiyle eşleşmiyorsa None döndürür.
+    """
+    if not os.path.exists(yol):
+        return None
+    with open(yol, "rb") as f:
+        baslik = f.read(_DOSYA_BASLIGI.size)
+        if len(baslik) != _DOSYA_BASLIGI.size:
+            return None
+        dosya_imzasi, dosya_surumu, kucuk_endian, dosya_ozeti, dizi_sayisi = _DOSYA_BASLIGI.unpack(baslik)
+        if (dosya_imzasi != imza or dosya_surumu != surum
+                or kucuk_endian != (sys.byteorder == "little")
+                or (ozet is not None and dosya_ozeti != ozet)):
+            return None
+        tanimlar = []
+        for _ in range(dizi_sayisi):
+            tanim = f.read(_DIZI_BASLIGI.size)
+            if len(tanim) != _DIZI_BASLIGI.size:
+                return None
+            tip, uzunluk = _DIZI_BASLIGI.unpack(tanim)
+            tanimlar.append((tip.decode("ascii"), uzunluk))
+        konum = f.tell()
+        boyut = os.fstat(f.fileno()).st_size
+        eslem = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    
+    diziler = []
+    for tip, uzunluk in tanimlar:
+        konum += -konum % 8
+        bayt = uzunluk * array(tip).itemsize
+        if konum + bayt > boyut:
+            return None
+        diziler.append(memoryview(eslem)[konum:konum + bayt].cast(tip) if bayt else array(tip))
+        konum += bayt
+    return dosya_ozeti, diziler, eslem
+
+class MesafeTablolari:
+    """Tüm istasyon çiftleri için en kısa süre ve sonraki istasyon tabloları
+    
+    mesafe[u * n + t], u'dan t'ye en kısa süredir; sonraki[u * n + t] ise u'dan
+    t'ye giden en hızlı rotadaki ilk adımdır. Tablolar hazırlandıktan sonra
+    bir rota sorgusu, rota uzunluğu kadar tablo okumasıyla yanıtlanır.
+    
+    Tablolar, başlığında ağ özetini taşıyan sürümlü bir ikili dosyaya
+    kaydedilir. Yükleme mmap ile yapılır; dosya belleğe kopyalanmaz.
+    """
+    __slots__ = ("n", "ozet", "mesafe", "sonraki", "_mmap")
+    
+    DOSYA_IMZASI = b"METROTBL"
+    DOSYA_SURUMU = 1
+
+    def __init__(self, n: int, ozet: bytes, mesafe, sonraki, _mmap=None):
+        self.n = n
+        self.ozet = ozet
+        self.mesafe = mesafe
+        self.sonraki = sonraki
+        self._mmap = _mmap
+
+    @classmethod
+    def olustur(cls, ag: DerlenmisAg, yontem: Optional[str] = None) -> "MesafeTablolari":
+        """Tabloları hesaplar
+        
+        yontem "floyd" ise NumPy ile vektörel Floyd–Warshall, "dijkstra" ise
+        her istasyondan bir Dijkstra çalıştırılır. Belirtilmezse NumPy varsa
+        ve ağ küçükse Floyd–Warshall, aksi halde Dijkstra seçilir.
+        """
+        n = len(ag)
+        if yontem is None:
+            yontem = "floyd" if NUMPY_AVAILABLE and n <= 2000 else "dijkstra"
+        if yontem == "floyd":
+            if not NUMPY_AVAILABLE:
+                raise RuntimeError("Floyd–Warshall için NumPy kütüphanesi gerekli.")
+            mesafe, sonraki = cls._floyd_warshall(ag)
+        elif yontem == "dijkstra":
+            mesafe, sonraki = cls._tekrarli_dijkstra(ag)
+        else:
+            raise ValueError(f"Bilinmeyen yöntem: {yontem}")
+        return cls(n, ag.ozet(), mesafe, sonraki)
+
+    @staticmethod
+    def _tekrarli_dijkstra(ag: DerlenmisAg) -> Tuple[array, array]:
+        n = len(ag)
+        mesafe = array("d", [INF]) * (n * n)
+        sonraki = array("i", [-1]) * (n * n)
+        for t in range(n):
+            # t köklü ağaçta u'nun önceki istasyonu, u'dan t'ye giden ilk adımdır
+            d, onceki = ag.dijkstra_agaci(t)
+            for u in range(n):
+                mesafe[u * n + t] = d[u]
+                sonraki[u * n + t] = onceki[u]
+        return mesafe, sonraki
+
+    @staticmethod
+    def _floyd_warshall(ag: DerlenmisAg) -> Tuple[array, array]:
+        n = len(ag)
+        D = np.full((n, n), np.inf)
+        N = np.full((n, n), -1, dtype=np.int32)
+        kaynaklar = np.repeat(np.arange(n), np.diff(np.asarray(ag.ofsetler)))
+        hedefler = np.asarray(ag.hedefler, dtype=np.int64)
+        maliyetler = np.asarray(ag.maliyetler, dtype=np.float64)
+        # Paralel kenarlarda en ucuzu kalsın diye pahalıdan ucuza doğru yaz
+        sira = np.argsort(-maliyetler, kind="stable")
+        D[kaynaklar[sira], hedefler[sira]] = maliyetler[sira]
+        N[kaynaklar[sira], hedefler[sira]] = hedefler[sira]
+        np.fill_diagonal(D, 0.0)
+        np.fill_diagonal(N, np.arange(n, dtype=np.int32))
+        
+        for k in range(n):
+            alternatif = D[:, k, None] + D[None, k, :]
+            daha_iyi = alternatif < D
+            np.copyto(D, alternatif, where=daha_iyi)
+            np.copyto(N, np.broadcast_to(N[:, k, None], (n, n)), where=daha_iyi)
+        return array("d", D.ravel().tobytes()), array("i", N.ravel().tobytes())
+
+    def rota(self, baslangic: int, hedef: int) -> Optional[Tuple[List[int], float]]:
+        """Sonraki-istasyon tablosunu izleyerek rotayı kurar"""
+        n = self.n
+        sure = self.mesafe[baslangic * n + hedef]
+        if sure == INF:
+            return None
+        sonraki = self.sonraki
+        rota = [baslangic]
+        guncel = baslangic
+        while guncel != hedef:
+            guncel = sonraki[guncel * n + hedef]
+            rota.append(guncel)
+        return (rota, sure)
+
+    def kenar_degisti(self, ag: DerlenmisAg, u: int, v: int, eski_maliyet: float) -> None:
+        """u–v bağlantısının maliyeti değiştikten sonra tabloları yerinde onarır
+
+        ag'daki kenarlar önceden güncellenmiş olmalıdır; eski_maliyet iki
+        istasyon arasındaki en ucuz kenarın değişiklikten önceki maliyetidir.
+        Her hedef sütunu ayrı bir en kısa yol ağacıdır ve yalnızca etkilenen
+        sütunlar ele alınır:
+
+        - Maliyet arttıysa ya da kenar kaldırıldıysa (Ramalingam–Reps) yalnızca
+          sonraki adımı bu kenardan geçen sütunlarda, kenarın altındaki alt
+          ağaç sıfırlanır; alt ağaç dışındaki komşulardan başlangıç değerleri
+          alınarak yalnızca bu bölgede Dijkstra çalıştırılır.
+        - Maliyet azaldıysa yalnızca bu kenar üzerinden kısalan sütunlarda
+          iyileşme, mesafesi düşen istasyonlara Dijkstra ile yayılır.
+        """
+        yeni_maliyet = ag.kenar_maliyeti(u, v)
+        if yeni_maliyet == eski_maliyet:
+            return
+        n = self.n
+        mesafe, sonraki = self.mesafe, self.sonraki
+        if yeni_maliyet > eski_maliyet:
+            if NUMPY_AVAILABLE:
+                S = np.frombuffer(sonraki, dtype=np.intc).reshape(n, n)
+                sutunlar = set(np.flatnonzero(S[u] == v).tolist())
+                sutunlar.update(np.flatnonzero(S[v] == u).tolist())
+                del S
+            else:
+                sutunlar = {t for t in range(n) if sonraki[u * n + t] == v or sonraki[v * n + t] == u}
+            for t in sutunlar:
+                koklar = [a for a, b in ((u, v), (v, u)) if sonraki[a * n + t] == b]
+                self._alt_agaci_onar(ag, t, koklar)
+            return
+
+        for a, b in ((u, v), (v, u)):
+            if NUMPY_AVAILABLE:
+                D = np.frombuffer(mesafe, dtype=np.float64).reshape(n, n)
+                sutunlar = np.flatnonzero(yeni_maliyet + D[b] < D[a]).tolist()
+                del D
+            else:
+                sutunlar = [t for t in range(n) if yeni_maliyet + mesafe[b * n + t] < mesafe[a * n + t]]
+            for t in sutunlar:
+                yeni = yeni_maliyet + mesafe[b * n + t]
+                mesafe[a * n + t] = yeni
+                sonraki[a * n + t] = b
+                self._iyilesmeyi_yay(ag, t, [(yeni, a)])
+
+    def _alt_agaci_onar(self, ag: DerlenmisAg, t: int, koklar: List[int]) -> None:
+        """t sütununda koklar altındaki alt ağacı yeniden hesaplar"""
+        n = self.n
+        mesafe, sonraki = self.mesafe, self.sonraki
+        ofsetler, hedefler, maliyetler = ag.ofsetler, ag.hedefler, ag.maliyetler
+
+        # Sonraki adımı izleyerek t'ye bir kök üzerinden ulaşan istasyonlar
+        etkilenen = set(koklar)
+        yigin = list(koklar)
+        while yigin:
+            x = yigin.pop()
+            for e in range(ofsetler[x], ofsetler[x + 1]):
+                w = hedefler[e]
+                if w not in etkilenen and sonraki[w * n + t] == x:
+                    etkilenen.add(w)
+                    yigin.append(w)
+        for a in etkilenen:
+            mesafe[a * n + t] = INF
+            sonraki[a * n + t] = -1
+
+        # Sınırdaki başlangıç değerleri: bölge dışındaki mesafeler değişmemiştir
+        pq = []
+        for a in etkilenen:
+            en_iyi, secilen = INF, -1
+            for e in range(ofsetler[a], ofsetler[a + 1]):
+                w = hedefler[e]
+                if w not in etkilenen:
+                    d = maliyetler[e] + mesafe[w * n + t]
+                    if d < en_iyi:
+                        en_iyi, secilen = d, w
+            if secilen != -1:
+                mesafe[a * n + t] = en_iyi
+                sonraki[a * n + t] = secilen
+                pq.append((en_iyi, a))
+        heapq.heapify(pq)
+        self._iyilesmeyi_yay(ag, t, pq, etkilenen)
+
+    def _iyilesmeyi_yay(self, ag: DerlenmisAg, t: int, pq: List[Tuple[float, int]],
+                        bolge: Optional[Set[int]] = None) -> None:
+        """t sütununda mesafesi düşen istasyonlardan komşulara Dijkstra ile yayılır
+
+        bolge verilirse yalnızca bu istasyonların değerleri güncellenir.
+        """
+        n = self.n
+        mesafe, sonraki = self.mesafe, self.sonraki
+        ofsetler, hedefler, maliyetler = ag.ofsetler, ag.hedefler, ag.maliyetler
+        while pq:
+            d, x = heapq.heappop(pq)
+            if d > mesafe[x * n + t]:
+                continue
+            # Ağ yönsüz olduğundan x'in kenarları komşulardan x'e gelen kenarlarla aynıdır
+            for e in range(ofsetler[x], ofsetler[x + 1]):
+                w = hedefler[e]
+                yeni = d + maliyetler[e]
+                if yeni < mesafe[w * n + t] and (bolge is None or w in bolge):
+                    mesafe[w * n + t] = yeni
+                    sonraki[w * n + t] = x
+                    heapq.heappush(pq, (yeni, w))
+
+    def kaydet(self, yol: str) -> None:
+        """Tabloları ikili dosyaya yazar"""
+        _ikili_dosya_yaz(yol, self.DOSYA_IMZASI, self.DOSYA_SURUMU, self.ozet,
+                         [self.mesafe, self.sonraki])
+
+    @classmethod
+    def yukle(cls, yol: str, ag: DerlenmisAg) -> Optional["MesafeTablolari"]:
+        """Tabloları dosyadan eşler
+        
+        Dosya yoksa, sürümü farklıysa ya da başka bir ağa aitse None döndürür.
+        """
+        okunan = _ikili_dosya_oku(yol, cls.DOSYA_IMZASI, cls.DOSYA_SURUMU, ag.ozet())
+        if okunan is None:
+            return None
+        ozet, diziler, eslem = okunan
+        n = len(ag)
+        if len(diziler) != 2 or len(diziler[0]) != n * n or len(diziler[1]) != n * n:
+            return None
+        return cls(n, ozet, diziler[0], diziler[1], eslem)
+
+class KontraksiyonHiyerarsisi:
+    """Contraction Hierarchies (CH) ön hesaplaması ve sorgu motoru
+    
+    Ön hesaplamada istasyonlar önem sırasına göre tek tek daraltılır. Bir
+    istasyon daraltılırken iki komşusu arasındaki en kısa yol o istasyondan
+    geçiyorsa ve daha kısa bir tanık yol yoksa, komşular arasına bir kısayol
+    kenarı eklenir. Sorgu, başlangıç ve hedeften yalnızca daha yüksek sıralı
+    istasyonlara doğru ilerleyen iki yönlü bir Dijkstra'dır; bulunan rotadaki
+    kısayollar en sonda orijinal istasyonlara açılır.
+    
+    Yukarı kenarlar CSR dizilerinde tutulur: ortalar[e], e kenarı bir kısayolsa
+    atladığı istasyon, orijinal kenarsa -1'dir. Her kenar yalnızca düşük
+    sıralı ucunun satırında bulunur; kısayol açma da kenarı orada arar, bu
+    yüzden dosyadan yüklemek ek bir tablo kurmayı gerektirmez.
+    """
+    __slots__ = ("n", "ozet", "sira", "ofsetler", "hedefler", "maliyetler", "ortalar", "_mmap")
+    
+    DOSYA_IMZASI = b"METROCH_"
+    DOSYA_SURUMU = 1
+
+    def __init__(self, n: int, ozet: bytes, sira, ofsetler, hedefler, maliyetler, ortalar, _mmap=None):
+        self.n = n
+        self.ozet = ozet
+        self.sira = sira
+        self.ofsetler = ofsetler
+        self.hedefler = hedefler
+        self.maliyetler = maliyetler
+        self.ortalar = ortalar
+        self._mmap = _mmap
+
+    @classmethod
+    def olustur(cls, ag: DerlenmisAg, tanik_siniri: int = 64) -> "KontraksiyonHiyerarsisi":
+        """Düğüm sıralaması yaparak ağı daraltır
+        
+        Öncelik, eklenecek kısayol sayısı ile kaldırılacak kenar sayısı
+        arasındaki fark ve daraltılmış komşu sayısıdır; öncelikler tembel
+        olarak güncellenir. Tanık aramaları tanik_siniri istasyonla sınırlıdır;
+        sınır gereksiz kısayollara yol açabilir ama sonucu bozmaz.
+        """
+        n = len(ag)
+        # komsular[v]: u -> (maliyet, atlanan istasyon); daraltılan istasyonlar
+        # komşularının sözlüklerinden silinir, kendi sözlükleri yukarı kenarları olarak kalır
+        komsular: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(ag.ofsetler[u], ag.ofsetler[u + 1]):
+                v, maliyet = ag.hedefler[e], ag.maliyetler[e]
+                if v == u or maliyet == INF:
+                    continue
+                eski = komsular[u].get(v)
+                if eski is None or maliyet < eski[0]:
+                    komsular[u][v] = (maliyet, -1)
+        daraltilan_komsu = array("q", [0]) * n
+        
+        def tanik_ara(kaynak: int, haric: int, sinir: float) -> Dict[int, float]:
+            mesafe = {kaynak: 0.0}
+            pq = [(0.0, kaynak)]
+            yerlesen = 0
+            while pq:
+                d, u = heapq.heappop(pq)
+                if d > mesafe[u]:
+                    continue
+                if d > sinir or yerlesen >= tanik_siniri:
+                    break
+                yerlesen += 1
+                for w, (maliyet, _) in komsular[u].items():
+                    if w == haric:
+                        continue
+                    yeni_d = d + maliyet
+                    if yeni_d < mesafe.get(w, INF):
+                        mesafe[w] = yeni_d
+                        heapq.heappush(pq, (yeni_d, w))
+            return mesafe
+        
+        def gerekli_kisayollar(v: int) -> List[Tuple[int, int, float]]:
+            komsu_listesi = list(komsular[v].items())
+            kisayollar = []
+            for i, (u, (maliyet_u, _)) in enumerate(komsu_listesi):
+                adaylar = [(w, maliyet_u + maliyet_w) for w, (maliyet_w, _) in komsu_listesi[i + 1:]]
+                if not adaylar:
+                    continue
+                mesafe = tanik_ara(u, v, max(maliyet for _, maliyet in adaylar))
+                for w, maliyet in adaylar:
+                    if mesafe.get(w, INF) > maliyet:
+                        kisayollar.append((u, w, maliyet))
+            return kisayollar
+        
+        def oncelik(v: int, kisayollar: List[Tuple[int, int, float]]) -> int:
+            return len(kisayollar) - len(komsular[v]) + daraltilan_komsu[v]
+        
+        pq = [(oncelik(v, gerekli_kisayollar(v)), v) for v in range(n)]
+        heapq.heapify(pq)
+        sira = array("i", [0]) * n
+        siradaki = 0
+        while pq:
+            _, v = heapq.heappop(pq)
+            kisayollar = gerekli_kisayollar(v)
+            yeni_oncelik = oncelik(v, kisayollar)
+            if pq and yeni_oncelik > pq[0][0]:
+                heapq.heappush(pq, (yeni_oncelik, v))
+                continue
+            
+            for u, w, maliyet in kisayollar:
+                eski = komsular[u].get(w)
+                if eski is None or maliyet < eski[0]:
+                    komsular[u][w] = (maliyet, v)
+                    komsular[w][u] = (maliyet, v)
+            for u in komsular[v]:
+                del komsular[u][v]
+                daraltilan_komsu[u] += 1
+            sira[v] = siradaki
+            siradaki += 1
+        
+        ofsetler = array("i", [0])
+        hedefler = array("i")
+        maliyetler = array("d")
+        ortalar = array("i")
+        for v in range(n):
+            for u, (maliyet, orta) in komsular[v].items():
+                hedefler.append(u)
+                maliyetler.append(maliyet)
+                ortalar.append(orta)
+            ofsetler.append(len(hedefler))
+        return cls(n, ag.ozet(), sira, ofsetler, hedefler, maliyetler, ortalar)
+
+    def rota(self, baslangic: int, hedef: int,
+             istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[int], float]]:
+        """İki yönlü yukarı aramayla en hızlı rotayı bulur ve kısayolları açar"""
+        if baslangic == hedef:
+            if istatistik is not None:
+                istatistik.sayaclari_yaz(0, 0, 0, 0, 0)
+            return ([baslangic], 0.0)
+        ofsetler, hedefler, maliyetler = self.ofsetler, self.hedefler, self.maliyetler
+        mesafeler = ({baslangic: 0.0}, {hedef: 0.0})
+        oncekiler = ({baslangic: baslangic}, {hedef: hedef})
+        kuyruklar = ([(0.0, baslangic)], [(0.0, hedef)])
+        en_iyi, bulusma = INF, -1
+        genisletilen = incelenen = tepe = eski = 0
+        izle = istatistik is not None
+        
+        while kuyruklar[0] or kuyruklar[1]:
+            if izle and len(kuyruklar[0]) + len(kuyruklar[1]) > tepe:
+                tepe = len(kuyruklar[0]) + len(kuyruklar[1])
+            ust0 = kuyruklar[0][0][0] if kuyruklar[0] else INF
+            ust1 = kuyruklar[1][0][0] if kuyruklar[1] else INF
+            if min(ust0, ust1) >= en_iyi:
+                break
+            yon = 0 if ust0 <= ust1 else 1
+            mesafe, onceki, kuyruk = mesafeler[yon], oncekiler[yon], kuyruklar[yon]
+            d, guncel = heapq.heappop(kuyruk)
+            if d > mesafe[guncel]:
+                eski += 1
+                continue
+            genisletilen += 1
+            diger = mesafeler[1 - yon].get(guncel)
+            if diger is not None and d + diger < en_iyi:
+                en_iyi, bulusma = d + diger, guncel
+            bas, bit = ofsetler[guncel], ofsetler[guncel + 1]
+            incelenen += bit - bas
+            for e in range(bas, bit):
+                komsu = hedefler[e]
+                yeni_d = d + maliyetler[e]
+                if yeni_d < mesafe.get(komsu, INF):
+                    mesafe[komsu] = yeni_d
+                    onceki[komsu] = guncel
+                    heapq.heappush(kuyruk, (yeni_d, komsu))
+        
+        if izle:
+            ekleme = genisletilen + eski + len(kuyruklar[0]) + len(kuyruklar[1])
+            istatistik.sayaclari_yaz(genisletilen, incelenen, ekleme, tepe, eski)
+        if bulusma == -1:
+            return None
+        # Başlangıç -> buluşma ve buluşma -> hedef istasyonlarını sırala
+        ust_rota = [bulusma]
+        while ust_rota[-1] != baslangic:
+            ust_rota.append(oncekiler[0][ust_rota[-1]])
+        ust_rota.reverse()
+        dugum = bulusma
+        while dugum != hedef:
+            dugum = oncekiler[1][dugum]
+            ust_rota.append(dugum)
+        
+        rota = [baslangic]
+        for u, v in zip(ust_rota, ust_rota[1:]):
+            self._kisayol_ac(u, v, rota)
+        return (rota, en_iyi)
+
+    def _kisayol_ac(self, u: int, v: int, rota: List[int]) -> None:
+        """u-v kenarını orijinal istasyonlara açar, u hariç rotaya ekler"""
+        sira, ofsetler, hedefler, ortalar = self.sira, self.ofsetler, self.hedefler, self.ortalar
+        yigin = [(u, v)]
+        while yigin:
+            a, b = yigin.pop()
+            # Kenar, düşük sıralı ucun yukarı kenarları arasındadır
+            alt, ust = (a, b) if sira[a] < sira[b] else (b, a)
+            orta = -1
+            for e in range(ofsetler[alt], ofsetler[alt + 1]):
+                if hedefler[e] == ust:
+                    orta = ortalar[e]
+                    break
+            if orta < 0:
+                rota.append(b)
+            else:
+                yigin.append((orta, b))
+                yigin.append((a, orta))
+
+    def kaydet(self, yol: str) -> None:
+        """Hiyerarşiyi ikili dosyaya yazar"""
+        _ikili_dosya_yaz(yol, self.DOSYA_IMZASI, self.DOSYA_SURUMU, self.ozet,
+                         [self.sira, self.ofsetler, self.hedefler, self.maliyetler, self.ortalar])
+
+    @classmethod
+    def yukle(cls, yol: str, ag: DerlenmisAg) -> Optional["KontraksiyonHiyerarsisi"]:
+        """Hiyerarşiyi dosyadan eşler; dosya bu ağa ait değilse None döndürür"""
+        okunan = _ikili_dosya_oku(yol, cls.DOSYA_IMZASI, cls.DOSYA_SURUMU, ag.ozet())
+        if okunan is None:
+            return None
+        ozet, diziler, eslem = okunan
+        n = len(ag)
+        if len(diziler) != 5 or len(diziler[0]) != n or len(diziler[1]) != n + 1:
+            return None
+        return cls(n, ozet, *diziler, _mmap=eslem)
+
+class YerIsaretleri:
+    """ALT (A*, yer işaretleri, üçgen eşitsizliği) sezgiseli için ön hesaplama
+
+    Seçilen her L yer işaretinden tüm istasyonlara en kısa süreler bir kez
+    hesaplanır; mesafeler[u * k + i], i. yer işareti ile u arasındaki süredir.
+    Ağ yönsüz olduğundan aynı dizi hem L'den u'ya hem u'dan L'ye süredir ve
+    üçgen eşitsizliği her L için d(u, t) >= |d(L, t) - d(L, u)| verir.
+    Ulaşılamayan istasyonların süresi INF'dir.
+
+    Bağlantı süresi artışları ve kaldırmalar sınırı bozmaz (yalnızca
+    zayıflatır); süre düşüşlerinde ise tablolar yeniden hazırlanmalıdır.
+    Tablolar, MesafeTablolari gibi ağ özetini taşıyan bir dosyaya kaydedilir.
+    """
+    __slots__ = ("n", "ozet", "yer_isaretleri", "mesafeler", "_mmap")
+
+    DOSYA_IMZASI = b"METROALT"
+    DOSYA_SURUMU = 1
+
+    def __init__(self, n: int, ozet: bytes, yer_isaretleri, mesafeler, _mmap=None):
+        self.n = n
+        self.ozet = ozet
+        self.yer_isaretleri = yer_isaretleri
+        self.mesafeler = mesafeler
+        self._mmap = _mmap
+
+    @classmethod
+    def olustur(cls, ag: DerlenmisAg, sayi: int = 8, yontem: str = "uzak",
+                tohum: int = 0) -> "YerIsaretleri":
+        """sayi kadar yer işareti seçer ve süre dizilerini hesaplar
+
+        yontem "uzak" ise her yeni yer işareti seçilmişlere en uzak (en küçük
+        süresi en büyük) istasyondur. "kacin" (avoid) ise rastgele bir kökün
+        en kısa yol ağacında, mevcut sınırın en zayıf kaldığı ve henüz yer
+        işareti içermeyen en ağır alt ağacın yaprağını seçer; rotaların
+        çoğunu daha iyi kapsar. İlk yer işareti iki yöntemde de rastgele
+        kökten en uzak istasyondur.
+        """
+        if yontem not in ("uzak", "kacin"):
+            raise ValueError(f"Bilinmeyen yöntem: {yontem}")
+        n = len(ag)
+        sayi = min(sayi, n)
+        rng = random.Random(tohum)
+        secilenler = array("q")
+        satirlar: List[array] = []
+        # en_yakin[u]: u'nun seçilmiş yer işaretlerine en kısa süresi ("uzak" seçimi için)
+        en_yakin = array("d", [INF]) * n
+        while len(secilenler) < sayi:
+            if not secilenler:
+                kok_mesafe, _ = ag.dijkstra_agaci(rng.randrange(n))
+                aday = cls._en_uzak(kok_mesafe, secilenler)
+            elif yontem == "uzak":
+                aday = cls._en_uzak(en_yakin, secilenler)
+            else:
+                aday = cls._kacinarak_sec(ag, satirlar, secilenler, rng)
+                if aday < 0:
+                    aday = cls._en_uzak(en_yakin, secilenler)
+            secilenler.append(aday)
+            satir, _ = ag.dijkstra_agaci(aday)
+            satirlar.append(satir)
+            for u in range(n):
+                if satir[u] < en_yakin[u]:
+                    en_yakin[u] = satir[u]
+
+        k = len(secilenler)
+        mesafeler = array("d", [INF]) * (n * k)
+        for i, satir in enumerate(satirlar):
+            mesafeler[i::k] = satir
+        return cls(n, ag.ozet(), secilenler, mesafeler)
+
+    @staticmethod
+    def _en_uzak(mesafe: array, secilenler: array) -> int:
+        """Seçilmemiş istasyonlar arasında süresi en büyük olanı döndürür
+
+        Erişilemeyen (INF) istasyonlar önce seçilir; böylece ağ bağlantısızsa
+        her bileşen bir yer işareti alır.
+        """
+        secili = set(secilenler)
+        en_iyi, en_iyi_d = -1, -1.0
+        for u, d in enumerate(mesafe):
+            if d > en_iyi_d and u not in secili:
+                en_iyi, en_iyi_d = u, d
+        return en_iyi
+
+    @staticmethod
+    def _kacinarak_sec(ag: DerlenmisAg, satirlar: List[array], secilenler: array,
+                       rng: random.Random) -> int:
+        """Avoid yöntemiyle bir sonraki yer işaretini seçer; aday yoksa -1"""
+        n = len(ag)
+        kok = rng.randrange(n)
+        mesafe, onceki = ag.dijkstra_agaci(kok)
+        sirali = sorted((u for u in range(n) if mesafe[u] < INF), key=mesafe.__getitem__)
+        secili = set(secilenler)
+        # agirlik[u]: kökten u'ya gerçek süre ile mevcut alt sınır arasındaki fark
+        boyut = array("d", [0.0]) * n
+        for u in sirali:
+            alt_sinir = max((abs(satir[u] - satir[kok]) for satir in satirlar
+                             if satir[u] < INF and satir[kok] < INF), default=0.0)
+            boyut[u] = mesafe[u] - alt_sinir
+        # Alt ağaç ağırlıkları yapraklardan köke toplanır; yer işareti içeren alt ağaçlar 0 olur
+        isaretli = array("b", [0]) * n
+        cocuklar: Dict[int, List[int]] = defaultdict(list)
+        for u in reversed(sirali):
+            if u in secili:
+                isaretli[u] = 1
+            if isaretli[u]:
+                boyut[u] = 0.0
+            ust = onceki[u]
+            if ust != u:
+                cocuklar[ust].append(u)
+                boyut[ust] += boyut[u]
+                if isaretli[u]:
+                    isaretli[ust] = 1
+        dugum = max(sirali, key=boyut.__getitem__)
+        if boyut[dugum] <= 0:
+            return -1
+        while True:
+            adaylar = [c for c in cocuklar.get(dugum, ()) if boyut[c] > 0]
+            if not adaylar:
+                return dugum
+            dugum = max(adaylar, key=boyut.__getitem__)
+
+    def kaydet(self, yol: str) -> None:
+        """Yer işaretlerini ve süre dizilerini ikili dosyaya yazar"""
+        _ikili_dosya_yaz(yol, self.DOSYA_IMZASI, self.DOSYA_SURUMU, self.ozet,
+                         [self.yer_isaretleri, self.mesafeler])
+
+    @classmethod
+    def yukle(cls, yol: str, ag: DerlenmisAg) -> Optional["YerIsaretleri"]:
+        """Yer işaretlerini dosyadan eşler; dosya bu ağa ait değilse None döndürür"""
+        okunan = _ikili_dosya_oku(yol, cls.DOSYA_IMZASI, cls.DOSYA_SURUMU, ag.ozet())
+        if okunan is None:
+            return None
+        ozet, diziler, eslem = okunan
+        n = len(ag)
+        if len(diziler) != 2 or len(diziler[1]) != n * len(diziler[0]):
+            return None
+        return cls(n, ozet, diziler[0], diziler[1], eslem)
+
+def _kaynak_rotalari(ag: DerlenmisAg, kaynak: int,
+                     hedefler: List[int]) -> List[Tuple[int, Optional[List[int]], float]]:
+    """Tek bir Dijkstra ağacından kaynağın tüm hedeflerine rotaları çıkarır"""
+    mesafe, onceki = ag.dijkstra_agaci(kaynak, set(hedefler))
+    sonuclar = []
+    for hedef in hedefler:
+        if mesafe[hedef] == INF:
+            sonuclar.append((hedef, None, INF))
+        else:
+            sonuclar.append((hedef, ag._rota_olustur(onceki, hedef), mesafe[hedef]))
+    return sonuclar
+
+# Süreç havuzundaki işçilerin derlenmiş ağı; başlatıcıda bir kez yüklenir
+_ISCI_AGI: Optional[DerlenmisAg] = None
+
+def _isci_baslat(ag: DerlenmisAg) -> None:
+    global _ISCI_AGI
+    _ISCI_AGI = ag
+
+def _isci_kaynak_rotalari(kaynak: int, hedefler: List[int]):
+    return kaynak, _kaynak_rotalari(_ISCI_AGI, kaynak, hedefler)
+
+class RotaOnbellegi:
+    """Rota sonuçları için sınırlı boyutlu LRU/TTL önbelleği
+    
+    Kayıtlar ağın surum sayacına bağlıdır: ağ değiştiğinde ilk erişimde
+    önbellek tamamen temizlenir, böylece eski rotalar hiçbir zaman
+    döndürülmez. Süre güncellemesi veya kapatma gibi küçük değişikliklerde
+    ise ayikla ile yalnızca etkilenen kayıtlar silinir. Bağlantılar her iki
+    yönde de eklendiğinden (A, B) için kayıt yoksa (B, A) kaydı ters
+    çevrilerek kullanılır.
+    """
+    
+    def __init__(self, kapasite: int = 1024, yasam_suresi: Optional[float] = None):
+        if kapasite <= 0:
+            raise ValueError("Önbellek kapasitesi pozitif olmalı.")
+        self.kapasite = kapasite
+        self.yasam_suresi = yasam_suresi  # saniye; None ise kayıtlar süresizdir
+        self.surum: Optional[int] = None
+        self._kayitlar: "OrderedDict[Tuple[str, str, str], Tuple[float, object]]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.ters_isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.suresi_dolan = 0
+        self.gecersiz_kilma = 0
+        self.ayiklanan = 0
+
+    def _surumu_denetle(self, surum: int) -> None:
+        if self.surum != surum:
+            if self._kayitlar:
+                self.gecersiz_kilma += 1
+                self._kayitlar.clear()
+            self.surum = surum
+
+    def _kayit_al(self, anahtar: Tuple[str, str, str]):
+        kayit = self._kayitlar.get(anahtar)
+        if kayit is None:
+            return None
+        zaman, deger = kayit
+        if self.yasam_suresi is not None and time.monotonic() - zaman > self.yasam_suresi:
+            del self._kayitlar[anahtar]
+            self.suresi_dolan += 1
+            return None
+        self._kayitlar.move_to_end(anahtar)
+        return kayit
+
+    def al(self, tur: str, baslangic_id: str, hedef_id: str, surum: int) -> Tuple[bool, object]:
+        """(bulundu, deger) döndürür; deger (rota_tuple, sure) veya None'dır"""
+        with self._kilit:
+            self._surumu_denetle(surum)
+            kayit = self._kayit_al((tur, baslangic_id, hedef_id))
+            if kayit is not None:
+                self.isabet += 1
+                return True, kayit[1]
+            kayit = self._kayit_al((tur, hedef_id, baslangic_id))
+            if kayit is not None:
+                self.isabet += 1
+                self.ters_isabet += 1
+                deger = kayit[1]
+                if deger is None:
+                    return True, None
+                rota, sure = deger
+                return True, (rota[::-1], sure)
+            self.iska += 1
+            return False, None
+
+    def koy(self, tur: str, baslangic_id: str, hedef_id: str, surum: int, deger) -> None:
+        with self._kilit:
+            self._surumu_denetle(surum)
+            anahtar = (tur, baslangic_id, hedef_id)
+            self._kayitlar[anahtar] = (time.monotonic(), deger)
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.kapasite:
+                self._kayitlar.popitem(last=False)
+                self.tahliye += 1
+
+    def temizle(self) -> None:
+        with self._kilit:
+            self._kayitlar.clear()
+
+    def ayikla(self, eski_surum: int, yeni_surum: int, sil: Callable[[str, object], bool]) -> int:
+        """Ağdaki küçük bir değişiklikten sonra yalnızca etkilenen kayıtları siler
+        
+        Önbellek eski_surum'a aitse sil(tur, deger) True döndüren kayıtlar
+        silinir ve kalanlar yeni_surum'a taşınır; önbellek daha eski bir
+        sürüme aitse tamamen temizlenir. Silinen kayıt sayısını döndürür.
+        """
+        with self._kilit:
+            if self.surum != eski_surum:
+                self._surumu_denetle(yeni_surum)
+                return 0
+            silinecekler = [anahtar for anahtar, (_, deger) in self._kayitlar.items()
+                            if sil(anahtar[0], deger)]
+            for anahtar in silinecekler:
+                del self._kayitlar[anahtar]
+            self.ayiklanan += len(silinecekler)
+            self.surum = yeni_surum
+            return len(silinecekler)
+
+    def __len__(self) -> int:
+        return len(self._kayitlar)
+
+    def istatistikler(self) -> Dict[str, int]:
+        return {
+            "kayit": len(self._kayitlar),
+            "isabet": self.isabet,
+            "ters_isabet": self.ters_isabet,
+            "iska": self.iska,
+            "tahliye": self.tahliye,
+            "suresi_dolan": self.suresi_dolan,
+            "gecersiz_kilma": self.gecersiz_kilma,
+            "ayiklanan": self.ayiklanan,
+        }
+
+class SorguIzleyici:
+    """Sorgu istatistiklerini toplayan ve profil kancalarına ileten izleyici
+
+    MetroAgi.izlemeyi_etkinlestir ile açılır. Her sorgunun AramaIstatistigi
+    kaydı sorgu türüne ("aktarma", "hat_degisimi", "hizli") göre süre ve
+    genişletilen istasyon histogramlarına eklenir, ardından kayıtlı kancalar
+    kanca(tur, baslangic_id, hedef_id, istatistik) biçiminde çağrılır.
+    Histogram kovaları 2'nin kuvvetleridir: k. kova [2^(k-1), 2^k) aralığını
+    sayar; süreler mikrosaniye cinsinden kovalanır.
+    """
+
+    def __init__(self, kanca: Optional[Callable[[str, str, str, AramaIstatistigi], None]] = None):
+        self.kancalar: List[Callable[[str, str, str, AramaIstatistigi], None]] = []
+        if kanca is not None:
+            self.kancalar.append(kanca)
+        self.son: Optional[AramaIstatistigi] = None
+        self._kilit = threading.Lock()
+        self._turler: Dict[str, Dict[str, object]] = {}
+
+    def kanca_ekle(self, kanca: Callable[[str, str, str, AramaIstatistigi], None]) -> None:
+        self.kancalar.append(kanca)
+
+    @staticmethod
+    def _kovaya_ekle(histogram: List[int], deger: int) -> None:
+        kova = deger.bit_length()
+        if kova >= len(histogram):
+            histogram.extend([0] * (kova + 1 - len(histogram)))
+        histogram[kova] += 1
+
+    @staticmethod
+    def _yuzdelik(histogram: List[int], oran: float) -> int:
+        """Histogramdan yüzdeliğin üst sınırını (kova sınırı) tahmin eder"""
+        esik = oran * sum(histogram)
+        birikmis = 0
+        for kova, sayi in enumerate(histogram):
+            birikmis += sayi
+            if sayi and birikmis >= esik:
+                return 1 << kova
+        return 0
+
+    def kaydet(self, tur: str, baslangic_id: str, hedef_id: str, istatistik: AramaIstatistigi) -> None:
+        with self._kilit:
+            ozet = self._turler.get(tur)
+            if ozet is None:
+                ozet = self._turler[tur] = {
+                    "sorgu": 0, "toplam_sure_ms": 0.0, "toplam_genisletilen": 0,
+                    "toplam_incelenen_kenar": 0, "motorlar": defaultdict(int),
+                    "sure_histogrami": [], "genisletilen_histogrami": [],
+                }
+            ozet["sorgu"] += 1
+            ozet["toplam_sure_ms"] += istatistik.sure_ms
+            ozet["toplam_genisletilen"] += istatistik.genisletilen
+            ozet["toplam_incelenen_kenar"] += istatistik.incelenen_kenar
+            ozet["motorlar"][istatistik.motor] += 1
+            self._kovaya_ekle(ozet["sure_histogrami"], int(istatistik.sure_ms * 1000))
+            self._kovaya_ekle(ozet["genisletilen_histogrami"], istatistik.genisletilen)
+            self.son = istatistik
+        for kanca in self.kancalar:
+            kanca(tur, baslangic_id, hedef_id, istatistik)
+
+    def temizle(self) -> None:
+        with self._kilit:
+            self._turler.clear()
+            self.son = None
+
+    def istatistikler(self) -> Dict[str, Dict[str, object]]:
+        """Tür başına toplamlar, ortalamalar, histogramlar ve yaklaşık yüzdelikler"""
+        sonuc = {}
+        with self._kilit:
+            for tur, ozet in self._turler.items():
+                sorgu = ozet["sorgu"]
+                sure_histogrami = ozet["sure_histogrami"]
+                genisletilen_histogrami = ozet["genisletilen_histogrami"]
+                sonuc[tur] = {
+                    "sorgu": sorgu,
+                    "ortalama_sure_ms": ozet["toplam_sure_ms"] / sorgu,
+                    "ortalama_genisletilen": ozet["toplam_genisletilen"] / sorgu,
+                    "ortalama_incelenen_kenar": ozet["toplam_incelenen_kenar"] / sorgu,
+                    "p50_sure_us": self._yuzdelik(sure_histogrami, 0.50),
+                    "p99_sure_us": self._yuzdelik(sure_histogrami, 0.99),
+                    "p50_genisletilen": self._yuzdelik(genisletilen_histogrami, 0.50),
+                    "p99_genisletilen": self._yuzdelik(genisletilen_histogrami, 0.99),
+                    "motorlar": dict(ozet["motorlar"]),
+                    # {kova üst sınırı: sorgu sayısı}
+                    "sure_us_histogrami": {1 << k: s for k, s in enumerate(sure_histogrami) if s},
+                    "genisletilen_histogrami": {1 << k: s for k, s in enumerate(genisletilen_histogrami) if s},
+                }
+        return sonuc
+
 class MetroAgi:
     def __init__(self):
         self.istasyonlar: Dict[str, Istasyon] = {}
         self.hatlar: Dict[str, List[Istasyon]] = defaultdict(list)
+        self.donduruldu = False
+        self._ag: Optional[DerlenmisAg] = None
+        self._tablolar: Optional[MesafeTablolari] = None
+        self._ch: Optional[KontraksiyonHiyerarsisi] = None
+        self._alt: Optional[YerIsaretleri] = None
+        self.surum = 0  # Her ağ değişikliğinde artar; önbellekleri geçersiz kılar
+        self.onbellek: Optional[RotaOnbellegi] = None
+        self.izleyici: Optional[SorguIzleyici] = None  # Kapalıyken sorgu başına tek bir None denetimi
+        self.kapali_istasyonlar: Set[str] = set()
+        self._konum_indeksi: Optional[KonumIndeksi] = None  # İlk konum sorgusunda kurulur
+        self._kompleksler: Optional[IstasyonKompleksleri] = None  # İlk ad sorgusunda kurulur
+        # Kapalı istasyon -> derlenmiş ağda kaldırılan kenarlar (kaynak, kenar, hedef, süre)
+        self._kapatmalar: Dict[str, List[Tuple[int, int, int, float]]] = {}
 
     def istasyon_ekle(self, idx: str, ad: str, hat: str, x: float = 0, y: float = 0) -> None:
+        if self.donduruldu:
+            raise RuntimeError("Ağ dondurulmuş; yeni istasyon eklenemez.")
         if idx not in self.istasyonlar:  # Fixed 'id' to 'idx'
             istasyon = Istasyon(idx, ad, hat, x, y)
             self.istasyonlar[idx] = istasyon
             self.hatlar[hat].append(istasyon)
+            self._konum_indeksi = None
+            self._kompleksler = None
+            self._ag_degisti()
 
     def baglanti_ekle(self, istasyon1_id: str, istasyon2_id: str, sure: int) -> None:
+        if self.donduruldu:
+            raise RuntimeError("Ağ dondurulmuş; yeni bağlantı eklenemez.")
         istasyon1 = self.istasyonlar[istasyon1_id]
         istasyon2 = self.istasyonlar[istasyon2_id]
         istasyon1.komsu_ekle(istasyon2, sure)
         istasyon2.komsu_ekle(istasyon1, sure)
+        self._ag_degisti()
+
+    @classmethod
+    def from_csv(cls, istasyon_yolu: str, baglanti_yolu: str) -> "MetroAgi":
+        """İstasyon ve bağlantı CSV dosyalarından ağ oluşturur
+        
+        İstasyon dosyası idx, ad, hat, x, y; bağlantı dosyası istasyon1,
+        istasyon2, sure sütunlarını içeren başlık satırıyla başlamalıdır.
+        Dosyalar satır satır okunur ve ağa toplu olarak eklenir.
+        """
+        metro = cls()
+        with open(istasyon_yolu, newline="", encoding="utf-8") as f_istasyon, \
+                open(baglanti_yolu, newline="", encoding="utf-8") as f_baglanti:
+            istasyonlar = (
+                (f"{istasyon_yolu}:{satir_no}", kayit)
+                for satir_no, kayit in enumerate(csv.DictReader(f_istasyon), start=2)
+            )
+            baglantilar = (
+                (f"{baglanti_yolu}:{satir_no}", kayit)
+                for satir_no, kayit in enumerate(csv.DictReader(f_baglanti), start=2)
+            )
+            metro._toplu_ekle(istasyonlar, baglantilar)
+        return metro
+
+    @classmethod
+    def from_json(cls, yol: str) -> "MetroAgi":
+        """JSON dosyasından ağ oluşturur
+        
+        Beklenen biçim: {"istasyonlar": [{"idx", "ad", "hat", "x", "y"}, ...],
+        "baglantilar": [{"istasyon1", "istasyon2", "sure"}, ...]}
+        """
+        with open(yol, encoding="utf-8") as f:
+            veri = json.load(f)
+        if not isinstance(veri, dict):
+            raise ValueError(f"{yol}: JSON kökü 'istasyonlar' ve 'baglantilar' alanlarını içeren bir nesne olmalı.")
+        metro = cls()
+        metro._toplu_ekle(
+            ((f"{yol}:istasyonlar[{i}]", kayit) for i, kayit in enumerate(veri.get("istasyonlar", []))),
+            ((f"{yol}:baglantilar[{i}]", kayit) for i, kayit in enumerate(veri.get("baglantilar", []))),
+        )
+        return metro
+
+    def _toplu_ekle(self, istasyonlar: Iterable[Tuple[str, dict]],
+                    baglantilar: Iterable[Tuple[str, dict]]) -> None:
+        """İstasyon ve bağlantı kayıtlarını doğrulayarak tek seferde ekler
+        
+        Yinelenen istasyon ID'leri, bilinmeyen istasyonlara bağlantılar,
+        bir istasyonun kendisine bağlantısı ve aynı istasyon çifti için
+        yinelenen bağlantılar ValueError ile, konum bilgisiyle birlikte
+        bildirilir.
+        """
+        if self.donduruldu:
+            raise RuntimeError("Ağ dondurulmuş; toplu ekleme yapılamaz.")
+        tum_istasyonlar = self.istasyonlar
+        hatlar = self.hatlar
+        
+        def sayi(konum: str, alan: str, deger) -> float:
+            try:
+                return float(deger or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f"{konum}: '{alan}' alanı sayı değil: {deger!r}.") from None
+        
+        try:
+            for konum, kayit in istasyonlar:
+                idx = str(kayit["idx"])
+                if idx in tum_istasyonlar:
+                    raise ValueError(f"{konum}: '{idx}' istasyonu birden fazla kez tanımlanmış.")
+                istasyon = Istasyon(idx, kayit["ad"], kayit["hat"],
+                                    sayi(konum, "x", kayit.get("x")), sayi(konum, "y", kayit.get("y")))
+                tum_istasyonlar[idx] = istasyon
+                hatlar[istasyon.hat].append(istasyon)
+            
+            mevcut = {(a.idx, b.idx) for a in tum_istasyonlar.values() for b, _ in a.komsular}
+            for konum, kayit in baglantilar:
+                id1, id2 = str(kayit["istasyon1"]), str(kayit["istasyon2"])
+                for idx in (id1, id2):
+                    if idx not in tum_istasyonlar:
+                        raise ValueError(f"{konum}: bilinmeyen istasyon ID'si '{idx}'.")
+                if id1 == id2:
+                    raise ValueError(f"{konum}: '{id1}' istasyonu kendisine bağlanamaz.")
+                if (id1, id2) in mevcut:
+                    raise ValueError(f"{konum}: '{id1}'-'{id2}' bağlantısı birden fazla kez tanımlanmış.")
+                sure = _sure_degeri(sayi(konum, "sure", kayit["sure"]))
+                istasyon1, istasyon2 = tum_istasyonlar[id1], tum_istasyonlar[id2]
+                istasyon1.komsular.append((istasyon2, sure))
+                istasyon2.komsular.append((istasyon1, sure))
+                mevcut.add((id1, id2))
+                mevcut.add((id2, id1))
+        except KeyError as e:
+            raise ValueError(f"{konum}: eksik alan {e}.") from None
+        finally:
+            self._ag_degisti()
+
+    ANLIK_GORUNTU_IMZASI = b"METROSNP"
+    ANLIK_GORUNTU_SURUMU = 1
+
+    def anlik_goruntu_kaydet(self, yol: str) -> None:
+        """Ağı (istasyonlar ve derlenmiş diziler) ikili anlık görüntüye yazar"""
+        ag = self.derlenmis_ag()
+        istasyonlar = [self.istasyonlar[idx] for idx in ag.idler]
+        
+        def metin_dizisi(metinler: List[str]) -> array:
+            return array("B", "\0".join(metinler).encode("utf-8"))
+        
+        _ikili_dosya_yaz(yol, self.ANLIK_GORUNTU_IMZASI, self.ANLIK_GORUNTU_SURUMU, ag.ozet(), [
+            metin_dizisi(ag.idler),
+            metin_dizisi([istasyon.ad for istasyon in istasyonlar]),
+            metin_dizisi(ag.hat_adlari),
+            ag.dugum_hatlari, ag.xler, ag.yler,
+            ag.ofsetler, ag.hedefler, ag.sureler, ag.maliyetler, ag.kenar_hatlari,
+            array("d", [ag.sezgisel_olcek]),
+        ])
+
+    @classmethod
+    def anlik_goruntu_yukle(cls, yol: str) -> "MetroAgi":
+        """anlik_goruntu_kaydet ile yazılmış dosyadan ağı yükler
+        
+        Derlenmiş diziler doğrudan okunur; ağ yeniden derlenmez. Kaydedilirken
+        kapalı olan istasyonların bağlantıları kaldırılmış olarak yüklenir.
+        """
+        okunan = _ikili_dosya_oku(yol, cls.ANLIK_GORUNTU_IMZASI, cls.ANLIK_GORUNTU_SURUMU)
+        if okunan is None or len(okunan[1]) != 12:
+            raise ValueError(f"{yol}: geçerli bir metro ağı anlık görüntüsü değil.")
+        _, diziler, eslem = okunan
+        # Diziler mmap'ten kopyalanır; böylece ağ süreçler arasında gönderilebilir
+        kopyalar = []
+        for dizi in diziler:
+            kopya = array(dizi.format)
+            kopya.frombytes(dizi.cast("B"))
+            kopyalar.append(kopya)
+            dizi.release()
+        eslem.close()
+        (idler_b, adlar_b, hatlar_b, dugum_hatlari, xler, yler,
+         ofsetler, hedefler, sureler, maliyetler, kenar_hatlari, olcek) = kopyalar
+        
+        def metinler(dizi: array) -> List[str]:
+            return dizi.tobytes().decode("utf-8").split("\0") if len(dizi) else []
+        
+        idler, adlar, hat_adlari = metinler(idler_b), metinler(adlar_b), metinler(hatlar_b)
+        metro = cls()
+        # Çok sayıda küçük nesne oluşturulurken döngüsel çöp toplayıcı gereksiz yere
+        # tekrar tekrar çalışır; yükleme süresince kapatılır
+        gc_acikti = gc.isenabled()
+        gc.disable()
+        try:
+            # Döngüler mümkün olduğunca map/zip ile C düzeyinde yürütülür
+            istasyon_listesi = list(map(Istasyon, idler, adlar, map(hat_adlari.__getitem__, dugum_hatlari),
+                                        xler, yler))
+            metro.istasyonlar = dict(zip(idler, istasyon_listesi))
+            for istasyon in istasyon_listesi:
+                metro.hatlar[istasyon.hat].append(istasyon)
+            if all(map(float.is_integer, sureler)):
+                tam_sureler = list(map(int, sureler))
+            else:
+                tam_sureler = list(map(_sure_degeri, sureler))
+            komsu_istasyonlar = list(map(istasyon_listesi.__getitem__, hedefler))
+            kaldirilmis_var = INF in sureler  # baglanti_kaldir/istasyon_kapat ile kaldırılmış kenarlar
+            bas = 0
+            for istasyon, son in zip(istasyon_listesi, ofsetler[1:]):
+                istasyon.komsular = list(zip(komsu_istasyonlar[bas:son], tam_sureler[bas:son]))
+                if kaldirilmis_var:
+                    istasyon.komsular = [(komsu, sure) for komsu, sure in istasyon.komsular if sure != INF]
+                bas = son
+            metro._ag = DerlenmisAg._dizilerden(idler, hat_adlari, dugum_hatlari, xler, yler,
+                                                ofsetler, hedefler, sureler, maliyetler,
+                                                kenar_hatlari, olcek[0])
+        finally:
+            if gc_acikti:
+                gc.enable()
+        return metro
+
+    def _ag_degisti(self) -> None:
+        """Derlenmiş ağı ve ona bağlı ön hesaplamaları geçersiz kılar"""
+        self.surum += 1
+        self._ag = None
+        self._tablolar = None
+        self._ch = None
+        self._alt = None
+
+    def onbellegi_etkinlestir(self, kapasite: int = 1024,
+                              yasam_suresi: Optional[float] = None) -> RotaOnbellegi:
+        """en_az_aktarma_bul ve en_hizli_rota_bul için rota önbelleğini açar"""
+        self.onbellek = RotaOnbellegi(kapasite, yasam_suresi)
+        return self.onbellek
+
+    def izlemeyi_etkinlestir(self, kanca: Optional[Callable[[str, str, str, AramaIstatistigi], None]] = None) -> SorguIzleyici:
+        """Sorgu başına arama istatistiklerini toplamayı açar
+        
+        Açıkken en_az_aktarma_bul, en_az_hat_degisimi_bul ve en_hizli_rota_bul
+        her sorgu için bir AramaIstatistigi doldurur; kayıtlar izleyicinin
+        histogramlarına eklenir ve kanca verilmişse ona iletilir.
+        """
+        if self.izleyici is None:
+            self.izleyici = SorguIzleyici(kanca)
+        elif kanca is not None:
+            self.izleyici.kanca_ekle(kanca)
+        return self.izleyici
+
+    def izlemeyi_kapat(self) -> Optional[SorguIzleyici]:
+        """İzlemeyi kapatır ve toplanan istatistikleriyle izleyiciyi döndürür"""
+        izleyici, self.izleyici = self.izleyici, None
+        return izleyici
+
+    def _izle(self, tur: str, baslangic_id: str, hedef_id: str, arama, *argumanlar):
+        """Aramayı istatistik nesnesiyle çalıştırır, süreyi ölçer ve izleyiciye kaydeder"""
+        istatistik = AramaIstatistigi()
+        bas = time.perf_counter()
+        sonuc = arama(baslangic_id, hedef_id, *argumanlar, istatistik)
+        istatistik.sure_ms = (time.perf_counter() - bas) * 1000
+        if sonuc:
+            rota = sonuc if isinstance(sonuc, list) else sonuc[0]
+            if isinstance(rota[0], tuple):
+                rota = rota[0][0]  # Pareto cephesi: en hızlı rota
+            istatistik.rota_uzunlugu = len(rota)
+        self.izleyici.kaydet(tur, baslangic_id, hedef_id, istatistik)
+        return sonuc
+
+    def dondur(self) -> DerlenmisAg:
+        """Ağı dizi tabanlı gösterime derler ve yeni eklemelere kapatır
+        
+        Dondurulmamış ağlarda da aramalar derlenmiş diziler üzerinde çalışır;
+        derleme her değişiklikten sonraki ilk aramada yeniden yapılır.
+        """
+        self.donduruldu = True
+        return self.derlenmis_ag()
+
+    def derlenmis_ag(self) -> DerlenmisAg:
+        """Güncel derlenmiş ağı döndürür, gerekirse yeniden derler"""
+        if self._ag is None:
+            self._ag = DerlenmisAg(list(self.istasyonlar.values()))
+            # Derleme komşuluk listelerinden yapılır; kapalı istasyonlar yeniden kapatılır
+            self._kapatmalar = {}
+            for idx in self.kapali_istasyonlar:
+                self._istasyonu_kapat(self._ag, idx)
+        return self._ag
+
+    def tablolari_hazirla(self, onbellek_yolu: Optional[str] = None,
+                          yontem: Optional[str] = None) -> MesafeTablolari:
+        """Tüm çiftler süre ve sonraki-istasyon tablolarını hazırlar
+        
+        onbellek_yolu verilmişse ve dosya bu ağa aitse tablolar dosyadan
+        yüklenir; aksi halde hesaplanıp bu dosyaya kaydedilir. Hazırlandıktan
+        sonra en_hizli_rota_bul sorguları tablolardan yanıtlanır.
+        """
+        ag = self.derlenmis_ag()
+        tablolar = None
+        if onbellek_yolu is not None:
+            tablolar = MesafeTablolari.yukle(onbellek_yolu, ag)
+        if tablolar is None:
+            tablolar = MesafeTablolari.olustur(ag, yontem)
+            if onbellek_yolu is not None:
+                tablolar.kaydet(onbellek_yolu)
+        self._tablolar = tablolar
+        return tablolar
+
+    def ch_hazirla(self, onbellek_yolu: Optional[str] = None) -> KontraksiyonHiyerarsisi:
+        """Contraction Hierarchies ön hesaplamasını hazırlar
+        
+        onbellek_yolu verilmişse ve dosya bu ağa aitse hiyerarşi dosyadan
+        yüklenir; aksi halde hesaplanıp bu dosyaya kaydedilir. Hazırlandıktan
+        sonra en_hizli_rota_bul sorguları hiyerarşi üzerinden yanıtlanır.
+        """
+        ag = self.derlenmis_ag()
+        ch = None
+        if onbellek_yolu is not None:
+            ch = KontraksiyonHiyerarsisi.yukle(onbellek_yolu, ag)
+        if ch is None:
+            ch = KontraksiyonHiyerarsisi.olustur(ag)
+            if onbellek_yolu is not None:
+                ch.kaydet(onbellek_yolu)
+        self._ch = ch
+        return ch
+
+    def alt_hazirla(self, sayi: int = 8, yontem: str = "uzak",
+                    onbellek_yolu: Optional[str] = None) -> YerIsaretleri:
+        """ALT yer işaretlerini ve süre dizilerini hazırlar
+
+        onbellek_yolu verilmişse ve dosya bu ağa aitse yer işaretleri dosyadan
+        yüklenir; aksi halde seçilip bu dosyaya kaydedilir. Hazırlandıktan
+        sonra tablo veya CH yoksa en_hizli_rota_bul sorguları ALT sezgiselli
+        A* ile yanıtlanır.
+        """
+        ag = self.derlenmis_ag()
+        yer_isaretleri = None
+        if onbellek_yolu is not None:
+            yer_isaretleri = YerIsaretleri.yukle(onbellek_yolu, ag)
+        if yer_isaretleri is None:
+            yer_isaretleri = YerIsaretleri.olustur(ag, sayi, yontem)
+            if onbellek_yolu is not None:
+                yer_isaretleri.kaydet(onbellek_yolu)
+        self._alt = yer_isaretleri
+        return yer_isaretleri
+
+    def baglanti_suresi_guncelle(self, istasyon1_id: str, istasyon2_id: str, sure: float) -> None:
+        """İki istasyon arasındaki bağlantının süresini değiştirir (gecikme, hızlanma)
+        
+        Bağlantı her iki yönde güncellenir. Ağ yeniden derlenmez: kenar
+        derlenmiş dizilerde yerinde güncellenir, hazırlanmış tablolar yalnızca
+        etkilenen bölgede onarılır ve önbellekten yalnızca sonucu değişmiş
+        olabilecek rotalar silinir. Ağın yapısı değişmediği için dondurulmuş
+        ağlarda da kullanılabilir.
+        """
+        if sure < 0:
+            raise ValueError("Bağlantı süresi negatif olamaz.")
+        self._baglanti_degistir(istasyon1_id, istasyon2_id, sure)
+
+    def baglanti_kaldir(self, istasyon1_id: str, istasyon2_id: str) -> None:
+        """İki istasyon arasındaki bağlantıyı her iki yönde kaldırır
+        
+        Derlenmiş ağda kenar kullanım dışı bırakılır; tablolar ve önbellek
+        baglanti_suresi_guncelle'deki gibi artımlı olarak güncellenir.
+        """
+        self._baglanti_degistir(istasyon1_id, istasyon2_id, None)
+
+    def _baglanti_degistir(self, istasyon1_id: str, istasyon2_id: str, sure: Optional[float]) -> None:
+        istasyon1 = self.istasyonlar[istasyon1_id]
+        istasyon2 = self.istasyonlar[istasyon2_id]
+        if istasyon1 is istasyon2 or not any(komsu is istasyon2 for komsu, _ in istasyon1.komsular):
+            raise ValueError(f"{istasyon1_id} ile {istasyon2_id} arasında bağlantı yok.")
+        for a, b in ((istasyon1, istasyon2), (istasyon2, istasyon1)):
+            if sure is None:
+                a.komsular = [(komsu, s) for komsu, s in a.komsular if komsu is not b]
+            else:
+                a.komsular = [(komsu, sure if komsu is b else s) for komsu, s in a.komsular]
+        
+        eski_surum = self.surum
+        self.surum += 1
+        ag = self._ag
+        if ag is None:
+            return  # Sonraki aramada komşuluk listelerinden yeniden derlenir
+        u, v = ag.indeksler[istasyon1_id], ag.indeksler[istasyon2_id]
+        
+        kapali = [idx for idx in (istasyon1_id, istasyon2_id) if idx in self.kapali_istasyonlar]
+        if kapali:
+            # Kenar kapatma sırasında zaten kaldırıldı; yalnızca açılışta geri yüklenecek kayıt değişir
+            for idx in kapali:
+                kayitlar = []
+                for kayit in self._kapatmalar[idx]:
+                    if {kayit[0], kayit[2]} == {u, v}:
+                        if sure is None:
+                            continue
+                        kayit = kayit[:3] + (sure,)
+                    kayitlar.append(kayit)
+                self._kapatmalar[idx] = kayitlar
+            if self.onbellek is not None:
+                self.onbellek.ayikla(eski_surum, self.surum, lambda tur, deger: False)
+            return
+        
+        eski_maliyet = ag.kenar_maliyeti(u, v)
+        for a, b in ((u, v), (v, u)):
+            for e in ag.kenarlar(a, b):
+                if sure is None:
+                    ag._kenari_kaldir(a, e)
+                else:
+                    ag._kenar_suresi_ata(a, e, sure)
+        self._kenar_degisti(ag, u, v, eski_maliyet)
+        if self._tablolar is not None:
+            self._tablolar.ozet = ag.ozet()  # Onarılan tablolar güncel ağa aittir
+        
+        if self.onbellek is not None:
+            if ag.kenar_maliyeti(u, v) > eski_maliyet:
+                # Bu bağlantıyı kullanmayan rotalar en iyi olmaya devam eder; en az duraklı
+                # rotalar yalnızca bağlantı kaldırıldığında etkilenir
+                def sil(tur: str, deger) -> bool:
+                    return ((tur == "hizli" or sure is None) and deger is not None
+                            and self._rota_baglantiyi_kullaniyor(deger[0], istasyon1_id, istasyon2_id))
+            else:
+                def sil(tur: str, deger) -> bool:
+                    return tur == "hizli"
+            self.onbellek.ayikla(eski_surum, self.surum, sil)
+
+    def istasyon_kapat(self, idx: str) -> None:
+        """İstasyonu geçici olarak kapatır (arıza, bakım)
+        
+        İstasyonun tüm bağlantıları derlenmiş ağda kullanım dışı bırakılır;
+        komşuluk listeleri korunur ve istasyon_ac bağlantıları son süreleriyle
+        geri getirir. Tablolar kenar kenar artımlı olarak onarılır.
+        """
+        if idx not in self.istasyonlar:
+            raise KeyError(idx)
+        if idx in self.kapali_istasyonlar:
+            return
+        self.kapali_istasyonlar.add(idx)
+        eski_surum = self.surum
+        self.surum += 1
+        ag = self._ag
+        if ag is None:
+            return
+        self._istasyonu_kapat(ag, idx)
+        if self._tablolar is not None:
+            self._tablolar.ozet = ag.ozet()
+        if self.onbellek is not None:
+            self.onbellek.ayikla(eski_surum, self.surum, lambda tur, deger: (
+                deger is not None and any(istasyon.idx == idx for istasyon in deger[0])))
+
+    def _istasyonu_kapat(self, ag: DerlenmisAg, idx: str) -> None:
+        """İstasyonun kenarlarını kaldırıp kaydeder ve tabloları her komşu için onarır"""
+        u = ag.indeksler[idx]
+        kayitlar = self._kapatmalar.setdefault(idx, [])
+        hedefler, sureler = ag.hedefler, ag.sureler
+        for e in range(ag.ofsetler[u], ag.ofsetler[u + 1]):
+            v = hedefler[e]
+            if v == u:
+                continue  # Zaten kaldırılmış (ör. daha önce kapatılmış bir komşuya giden) kenar
+            eski_maliyet = ag.kenar_maliyeti(u, v)
+            # Tablolar her bağlantı kaldırıldıktan hemen sonra onarılır; böylece
+            # her onarım tutarlı bir tablodan başlar
+            for a, b in ((u, v), (v, u)):
+                for f in ag.kenarlar(a, b):
+                    kayitlar.append((a, f, b, sureler[f]))
+                    ag._kenari_kaldir(a, f)
+            self._kenar_degisti(ag, u, v, eski_maliyet)
+
+    def istasyon_ac(self, idx: str) -> None:
+        """istasyon_kapat ile kapatılmış istasyonu bağlantılarıyla yeniden açar"""
+        if idx not in self.kapali_istasyonlar:
+            return
+        self.kapali_istasyonlar.discard(idx)
+        eski_surum = self.surum
+        self.surum += 1
+        ag = self._ag
+        kayitlar = self._kapatmalar.pop(idx, [])
+        if ag is None:
+            return
+        u = ag.indeksler[idx]
+        ciftler: Dict[Tuple[int, int], float] = {}
+        for kayit in kayitlar:
+            a, e, b, sure = kayit
+            diger = b if a == u else a
+            if ag.idler[diger] in self.kapali_istasyonlar:
+                # Komşu hâlâ kapalı; kenar o istasyon açıldığında geri gelir
+                self._kapatmalar[ag.idler[diger]].append(kayit)
+                continue
+            ciftler.setdefault((min(a, b), max(a, b)), ag.kenar_maliyeti(a, b))
+            ag.hedefler[e] = b
+            ag._kenar_suresi_ata(a, e, sure)
+        # Maliyet düşüşlerinin onarımı sırası önemsizdir; hepsi birlikte geri yüklenebilir
+        for (a, b), eski_maliyet in ciftler.items():
+            self._kenar_degisti(ag, a, b, eski_maliyet)
+        if self._tablolar is not None:
+            self._tablolar.ozet = ag.ozet()
+        if self.onbellek is not None:
+            # Yeni bağlantılar her tür rotayı kısaltabilir
+            self.onbellek.ayikla(eski_surum, self.surum, lambda tur, deger: True)
+
+    def _kenar_degisti(self, ag: DerlenmisAg, u: int, v: int, eski_maliyet: float) -> None:
+        """Derlenmiş ağdaki bir kenar değişikliğini ön hesaplamalara yansıtır
+        
+        Tablolar artımlı olarak onarılır. CH kısayolları eski maliyetlere
+        dayandığından hiyerarşi bırakılır; gerekirse ch_hazirla ile yeniden
+        hazırlanır, o zamana kadar sorgular tablolar veya A* ile yanıtlanır.
+        ALT sınırları yalnızca maliyet düştüğünde geçersizleşir.
+        """
+        self._ch = None
+        if self._alt is not None and ag.kenar_maliyeti(u, v) < eski_maliyet:
+            self._alt = None
+        if self._tablolar is not None:
+            self._tablolar.kenar_degisti(ag, u, v, eski_maliyet)
+
+    @staticmethod
+    def _rota_baglantiyi_kullaniyor(rota, istasyon1_id: str, istasyon2_id: str) -> bool:
+        return any((a.idx == istasyon1_id and b.idx == istasyon2_id)
+                   or (a.idx == istasyon2_id and b.idx == istasyon1_id)
+                   for a, b in zip(rota, rota[1:]))
+
+    def _istasyonlara_cevir(self, ag: DerlenmisAg, rota: List[int]) -> List[Istasyon]:
+        return [self.istasyonlar[ag.idler[i]] for i in rota]
     
-    def en_az_aktarma_bul(self, baslangic_id: str, hedef_id: str) -> Optional[List[Istasyon]]:
+    def en_az_aktarma_bul(self, baslangic_id: str, hedef_id: str,
+                          cift_yonlu: bool = False) -> Optional[List[Istasyon]]:
         """BFS algoritması kullanarak en az aktarmalı rotayı bulur
         
-        Bu fonksiyonu tamamlayın:
+        Arama derlenmiş ağın dizileri üzerinde çalışır:
         1. Başlangıç ve hedef istasyonların varlığını kontrol edin
         2. BFS algoritmasını kullanarak en az aktarmalı rotayı bulun
+           (cift_yonlu=True ise arama iki uçtan birden yürütülür)
         3. Rota bulunamazsa None, bulunursa istasyon listesi döndürün
+        
+        Not: BFS durak sayısını en aza indirir. Gerçek hat değişimi sayısını
+        en aza indiren rota için en_az_hat_degisimi_bul kullanılmalıdır.
         """
+        if self.izleyici is not None:
+            return self._izle("aktarma", baslangic_id, hedef_id, self._en_az_aktarma_bul, cift_yonlu)
+        return self._en_az_aktarma_bul(baslangic_id, hedef_id, cift_yonlu)
+
+    def _en_az_aktarma_bul(self, baslangic_id: str, hedef_id: str, cift_yonlu: bool = False,
+                           istatistik: Optional[AramaIstatistigi] = None) -> Optional[List[Istasyon]]:
         if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
             return None
         
-        baslangic = self.istasyonlar[baslangic_id]
-        hedef = self.istasyonlar[hedef_id]
+        if self.onbellek is not None:
+            bulundu, deger = self.onbellek.al("aktarma", baslangic_id, hedef_id, self.surum)
+            if bulundu:
+                if istatistik is not None:
+                    istatistik.motor = "onbellek"
+                return None if deger is None else list(deger[0])
         
-        # BFS algoritması için kuyruk oluşturma
-        kuyruk = deque([(baslangic, [baslangic])])
-        ziyaret_edildi = {baslangic}
+        ag = self.derlenmis_ag()
+        arama = ag.cift_yonlu_bfs if cift_yonlu else ag.bfs
+        if istatistik is not None:
+            istatistik.motor = arama.__name__
+        rota = arama(ag.indeksler[baslangic_id], ag.indeksler[hedef_id], istatistik)
+        sonuc = None if rota is None else self._istasyonlara_cevir(ag, rota)
+        if self.onbellek is not None:
+            deger = None if sonuc is None else (tuple(sonuc), None)
+            self.onbellek.koy("aktarma", baslangic_id, hedef_id, self.surum, deger)
+        return sonuc
+
+    def en_az_hat_degisimi_bul(self, baslangic_id: str, hedef_id: str) -> Optional[Tuple[List[Istasyon], int, int]]:
+        """Hat değişimi sayısı en az olan rotayı seviyeli Dijkstra ile bulur
         
-        while kuyruk:
-            # Kuyruğun başındaki istasyonu ve rotayı al
-            guncel_istasyon, rota = kuyruk.popleft()
-            
-            # Hedef istasyona ulaşıldıysa rotayı döndür
-            if guncel_istasyon == hedef:
-                return rota
-            
-            # Komşu istasyonları keşfet
-            for komsu, _ in guncel_istasyon.komsular:
-                if komsu not in ziyaret_edildi:
-                    # Yeni rotayı oluştur ve kuyruğa ekle
-                    yeni_rota = rota + [komsu]
-                    kuyruk.append((komsu, yeni_rota))
-                    ziyaret_edildi.add(komsu)
-        
-        # Rota bulunamadıysa None döndür
-        return None
+        Aynı hat üzerinde ilerlemek 0, hat değiştirmek 1 aktarma sayılır.
+        İstasyonlar (aktarma sayısı, süre) sırasıyla kesinleşir: her aktarma
+        seviyesi ayrı bir Dijkstra'dır, bu yüzden eşit aktarmalı rotalar
+        arasında en kısa süreli olan seçilir.
+        Rota bulunamazsa None, bulunursa (istasyon_listesi, aktarma_sayisi,
+        toplam_sure) tuple'ı döndürür.
+        """
+        if self.izleyici is not None:
+            return self._izle("hat_degisimi", baslangic_id, hedef_id, self._en_az_hat_degisimi_bul)
+        return self._en_az_hat_degisimi_bul(baslangic_id, hedef_id)
+
+    def _en_az_hat_degisimi_bul(self, baslangic_id: str, hedef_id: str,
+                                istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[Istasyon], int, int]]:
+        if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
+            return None
+        
+        ag = self.derlenmis_ag()
+        if istatistik is not None:
+            istatistik.motor = "en_az_aktarma_dijkstra"
+        sonuc = ag.en_az_aktarma_dijkstra(ag.indeksler[baslangic_id], ag.indeksler[hedef_id], istatistik)
+        if sonuc is None:
+            return None
+        rota, aktarma_sayisi, sure = sonuc
+        return (self._istasyonlara_cevir(ag, rota), aktarma_sayisi, _sure_degeri(sure))
+
+    def pareto_rotalar(self, baslangic_id: str, hedef_id: str) -> List[Tuple[List[Istasyon], int, int]]:
+        """Süre ve hat değişimi için Pareto-optimal rotaları tek aramada bulur
+        
+        Süresi artan, hat değişimi azalan (istasyon_listesi, toplam_sure,
+        aktarma_sayisi) listesi döndürür: ilki en_hizli_rota_bul'un, sonuncusu
+        en_az_hat_degisimi_bul'un yanıtıyla aynı süre ve aktarmaya sahiptir.
+        Aradaki rotalar daha az aktarma için daha fazla süre harcayan
+        seçeneklerdir. Rota yoksa boş liste döner.
+        """
+        if self.izleyici is not None:
+            return self._izle("pareto", baslangic_id, hedef_id, self._pareto_rotalar)
+        return self._pareto_rotalar(baslangic_id, hedef_id)
+
+    def _pareto_rotalar(self, baslangic_id: str, hedef_id: str,
+                        istatistik: Optional[AramaIstatistigi] = None) -> List[Tuple[List[Istasyon], int, int]]:
+        if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
+            return []
+        ag = self.derlenmis_ag()
+        if istatistik is not None:
+            istatistik.motor = "pareto"
+        cephe = ag.pareto_arama(ag.indeksler[baslangic_id], ag.indeksler[hedef_id], istatistik)
+        return [(self._istasyonlara_cevir(ag, rota), _sure_degeri(sure), aktarma)
+                for rota, sure, aktarma in cephe]
 
     def en_hizli_rota_bul(self, baslangic_id: str, hedef_id: str) -> Optional[Tuple[List[Istasyon], int]]:
         """A* algoritması kullanarak en hızlı rotayı bulur
         
-        Bu fonksiyonu tamamlayın:
+        Arama derlenmiş ağın dizileri üzerinde çalışır:
         1. Başlangıç ve hedef istasyonların varlığını kontrol edin
         2. A* algoritmasını kullanarak en hızlı rotayı bulun
         3. Rota bulunamazsa None, bulunursa (istasyon_listesi, toplam_sure) tuple'ı döndürün
         """
+        if self.izleyici is not None:
+            return self._izle("hizli", baslangic_id, hedef_id, self._en_hizli_rota_bul)
+        return self._en_hizli_rota_bul(baslangic_id, hedef_id)
+
+    def _en_hizli_rota_bul(self, baslangic_id: str, hedef_id: str,
+                           istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[Istasyon], int]]:
         if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
             return None
 
-        baslangic = self.istasyonlar[baslangic_id]
-        hedef = self.istasyonlar[hedef_id]
+        if self.onbellek is not None:
+            bulundu, deger = self.onbellek.al("hizli", baslangic_id, hedef_id, self.surum)
+            if bulundu:
+                if istatistik is not None:
+                    istatistik.motor = "onbellek"
+                return None if deger is None else (list(deger[0]), deger[1])
+
+        ag = self.derlenmis_ag()
+        baslangic, hedef = ag.indeksler[baslangic_id], ag.indeksler[hedef_id]
+        if self._tablolar is not None:
+            motor = "tablo"
+            sonuc = self._tablolar.rota(baslangic, hedef)
+        elif self._ch is not None:
+            motor = "ch"
+            sonuc = self._ch.rota(baslangic, hedef, istatistik)
+        elif self._alt is not None:
+            motor = "alt"
+            sonuc = ag.alt_a_yildiz(baslangic, hedef, self._alt, istatistik)
+        else:
+            motor = "a_yildiz"
+            sonuc = ag.a_yildiz(baslangic, hedef, istatistik)
+        if istatistik is not None:
+            istatistik.motor = motor
+        if sonuc is not None:
+            rota, sure = sonuc
+            sonuc = (self._istasyonlara_cevir(ag, rota), _sure_degeri(sure))
+        if self.onbellek is not None:
+            deger = None if sonuc is None else (tuple(sonuc[0]), sonuc[1])
+            self.onbellek.koy("hizli", baslangic_id, hedef_id, self.surum, deger)
+        return sonuc
+
+    def konum_indeksi(self) -> KonumIndeksi:
+        """İstasyon koordinatlarının uzamsal indeksini döndürür, gerekirse kurar
+        
+        İndeks derlenmiş ağın istasyon indeksleriyle çalışır ve yalnızca
+        istasyon_ekle ile geçersiz kılınır.
+        """
+        if self._konum_indeksi is None:
+            ag = self.derlenmis_ag()
+            self._konum_indeksi = KonumIndeksi(ag.xler, ag.yler)
+        return self._konum_indeksi
+
+    def en_yakin_istasyonlar(self, x: float, y: float, k: int = 1) -> List[Tuple[Istasyon, float]]:
+        """(x, y) noktasına en yakın k istasyonu (istasyon, mesafe) olarak döndürür"""
+        ag = self.derlenmis_ag()
+        return [(self.istasyonlar[ag.idler[i]], mesafe) for mesafe, i in self.konum_indeksi().en_yakin(x, y, k)]
+
+    def yaricaptaki_istasyonlar(self, x: float, y: float, yaricap: float) -> List[Tuple[Istasyon, float]]:
+        """(x, y) noktasına yaricap kadar yakın istasyonları yakından uzağa (istasyon, mesafe) olarak döndürür"""
+        ag = self.derlenmis_ag()
+        return [(self.istasyonlar[ag.idler[i]], mesafe)
+                for mesafe, i in self.konum_indeksi().yaricap_icinde(x, y, yaricap)]
+
+    def kompleksler(self) -> IstasyonKompleksleri:
+        """Aynı adlı istasyonları gruplayan ad indeksini döndürür, gerekirse kurar
+
+        İndeks yalnızca istasyon_ekle ile geçersiz kılınır.
+        """
+        if self._kompleksler is None:
+            self._kompleksler = IstasyonKompleksleri(self.istasyonlar.values())
+        return self._kompleksler
+
+    def istasyon_ara(self, sorgu: str, limit: int = 10) -> List[Tuple[str, List[Istasyon]]]:
+        """Ada göre istasyon arar; (kompleks adı, peron istasyonları) listesi döndürür
+
+        Tam eşleşme önce, ardından adının bir kelimesi sorguyla başlayanlar,
+        son olarak yazım hatası payıyla bulanık eşleşmeler gelir. Büyük/küçük
+        harf ve Türkçe karakter farkı gözetilmez.
+        """
+        kompleksler = self.kompleksler()
+        return [(ad, kompleksler.gruplar[ad]) for ad in kompleksler.ara(sorgu, limit)]
+
+    def kompleks_rotasi(self, baslangic_adi: str, hedef_adi: str) -> Optional[Tuple[List[Istasyon], int]]:
+        """İki istasyon adı arasındaki en hızlı rotayı tüm peronları birlikte arayarak bulur
+
+        Başlangıç kompleksinin tüm peronları sıfır maliyetle kaynak, hedef
+        kompleksinin tüm peronları hedef olan tek bir çok kaynaklı/çok hedefli
+        A* araması yapılır; peron çiftleri tek tek denenmez. Sonuç
+        en_hizli_rota_bul ile aynı biçimdedir; rota, seçilen peronlarla
+        başlar ve biter. Ad bilinmiyorsa ya da rota yoksa None döner.
+        """
+        if self.izleyici is not None:
+            return self._izle("kompleks", baslangic_adi, hedef_adi, self._kompleks_rotasi)
+        return self._kompleks_rotasi(baslangic_adi, hedef_adi)
+
+    def _kompleks_uclari(self, baslangic_adi: str, hedef_adi: str):
+        """İki kompleksin açık peronlarını ve hedef sezgiselini hazırlar
+
+        (ag, başlangıç peronları, bitiş peronları, hx, hy, olcek) döndürür;
+        komplekslerden biri bilinmiyorsa ya da tüm peronları kapalıysa None.
+        """
+        kompleksler = self.kompleksler()
+        ag = self.derlenmis_ag()
+        baslangiclar = {ag.indeksler[ist.idx]: 0.0 for ist in kompleksler.kompleks(baslangic_adi)
+                        if ist.idx not in self.kapali_istasyonlar}
+        bitisler = {ag.indeksler[ist.idx]: 0.0 for ist in kompleksler.kompleks(hedef_adi)
+                    if ist.idx not in self.kapali_istasyonlar}
+        if not baslangiclar or not bitisler:
+            return None
+        # Peronlar aynı konumdaysa (örnek ağdaki gibi) Öklid sezgiseli kabul edilebilir kalır
+        konumlar = {(ag.xler[i], ag.yler[i]) for i in bitisler}
+        hx, hy = next(iter(konumlar))
+        olcek = ag.sezgisel_olcek if len(konumlar) == 1 else 0.0
+        return ag, baslangiclar, bitisler, hx, hy, olcek
+
+    def _kompleks_rotasi(self, baslangic_adi: str, hedef_adi: str,
+                         istatistik: Optional[AramaIstatistigi] = None) -> Optional[Tuple[List[Istasyon], int]]:
+        uclar = self._kompleks_uclari(baslangic_adi, hedef_adi)
+        if uclar is None:
+            return None
+        ag, baslangiclar, bitisler, hx, hy, olcek = uclar
+        if istatistik is not None:
+            istatistik.motor = "coklu_a_yildiz"
+        sonuc = ag.coklu_a_yildiz(baslangiclar, bitisler, hx, hy, olcek, istatistik)
+        if sonuc is None:
+            return None
+        return (self._istasyonlara_cevir(ag, sonuc[0]), _sure_degeri(sonuc[1]))
+
+    def kompleks_pareto_rotalar(self, baslangic_adi: str, hedef_adi: str) -> List[Tuple[List[Istasyon], int, int]]:
+        """İki istasyon adı arasındaki süre × aktarma Pareto cephesini tek aramada bulur
+
+        pareto_rotalar gibidir, ama başlangıç kompleksinin tüm peronları kaynak,
+        hedef kompleksinin tüm peronları hedef olan tek bir çok kaynaklı/çok
+        hedefli arama yapılır. Böylece en hızlı ve en az aktarmalı rotalar,
+        her biri kendi uç peronlarıyla aynı cepheden gelir. Ad bilinmiyorsa
+        ya da rota yoksa boş liste döner.
+        """
+        if self.izleyici is not None:
+            return self._izle("kompleks_pareto", baslangic_adi, hedef_adi, self._kompleks_pareto_rotalar)
+        return self._kompleks_pareto_rotalar(baslangic_adi, hedef_adi)
+
+    def _kompleks_pareto_rotalar(self, baslangic_adi: str, hedef_adi: str,
+                                 istatistik: Optional[AramaIstatistigi] = None) -> List[Tuple[List[Istasyon], int, int]]:
+        uclar = self._kompleks_uclari(baslangic_adi, hedef_adi)
+        if uclar is None:
+            return []
+        ag, baslangiclar, bitisler, hx, hy, olcek = uclar
+        if istatistik is not None:
+            istatistik.motor = "pareto"
+        cephe = ag.coklu_pareto_arama(baslangiclar, set(bitisler), hx, hy, olcek, istatistik)
+        return [(self._istasyonlara_cevir(ag, rota), _sure_degeri(sure), aktarma)
+                for rota, sure, aktarma in cephe]
+
+    def erisilebilir_istasyonlar(self, baslangic_id: str, dakika: float) -> List[Tuple[Istasyon, float]]:
+        """baslangic_id'den en fazla dakika sürede ulaşılan istasyonları (istasyon, süre) olarak döndürür
+
+        Süreler en_hizli_rota_bul'daki gibi aktarma cezasını içerir ve
+        yakından uzağa sıralıdır. Tablolar hazırsa süreler tablo satırından
+        okunur; aksi halde bütçede duran sınırlı bir Dijkstra çalışır.
+        """
+        ag = self.derlenmis_ag()
+        if baslangic_id not in ag.indeksler:
+            return []
+        kaynak = ag.indeksler[baslangic_id]
+        if self._tablolar is not None:
+            n = len(ag)
+            satir = self._tablolar.mesafe[kaynak * n:(kaynak + 1) * n]
+            bulunan = sorted((d, t) for t, d in enumerate(satir) if d <= dakika)
+        else:
+            dugumler, sureler = ag.erisilebilir(kaynak, dakika)
+            bulunan = zip(sureler, dugumler)
+        return [(self.istasyonlar[ag.idler[t]], _sure_degeri(d)) for d, t in bulunan]
+
+    def toplu_erisilebilirlik(self, baslangic_idleri: List[str], dakika: float) -> "np.ndarray":
+        """Birçok başlangıç için erişilebilirlik süre matrisini döndürür (NumPy gerektirir)
+
+        Satırlar baslangic_idleri, sütunlar derlenmis_ag().idler sırasındadır;
+        dakika içinde ulaşılamayan istasyonların süresi inf'tir. Tablolar
+        hazırsa satırlar tablodan kesilir, aksi halde tüm başlangıçlar
+        DerlenmisAg.toplu_erisilebilir ile birlikte hesaplanır.
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Toplu erişilebilirlik için NumPy kütüphanesi gerekli.")
+        ag = self.derlenmis_ag()
+        kaynaklar = [ag.indeksler[idx] for idx in baslangic_idleri]
+        if self._tablolar is None:
+            return ag.toplu_erisilebilir(kaynaklar, dakika)
+        n = len(ag)
+        sonuc = np.asarray(self._tablolar.mesafe, dtype=np.float64).reshape(n, n)[kaynaklar]
+        sonuc[sonuc > dakika] = np.inf
+        return sonuc
+
+    def rota_koordinat(self, x1: float, y1: float, x2: float, y2: float, yurume_hizi: float = 1.0,
+                       aday_sayisi: int = 4,
+                       en_fazla_yurume: Optional[float] = None) -> Optional[Tuple[List[Istasyon], float, float, float]]:
+        """İki koordinat arasındaki en hızlı yürüme + metro rotasını bulur
         
-        # A* algoritması için öncelik kuyruğu oluşturma
-        # (f_score, istasyon_id, istasyon, rota, g_score)
-        # f_score = g_score (gerçek maliyet) + h_score (tahmini maliyet)
-        # g_score = başlangıçtan şimdiye kadar geçen süre
-        # h_score = şimdiden hedefe tahmini süre (Öklid mesafesi)
+        Her iki uçta en yakın aday_sayisi istasyon (en_fazla_yurume verilmişse
+        bu mesafeden yakın olanlar) alınır. Başlangıç adayları yürüme
+        süreleriyle tohumlanır, bitiş adaylarına kalan yürüme süresi eklenir
+        ve tek bir çok kaynaklı/çok hedefli A* ile en iyi çift bulunur; her
+        aday çifti için ayrı arama yapılmaz. yurume_hizi koordinat birimi /
+        dakika cinsindendir.
         
-        # Başlangıç düğümü için f_score = 0 + h_score
-        h_score = baslangic.oklid_mesafe(hedef)
-        pq = [(h_score, id(baslangic), baslangic, [baslangic], 0)]
-        ziyaret_edildi = set()
+        (istasyon_listesi, toplam_sure, ilk_yurume, son_yurume) döndürür.
+        Doğrudan yürümek daha kısaysa istasyon listesi boştur; uygun istasyon
+        ve yürüme yolu yoksa None döner.
+        """
+        if yurume_hizi <= 0:
+            raise ValueError("Yürüme hızı pozitif olmalı.")
+        ag = self.derlenmis_ag()
+        indeks = self.konum_indeksi()
         
-        while pq:
-            # En düşük f_score'a sahip rotayı al
-            _, _, guncel_istasyon, rota, g_score = heapq.heappop(pq)
-            
-            # Hedef istasyona ulaşıldıysa rotayı ve toplam süreyi döndür
-            if guncel_istasyon == hedef:
-                return (rota, g_score)
-            
-            # İstasyon daha önce ziyaret edildiyse atla
-            istasyon_id = id(guncel_istasyon)
-            if istasyon_id in ziyaret_edildi:
-                continue
-            
-            ziyaret_edildi.add(istasyon_id)
-            
-            # Komşu istasyonları keşfet
-            for komsu, sure in guncel_istasyon.komsular:
-                if id(komsu) not in ziyaret_edildi:
-                    # Yeni rotayı ve g_score'u hesapla
-                    yeni_rota = rota + [komsu]
-                    yeni_g_score = g_score + sure
-                    
-                    # Hat değişimi varsa ek süre ekle (aktarma süresi)
-                    if len(rota) > 0 and rota[-1].hat != komsu.hat:
-                        # Aktarma süresi olarak 2 dakika ekleyelim
-                        yeni_g_score += 2
-                    
-                    # Heuristik (h_score) hesapla - Öklid mesafesi
-                    h_score = komsu.oklid_mesafe(hedef)
-                    
-                    # f_score = g_score + h_score
-                    f_score = yeni_g_score + h_score
-                    
-                    # Öncelik kuyruğuna ekle
-                    heapq.heappush(pq, (f_score, id(komsu), komsu, yeni_rota, yeni_g_score))
-        
-        # Rota bulunamadıysa None döndür
-        return None
+        def adaylar(x: float, y: float) -> Dict[int, float]:
+            return {i: mesafe / yurume_hizi for mesafe, i in indeks.en_yakin(x, y, aday_sayisi)
+                    if (en_fazla_yurume is None or mesafe <= en_fazla_yurume)
+                    and ag.idler[i] not in self.kapali_istasyonlar}
+        
+        baslangiclar, bitisler = adaylar(x1, y1), adaylar(x2, y2)
+        sonuc = None
+        if baslangiclar and bitisler:
+            # Kalan yol en hızlı kenardan da yürümekten de hızlı geçilemez
+            sonuc = ag.coklu_a_yildiz(baslangiclar, bitisler, x2, y2, min(ag.sezgisel_olcek, 1 / yurume_hizi))
+        
+        yurume_mesafesi = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+        yurume = yurume_mesafesi / yurume_hizi
+        if (sonuc is None or yurume <= sonuc[1]) and (en_fazla_yurume is None or yurume_mesafesi <= en_fazla_yurume):
+            return ([], _sure_degeri(round(yurume, 1)), _sure_degeri(round(yurume, 1)), 0)
+        if sonuc is None:
+            return None
+        rota, sure = sonuc
+        return (self._istasyonlara_cevir(ag, rota), _sure_degeri(round(sure, 1)),
+                _sure_degeri(round(baslangiclar[rota[0]], 1)), _sure_degeri(round(bitisler[rota[-1]], 1)))
+
+    def alternatif_rotalar(self, baslangic_id: str, hedef_id: str, k: int = 3,
+                           en_fazla_ortaklik: float = 0.8,
+                           zaman_siniri: Optional[float] = None) -> List[Tuple[List[Istasyon], int, str]]:
+        """En hızlı rota ve birbirinden yeterince farklı k - 1 alternatifini bulur
+
+        Rotalar süreye göre sıralı (istasyon_listesi, toplam_sure, rota_formatla
+        metni) olarak döner; ilki en hızlı rotadır. Seçilmiş bir rotayla ortak
+        bağlantılarının süresi kendi süresinin en_fazla_ortaklik oranını aşan
+        rotalar elenir. Bir istasyondan çıkıp ona başka bir hattan geri dönen
+        rotalar da döndürülmez: örneğin T5→M5 için Gar'a T hattıyla gelip
+        Kızılay üzerinden M hattıyla yeniden Gar'a dönen 50 dakikalık rota
+        elenir. Bu yüzden k'dan az rota dönebilir. zaman_siniri (saniye)
+        dolduğunda o ana kadar bulunan rotalar döndürülür. Tablolar hazırsa
+        hedefin ters en kısa yol ağacı tablolardan okunur. Rota yoksa boş
+        liste döner.
+        """
+        son_an = None if zaman_siniri is None else time.perf_counter() + zaman_siniri
+        if baslangic_id not in self.istasyonlar or hedef_id not in self.istasyonlar:
+            return []
+        ag = self.derlenmis_ag()
+        baslangic, hedef = ag.indeksler[baslangic_id], ag.indeksler[hedef_id]
+        agac = None
+        if self._tablolar is not None:
+            n = self._tablolar.n
+            agac = (self._tablolar.mesafe[hedef::n], self._tablolar.sonraki[hedef::n])
+        sonuclar = []
+        for rota, sure in ag.alternatif_rotalar(baslangic, hedef, k, en_fazla_ortaklik, son_an, agac):
+            istasyonlar = self._istasyonlara_cevir(ag, rota)
+            sonuclar.append((istasyonlar, _sure_degeri(sure), rota_formatla(istasyonlar)))
+        return sonuclar
+
+    def rota_toplu(self, ciftler: Iterable[Tuple[str, str]], isci_sayisi: Optional[int] = None,
+                   parca_boyutu: int = 10000) -> Iterator[Tuple[str, str, Optional[Tuple[List[Istasyon], int]]]]:
+        """Çok sayıda (başlangıç, hedef) çifti için en hızlı rotaları üretir
+        
+        Girdi parca_boyutu çiftlik parçalar halinde okunur. Her parçanın
+        çiftleri başlangıç istasyonuna göre gruplanır ve her başlangıç için tek
+        bir Dijkstra çalıştırılır; o başlangıcın tüm hedefleri aynı en kısa yol
+        ağacından yanıtlanır. Başlangıçlar bir ProcessPoolExecutor'a dağıtılır;
+        havuz ilk çok başlangıçlı parçada kurulur ve derlenmiş ağ her işçiye
+        başlatılırken bir kez gönderilir. Bir parçanın sonuçları
+        (baslangic_id, hedef_id, sonuc) olarak girdi sırasıyla üretilir ve
+        sonraki parça ancak ondan sonra okunur; bellek kullanımı çift
+        sayısından bağımsız olarak parça boyutuyla sınırlıdır. sonuc
+        en_hizli_rota_bul ile aynı biçimdedir.
+        
+        isci_sayisi 1 ise tüm hesaplama bu süreçte yapılır.
+        """
+        ag = self.derlenmis_ag()
+        if isci_sayisi is None:
+            isci_sayisi = os.cpu_count() or 1
+        girdi = iter(ciftler)
+        havuz: Optional[ProcessPoolExecutor] = None
+        try:
+            while True:
+                parca = list(islice(girdi, parca_boyutu))
+                if not parca:
+                    return
+                gruplar: Dict[int, List[int]] = defaultdict(list)
+                for baslangic_id, hedef_id in parca:
+                    if baslangic_id in ag.indeksler and hedef_id in ag.indeksler:
+                        gruplar[ag.indeksler[baslangic_id]].append(ag.indeksler[hedef_id])
+                
+                if self._tablolar is not None:
+                    # Tablolar hazırsa her çift doğrudan tablodan yanıtlanır
+                    sonuclar = ((kaynak, [(hedef,) + (self._tablolar.rota(kaynak, hedef) or (None, INF))
+                                          for hedef in hedefler])
+                                for kaynak, hedefler in gruplar.items())
+                elif isci_sayisi > 1 and len(gruplar) > 1:
+                    if havuz is None:
+                        havuz = ProcessPoolExecutor(max_workers=isci_sayisi, initializer=_isci_baslat,
+                                                    initargs=(ag,))
+                    sonuclar = havuz.map(_isci_kaynak_rotalari, gruplar.keys(), gruplar.values(),
+                                         chunksize=max(1, len(gruplar) // (4 * isci_sayisi)))
+                else:
+                    sonuclar = ((kaynak, _kaynak_rotalari(ag, kaynak, hedefler))
+                                for kaynak, hedefler in gruplar.items())
+                
+                yanitlar: Dict[Tuple[int, int], Optional[Tuple[List[Istasyon], int]]] = {}
+                for kaynak, kaynak_sonuclari in sonuclar:
+                    for hedef, rota, sure in kaynak_sonuclari:
+                        yanitlar[(kaynak, hedef)] = (None if rota is None else
+                                                     (self._istasyonlara_cevir(ag, rota), _sure_degeri(sure)))
+                for baslangic_id, hedef_id in parca:
+                    anahtar = (ag.indeksler.get(baslangic_id), ag.indeksler.get(hedef_id))
+                    yield (baslangic_id, hedef_id, yanitlar.get(anahtar))
+        finally:
+            if havuz is not None:
+                havuz.shutdown()
 
 # Rota formatını iyileştiren yardımcı fonksiyon
 def rota_formatla(rota):
@@ -162,8 +2944,8 @@ def rota_formatla(rota):
         
     return " -> ".join(formatted_rota)
 
-    # Örnek Kullanım
-if __name__ == "__main__":
+# Örnek ağ: Ankara metrosunun beş hattı ve Ray Hattı
+def ornek_metro_agi() -> MetroAgi:
     metro = MetroAgi()
     
     # İstasyonlar ekleme (x, y koordinatları ile)
@@ -240,10 +3022,19 @@ if __name__ == "__main__":
     metro.baglanti_ekle("M1", "Y3", 2)  # AŞTİ aktarma
     metro.baglanti_ekle("K1", "R1", 3)  # Kızılay -> Ray Merkez aktarma
     
+    return metro
+
+    # Örnek Kullanım
+if __name__ == "__main__":
+    metro = ornek_metro_agi()
+    son_rota = []
+    
     def metro_haritasi_goster():
-        """Metro haritasını görselleştiren fonksiyon"""
+        """Metro haritasını görselleştiren fonksiyon; son planlanan en hızlı rota vurgulanır"""
         if not TKINTER_AVAILABLE:
             print("\nGörselleştirme kullanılamıyor. Tkinter veya PIL kütüphanesi yüklü değil.")
+            if PIL_AVAILABLE:
+                print("PNG harita için: python metro_harita.py --rota Batıkent Keçiören --cikti rota.png")
             print("Metin tabanlı harita gösteriliyor:\n")
             
             # Basit bir metin tabanlı harita göster
@@ -259,6 +3050,8 @@ if __name__ == "__main__":
             return
             
         try:
+            from metro_harita import TkHaritasi
+            
             # Tkinter penceresi oluştur
             root = tk.Tk()
             root.title("Ankara Metro Haritası")
@@ -272,115 +3065,46 @@ if __name__ == "__main__":
             map_frame = Frame(main_frame)
             map_frame.pack(fill=tk.BOTH, expand=True)
             
-            # Canvas oluştur
+            # Canvas oluştur; hatlar, aktarmalar, istasyonlar, rota ve etiketler ayrı katmanlardadır
             canvas = Canvas(map_frame, bg="white")
             canvas.pack(fill=tk.BOTH, expand=True)
+            harita = TkHaritasi(canvas, metro, 900, 600, "ray.jpg")
+            harita.rota_goster(son_rota)
             
-            # ray.jpg dosyasını yükle
-            try:
-                img = Image.open("ray.jpg")
-                # Resmi canvas boyutuna uygun şekilde yeniden boyutlandır
-                img = img.resize((900, 600), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                
-                # Resmi canvas'a yerleştir
-                canvas.create_image(0, 0, anchor=tk.NW, image=photo)
-                canvas.image = photo  # Referansı tut
-                
-                # Hat renklerini tanımla
-                hat_renkleri = {
-                    "Kırmızı Hat": "red",
-                    "Mavi Hat": "blue",
-                    "Turuncu Hat": "orange",
-                    "Yeşil Hat": "green",
-                    "Ray Hat": "purple"
-                }
-                
-                # İstasyonları çiz
-                istasyon_boyutu = 10
-                for hat_adi, renk in hat_renkleri.items():
-                    if hat_adi in metro.hatlar:
-                        istasyonlar = metro.hatlar[hat_adi]
-                        
-                        # Önceki istasyonu takip et (hat çizgisi çizmek için)
-                        onceki_istasyon = None
-                        
-                        for istasyon in istasyonlar:
-                            # İstasyon koordinatlarını ölçekle
-                            x = istasyon.x * 9  # Canvas'a uygun ölçekleme
-                            y = istasyon.y * 6  # Canvas'a uygun ölçekleme
-                            
-                            # İstasyonu çiz
-                            canvas.create_oval(x-istasyon_boyutu, y-istasyon_boyutu, 
-                                              x+istasyon_boyutu, y+istasyon_boyutu, 
-                                              fill=renk, outline="black")
-                            
-                            # İstasyon adını yaz
-                            canvas.create_text(x, y+15, text=istasyon.ad, fill="black", 
-                                              font=("Arial", 8, "bold"))
-                            
-                            # Hat çizgisini çiz
-                            if onceki_istasyon:
-                                onceki_x = onceki_istasyon.x * 9
-                                onceki_y = onceki_istasyon.y * 6
-                                canvas.create_line(onceki_x, onceki_y, x, y, 
-                                                 fill=renk, width=3)
-                            
-                            onceki_istasyon = istasyon
-                
-                # Aktarma noktalarını belirt
-                for istasyon_id1, istasyon_id2 in [("K1", "M2"), ("K3", "T2"), 
-                                                  ("M4", "T3"), ("M1", "Y3"),
-                                                  ("K1", "R1")]:
-                    istasyon1 = metro.istasyonlar[istasyon_id1]
-                    istasyon2 = metro.istasyonlar[istasyon_id2]
-                    
-                    x1, y1 = istasyon1.x * 9, istasyon1.y * 6
-                    x2, y2 = istasyon2.x * 9, istasyon2.y * 6
-                    
-                    # Aktarma çizgisini çiz (kesikli çizgi)
-                    canvas.create_line(x1, y1, x2, y2, dash=(4, 2), fill="black", width=1)
-                
-                # Açıklama bölümü
-                legend_frame = Frame(main_frame)
-                legend_frame.pack(fill=tk.X, pady=10)
-                
-                # Hat açıklamaları
-                for i, (hat_adi, renk) in enumerate(hat_renkleri.items()):
-                    legend_label = Label(legend_frame, text=hat_adi, fg=renk, 
-                                        font=("Arial", 10, "bold"))
-                    legend_label.grid(row=0, column=i, padx=10)
-                
-                # Algoritma açıklamaları
-                algo_frame = Frame(main_frame)
-                algo_frame.pack(fill=tk.X, pady=5)
-                
-                bfs_label = Label(algo_frame, 
-                                 text="BFS Algoritması: En az aktarmalı rotayı bulmak için kullanılır.",
-                                 font=("Arial", 10))
-                bfs_label.pack(anchor=tk.W)
-                
-                astar_label = Label(algo_frame, 
-                                   text="A* Algoritması: En hızlı rotayı bulmak için kullanılır. Öklid mesafesi heuristiği kullanır.",
-                                   font=("Arial", 10))
-                astar_label.pack(anchor=tk.W)
-                
-                # Kapatma butonu
-                close_button = Button(main_frame, text="Kapat", command=root.destroy)
-                close_button.pack(pady=10)
-                
-                root.mainloop()
-                
-            except Exception as e:
-                print(f"Resim yüklenirken hata oluştu: {e}")
-                print("ray.jpg dosyası mevcut değil veya okunamıyor.")
-                print("Harita görselleştirme olmadan devam ediliyor...")
-                
-                # Basit bir metin tabanlı harita göster
-                for hat_adi in sorted(metro.hatlar.keys()):
-                    print(f"\n{hat_adi} İstasyonları:")
-                    for istasyon in sorted(metro.hatlar[hat_adi], key=lambda x: x.ad):
-                        print(f"  {istasyon.ad} ({istasyon.idx}): Koordinatlar ({istasyon.x}, {istasyon.y})")
+            # Açıklama bölümü
+            legend_frame = Frame(main_frame)
+            legend_frame.pack(fill=tk.X, pady=10)
+            
+            # Hat açıklamaları
+            for i, (hat_adi, renk) in enumerate(harita.geometri.renkler.items()):
+                legend_label = Label(legend_frame, text=hat_adi, fg=renk, 
+                                    font=("Arial", 10, "bold"))
+                legend_label.grid(row=0, column=i, padx=10)
+            
+            # Algoritma açıklamaları
+            algo_frame = Frame(main_frame)
+            algo_frame.pack(fill=tk.X, pady=5)
+            
+            bfs_label = Label(algo_frame, 
+                             text="BFS Algoritması: En az aktarmalı rotayı bulmak için kullanılır.",
+                             font=("Arial", 10))
+            bfs_label.pack(anchor=tk.W)
+            
+            astar_label = Label(algo_frame, 
+                               text="A* Algoritması: En hızlı rotayı bulmak için kullanılır. Öklid mesafesi heuristiği kullanır.",
+                               font=("Arial", 10))
+            astar_label.pack(anchor=tk.W)
+            
+            if son_rota:
+                rota_label = Label(algo_frame, text="Sarı: son planlanan en hızlı rota. "
+                                   "Tekerlekle yakınlaştırın, sürükleyerek kaydırın.", font=("Arial", 10))
+                rota_label.pack(anchor=tk.W)
+            
+            # Kapatma butonu
+            close_button = Button(main_frame, text="Kapat", command=root.destroy)
+            close_button.pack(pady=10)
+            
+            root.mainloop()
                 
         except Exception as e:
             print(f"Görselleştirme sırasında hata oluştu: {e}")
@@ -393,9 +3117,10 @@ if __name__ == "__main__":
             print("2. Kendi rotanı planla")
             print("3. Tüm istasyonları listele")
             print("4. Metro haritasını göster")
-            print("5. Çıkış")
+            print(f"5. Arama istatistiklerini {'kapat' if metro.izleyici else 'aç'}")
+            print("6. Çıkış")
             
-            secim = input("\nSeçiminiz (1-5): ")
+            secim = input("\nSeçiminiz (1-6): ")
             
             if secim == "1":
                 hazir_senaryolar()
@@ -406,90 +3131,82 @@ if __name__ == "__main__":
             elif secim == "4":
                 metro_haritasi_goster()
             elif secim == "5":
+                arama_istatistiklerini_degistir()
+            elif secim == "6":
                 print("Programdan çıkılıyor...")
                 break
             else:
-                print("Geçersiz seçim! Lütfen 1-5 arasında bir sayı girin.")
+                print("Geçersiz seçim! Lütfen 1-6 arasında bir sayı girin.")
+    
+    def son_istatistigi_yazdir():
+        # İzleme kapalıyken hiçbir şey yazdırmaz
+        if metro.izleyici is None or metro.izleyici.son is None:
+            return
+        ist = metro.izleyici.son
+        print(f"  [{ist.motor}] {ist.sure_ms:.3f} ms, {ist.genisletilen} istasyon genişletildi, "
+              f"{ist.incelenen_kenar} kenar incelendi, kuyruk: {ist.kuyruk_ekleme} ekleme / "
+              f"en fazla {ist.kuyruk_tepe}, {ist.eski_atlanan} eski kayıt atlandı, "
+              f"rota {ist.rota_uzunlugu} istasyon")
+    
+    def rotalari_yazdir(baslangic_id, hedef_id):
+        return cepheyi_yazdir(metro.pareto_rotalar(baslangic_id, hedef_id))
+    
+    def cepheyi_yazdir(cephe):
+        # Her iki yanıt da aynı Pareto cephesinden gelir; rota yoksa False döner
+        if not cephe:
+            return False
+        rota, sure, aktarma = cephe[-1]
+        print(f"En az aktarmalı rota ({aktarma} aktarma):", rota_formatla(rota))
+        for rota, sure, aktarma in cephe[-2:0:-1]:
+            print(f"Ara seçenek ({sure} dakika, {aktarma} aktarma):", rota_formatla(rota))
+        rota, sure, aktarma = cephe[0]
+        print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        son_rota[:] = rota  # Harita açıldığında vurgulanır
+        son_istatistigi_yazdir()
+        return True
+    
+    def arama_istatistiklerini_degistir():
+        if metro.izleyici is None:
+            metro.izlemeyi_etkinlestir()
+            print("Arama istatistikleri açıldı; her rotanın altında arama sayaçları gösterilecek.")
+            return
+        izleyici = metro.izlemeyi_kapat()
+        print("Arama istatistikleri kapatıldı. Toplanan özet:")
+        for tur, ozet in izleyici.istatistikler().items():
+            print(f"  {tur}: {ozet['sorgu']} sorgu, ortalama {ozet['ortalama_sure_ms']:.3f} ms "
+                  f"(p99 <= {ozet['p99_sure_us']} µs), ortalama {ozet['ortalama_genisletilen']:.1f} "
+                  f"istasyon genişletildi, motorlar: {ozet['motorlar']}")
     
     def hazir_senaryolar():
         print("\n=== Hazır Senaryolar ===")
         
         # Senaryo 1: AŞTİ'den OSB'ye
         print("\n1. AŞTİ'den OSB'ye:")
-        rota = metro.en_az_aktarma_bul("M1", "K4")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("M1", "K4")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("M1", "K4")
         
         # Senaryo 2: Batıkent'ten Keçiören'e
         print("\n2. Batıkent'ten Keçiören'e:")
-        rota = metro.en_az_aktarma_bul("T1", "T4")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("T1", "T4")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("T1", "T4")
         
         # Senaryo 3: Keçiören'den AŞTİ'ye
         print("\n3. Keçiören'den AŞTİ'ye:")
-        rota = metro.en_az_aktarma_bul("T4", "M1")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("T4", "M1")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("T4", "M1")
         
         # Senaryo 4: Çayyolu'ndan Sincan'a
         print("\n4. Çayyolu'ndan Sincan'a:")
-        rota = metro.en_az_aktarma_bul("Y1", "K5")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("Y1", "K5")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("Y1", "K5")
         
         # Senaryo 5: Etlik'ten Dikimevi'ne
         print("\n5. Etlik'ten Dikimevi'ne:")
-        rota = metro.en_az_aktarma_bul("T5", "M5")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("T5", "M5")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("T5", "M5")
             
         # Senaryo 6: Ray Hattı - Kuzey'den Güney'e
         print("\n6. Ray Hattı - Kuzey'den Güney'e:")
-        rota = metro.en_az_aktarma_bul("R3", "R5")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("R3", "R5")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("R3", "R5")
             
         # Senaryo 7: Kızılay'dan Ray Doğu'ya
         print("\n7. Kızılay'dan Ray Doğu'ya:")
-        rota = metro.en_az_aktarma_bul("K1", "R2")
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        
-        sonuc = metro.en_hizli_rota_bul("K1", "R2")
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
+        rotalari_yazdir("K1", "R2")
     
     def tum_istasyonlari_listele():
         print("\n=== Tüm İstasyonlar ===")
@@ -504,43 +3221,56 @@ if __name__ == "__main__":
             for istasyon in istasyonlar:
                 print(f"  {istasyon.idx}: {istasyon.ad}")
     
+    def istasyon_sec(mesaj):
+        # Ad, önek ya da istasyon ID'si kabul eder; kompleks adını döndürür
+        sorgu = input(mesaj).strip()
+        if sorgu in metro.istasyonlar:
+            return metro.istasyonlar[sorgu].ad
+        adaylar = metro.istasyon_ara(sorgu, limit=8) if sorgu else []
+        if not adaylar:
+            print("Eşleşen istasyon bulunamadı!")
+            return None
+        if len(adaylar) == 1 or metro.kompleksler().kompleks(sorgu):
+            return adaylar[0][0]
+        for i, (ad, istasyonlar) in enumerate(adaylar, 1):
+            print(f"  {i}. {ad} ({', '.join(ist.hat for ist in istasyonlar)})")
+        secim = input("Seçiminiz: ").strip()
+        if not secim.isdigit() or not 1 <= int(secim) <= len(adaylar):
+            print("Geçersiz seçim!")
+            return None
+        return adaylar[int(secim) - 1][0]
+    
     def kendi_rotani_planla():
         print("\n=== Kendi Rotanı Planla ===")
         
-        # Tüm istasyonları listele
-        tum_istasyonlari_listele()
-        
-        # Başlangıç istasyonu seçimi
-        baslangic_id = input("\nBaşlangıç istasyonu ID'si (örn. K1, M2): ")
-        if baslangic_id not in metro.istasyonlar:
-            print("Geçersiz istasyon ID'si!")
+        # Başlangıç ve hedef, ad ya da adın başı yazılarak seçilir
+        baslangic = istasyon_sec("\nBaşlangıç istasyonu (ad, adın başı ya da ID, örn. Kızılay, gar, K1): ")
+        if baslangic is None:
             return
-        
-        # Hedef istasyonu seçimi
-        hedef_id = input("Hedef istasyon ID'si (örn. K1, M2): ")
-        if hedef_id not in metro.istasyonlar:
-            print("Geçersiz istasyon ID'si!")
+        hedef = istasyon_sec("Hedef istasyon (ad, adın başı ya da ID): ")
+        if hedef is None:
             return
         
-        if baslangic_id == hedef_id:
+        if baslangic == hedef:
             print("Başlangıç ve hedef istasyonları aynı olamaz!")
             return
         
-        # En az aktarmalı rotayı bul
-        print(f"\n{metro.istasyonlar[baslangic_id].ad}'dan {metro.istasyonlar[hedef_id].ad}'a:")
-        rota = metro.en_az_aktarma_bul(baslangic_id, hedef_id)
-        if rota:
-            print("En az aktarmalı rota:", rota_formatla(rota))
-        else:
+        # Her iki kompleksin tüm peronları tek bir Pareto aramasında denenir;
+        # en hızlı ve en az aktarmalı rota kendi uç peronlarıyla aynı cepheden gelir
+        print(f"\n{baslangic}'dan {hedef}'a:")
+        cephe = metro.kompleks_pareto_rotalar(baslangic, hedef)
+        if not cepheyi_yazdir(cephe):
             print("En az aktarmalı rota bulunamadı!")
-        
-        # En hızlı rotayı bul
-        sonuc = metro.en_hizli_rota_bul(baslangic_id, hedef_id)
-        if sonuc:
-            rota, sure = sonuc
-            print(f"En hızlı rota ({sure} dakika):", rota_formatla(rota))
-        else:
             print("En hızlı rota bulunamadı!")
-    
+            return
+
+        # Alternatifler ayrı bir Yen araması gerektirir; yalnızca istenirse hesaplanır
+        if input("Alternatif rotalar gösterilsin mi? (e/h): ").strip().lower() != "e":
+            return
+        en_hizli = cephe[0][0]
+        alternatifler = metro.alternatif_rotalar(en_hizli[0].idx, en_hizli[-1].idx, k=3, zaman_siniri=0.5)
+        for rota, sure, metin in alternatifler[1:]:
+            print(f"Alternatif rota ({sure} dakika):", metin)
+
     # Kullanıcı arayüzünü başlat
     kullanici_arayuzu()
@@ -0,0 +1,415 @@
+"""Metro ağı harita çizimi: katmanlı Tkinter tuvali ve ekransız PNG
+
+Haritanın geometrisi (istasyonların ekran koordinatları, hat ve aktarma
+parçaları, öncelik sıralı etiketler) ağ sürümü ve harita boyutu başına bir
+kez hesaplanır ve iki arka uç tarafından paylaşılır:
+
+- TkHaritasi, Tkinter tuvaline etiketli (tag) katmanlar halinde çizer:
+  arka_plan, hat, aktarma, istasyon, rota ve etiket. Rota vurgusu,
+  yakınlaştırma ve kaydırma yalnızca ilgili katmanları yeniler.
+- png_kaydet, Tkinter olmadan yalnızca PIL ile PNG üretir; ekransız toplu
+  işlerde rota haritaları için kullanılır.
+
+İstasyon adları, çakışanlar atlanarak öncelik sırasıyla (aktarma
+merkezleri önce) yerleştirilir; ölçek küçüldükçe daha az etiket görünür.
+Yeniden boyutlandırılmış arka plan resmi (ray.jpg) dosya yolu, değişiklik
+zamanı ve boyuta göre bellekte önbelleklenir.
+
+Kullanım:
+    python metro_harita.py --rota Batıkent Keçiören --cikti rota.png
+    python metro_harita.py --yapay izgara 5000 --rota Yatay1-1 Dikey5-30 --arka-plan "" --cikti rota.png
+"""
+import argparse
+import os
+import sys
+import weakref
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from ErtugrulSaritekin_MetroSimulation import PIL_AVAILABLE, TKINTER_AVAILABLE, Istasyon, MetroAgi
+from metro_performans import ag_kaynagi_ekle, ag_yukle
+
+if PIL_AVAILABLE:
+    from PIL import Image, ImageDraw, ImageFont
+if TKINTER_AVAILABLE:
+    import tkinter as tk
+    from PIL import ImageTk
+
+HAT_RENKLERI = {
+    "Kırmızı Hat": "red",
+    "Mavi Hat": "blue",
+    "Turuncu Hat": "orange",
+    "Yeşil Hat": "green",
+    "Ray Hat": "purple",
+}
+# Tanımlı rengi olmayan hatlar sırayla bu renkleri alır (Tk ve PIL'in ortak renk adları)
+EK_RENKLER = ("teal", "brown", "magenta", "navy", "olive", "darkcyan",
+              "crimson", "darkgreen", "chocolate", "slateblue")
+ROTA_RENGI = "gold"
+KAPALI_RENGI = "gray"
+
+# Etiketler istasyonun altına yazılır; çakışma denetimi için yaklaşık yazı ölçüleri (piksel)
+ETIKET_KAYMASI = 15
+KARAKTER_GENISLIGI = 7.5
+ETIKET_YUKSEKLIGI = 14
+
+_ARKA_PLAN_ONBELLEGI: Dict[Tuple[str, float, Optional[Tuple[int, int]]], "Image.Image"] = {}
+_GEOMETRI_ONBELLEGI: "weakref.WeakKeyDictionary[MetroAgi, Dict]" = weakref.WeakKeyDictionary()
+
+
+def arka_plan_resmi(yol: str, boyut: Optional[Tuple[int, int]] = None) -> Optional["Image.Image"]:
+    """Resmi boyut'a LANCZOS ile ölçeklenmiş olarak döndürür (boyut None ise özgün boyutta)
+
+    Sonuç yol, dosyanın değişiklik zamanı ve boyuta göre önbelleklenir;
+    harita her açıldığında resim yeniden okunup ölçeklenmez. Dosya yoksa
+    None döner. Dönen resim paylaşılır, üzerine çizilecekse kopyalanmalıdır.
+    """
+    try:
+        anahtar = (os.path.abspath(yol), os.path.getmtime(yol), boyut)
+    except OSError:
+        return None
+    resim = _ARKA_PLAN_ONBELLEGI.get(anahtar)
+    if resim is None:
+        ozgun = _ARKA_PLAN_ONBELLEGI.get(anahtar[:2] + (None,))
+        if ozgun is None:
+            with Image.open(yol) as dosya:
+                ozgun = dosya.convert("RGB")
+            _ARKA_PLAN_ONBELLEGI[anahtar[:2] + (None,)] = ozgun
+        resim = ozgun if boyut is None else ozgun.resize(boyut, Image.LANCZOS)
+        if len(_ARKA_PLAN_ONBELLEGI) >= 8:
+            _ARKA_PLAN_ONBELLEGI.pop(next(iter(_ARKA_PLAN_ONBELLEGI)))
+        _ARKA_PLAN_ONBELLEGI[anahtar] = resim
+    return resim
+
+
+class HaritaGeometrisi:
+    """Ağın harita koordinatlarına izdüşümü ve arka uçlardan bağımsız çizim parçaları
+
+    Tüm koordinatları 0–100 aralığında olan ağlar (örnek ağ) ray.jpg ile
+    hizalı kalsın diye yüzde olarak ölçeklenir; diğerleri en-boy oranı
+    korunarak kenar boşluklu harita alanına sığdırılır.
+    """
+
+    def __init__(self, metro: MetroAgi, genislik: int, yukseklik: int, kenar_boslugu: int = 30):
+        self.genislik = genislik
+        self.yukseklik = yukseklik
+        istasyonlar = list(metro.istasyonlar.values())
+        xler = [ist.x for ist in istasyonlar] or [0.0]
+        yler = [ist.y for ist in istasyonlar] or [0.0]
+        if min(xler) >= 0 and min(yler) >= 0 and max(xler) <= 100 and max(yler) <= 100:
+            sx, sy, ox, oy = genislik / 100, yukseklik / 100, 0.0, 0.0
+        else:
+            olcek = min((genislik - 2 * kenar_boslugu) / max(max(xler) - min(xler), 1e-9),
+                        (yukseklik - 2 * kenar_boslugu) / max(max(yler) - min(yler), 1e-9))
+            sx = sy = olcek
+            ox = kenar_boslugu - min(xler) * olcek
+            oy = kenar_boslugu - min(yler) * olcek
+        self.konum: Dict[str, Tuple[float, float]] = {ist.idx: (ist.x * sx + ox, ist.y * sy + oy)
+                                                      for ist in istasyonlar}
+        # Az istasyonda özgün 10 piksellik daireler; kalabalık ağlarda küçülür
+        self.yaricap = max(2.0, min(10.0, 10.0 * (100 / max(len(istasyonlar), 1)) ** 0.5))
+
+        renkler = iter(EK_RENKLER * (len(metro.hatlar) // len(EK_RENKLER) + 1))
+        self.renkler = {hat: HAT_RENKLERI.get(hat) or next(renkler) for hat in metro.hatlar}
+        self.hat_parcalari: Dict[str, List[Tuple[float, float, float, float]]] = defaultdict(list)
+        self.aktarma_parcalari: List[Tuple[float, float, float, float]] = []
+        for ist in istasyonlar:
+            for komsu, _ in ist.komsular:
+                if ist.idx >= komsu.idx:
+                    continue
+                parca = self.konum[ist.idx] + self.konum[komsu.idx]
+                if komsu.hat == ist.hat:
+                    self.hat_parcalari[ist.hat].append(parca)
+                elif parca[:2] != parca[2:]:
+                    self.aktarma_parcalari.append(parca)
+        self.istasyonlar = [(ist.idx,) + self.konum[ist.idx]
+                            + (KAPALI_RENGI if ist.idx in metro.kapali_istasyonlar else self.renkler[ist.hat],)
+                            for ist in istasyonlar]
+
+        # Etiket önceliği: aktarma merkezleri, sonra bağlantı sayısı; aynı yerdeki aynı adlar tek etiket
+        adet = defaultdict(int)
+        for ist in istasyonlar:
+            adet[ist.ad] += 1
+        sirali = sorted(istasyonlar, key=lambda ist: (-adet[ist.ad], -len(ist.komsular), ist.idx))
+        self.etiketler: List[Tuple[float, float, str]] = []
+        gorulen = set()
+        for ist in sirali:
+            x, y = self.konum[ist.idx]
+            anahtar = (ist.ad, round(x), round(y))
+            if anahtar not in gorulen:
+                gorulen.add(anahtar)
+                self.etiketler.append((x, y, ist.ad))
+
+    def gorunur_etiketler(self, olcek: float = 1.0, dx: float = 0.0, dy: float = 0.0,
+                          en_fazla: int = 400) -> List[Tuple[float, float, str]]:
+        """Verilen yakınlaştırmada görünen ve birbiriyle çakışmayan etiketler (ekran x, y, ad)
+
+        Etiketler öncelik sırasıyla denenir; yerleştirilmiş bir etiketle
+        kutusu çakışan ya da harita alanı dışında kalan atlanır. Kutular
+        kovalı bir ızgarada tutulduğundan her deneme yalnızca komşu kovalara bakar.
+        """
+        kova = 100.0
+        kovalar: Dict[Tuple[int, int], List[Tuple[float, float, float, float]]] = defaultdict(list)
+        sonuc = []
+        for x, y, ad in self.etiketler:
+            sx, sy = x * olcek + dx, y * olcek + dy + ETIKET_KAYMASI
+            yg, yy = len(ad) * KARAKTER_GENISLIGI / 2 + 3, ETIKET_YUKSEKLIGI / 2 + 1
+            if not (-yg <= sx <= self.genislik + yg and -yy <= sy <= self.yukseklik + yy):
+                continue
+            kutu = (sx - yg, sy - yy, sx + yg, sy + yy)
+            hucreler = [(cx, cy) for cx in range(int(kutu[0] // kova), int(kutu[2] // kova) + 1)
+                        for cy in range(int(kutu[1] // kova), int(kutu[3] // kova) + 1)]
+            if any(kutu[0] < diger[2] and diger[0] < kutu[2] and kutu[1] < diger[3] and diger[1] < kutu[3]
+                   for hucre in hucreler for diger in kovalar.get(hucre, ())):
+                continue
+            for hucre in hucreler:
+                kovalar[hucre].append(kutu)
+            sonuc.append((sx, sy, ad))
+            if len(sonuc) >= en_fazla:
+                break
+        return sonuc
+
+
+def harita_geometrisi(metro: MetroAgi, genislik: int, yukseklik: int) -> HaritaGeometrisi:
+    """Ağın geometrisini döndürür; ağ değişmedikçe (metro.surum) yeniden hesaplanmaz"""
+    onbellek = _GEOMETRI_ONBELLEGI.setdefault(metro, {})
+    anahtar = (metro.surum, len(metro.istasyonlar), genislik, yukseklik)
+    if anahtar not in onbellek:
+        onbellek.clear()
+        onbellek[anahtar] = HaritaGeometrisi(metro, genislik, yukseklik)
+    return onbellek[anahtar]
+
+
+class TkHaritasi:
+    """Metro haritasını bir Tkinter tuvaline etiketli katmanlar halinde çizer
+
+    Katmanlar alttan üste arka_plan, hat, aktarma, istasyon, rota ve
+    etiket etiketlerini (tag) taşır. rota_goster yalnızca rota katmanını,
+    yakınlaştırma (fare tekerleği) ve kaydırma (sürükleme) öğeleri yerinde
+    ölçekleyip yalnızca arka planı ve etiketleri yeniden çizer.
+    """
+
+    def __init__(self, canvas: "tk.Canvas", metro: MetroAgi, genislik: int = 900, yukseklik: int = 600,
+                 arka_plan: Optional[str] = "ray.jpg"):
+        self.canvas = canvas
+        self.metro = metro
+        self.geometri = harita_geometrisi(metro, genislik, yukseklik)
+        self.arka_plan = arka_plan
+        self.olcek = 1.0
+        self.dx = self.dy = 0.0
+        self.rota: List[Istasyon] = []
+        self._foto = None  # PhotoImage referansı tutulmazsa Tk resmi siler
+        self._surukleme = None
+        self.ciz()
+        canvas.bind("<MouseWheel>", lambda olay: self.yakinlastir(1.25 if olay.delta > 0 else 0.8, olay.x, olay.y))
+        canvas.bind("<Button-4>", lambda olay: self.yakinlastir(1.25, olay.x, olay.y))
+        canvas.bind("<Button-5>", lambda olay: self.yakinlastir(0.8, olay.x, olay.y))
+        canvas.bind("<ButtonPress-1>", self._surukleme_basladi)
+        canvas.bind("<B1-Motion>", self._suruklendi)
+
+    def _ekran(self, idx: str) -> Tuple[float, float]:
+        x, y = self.geometri.konum[idx]
+        return x * self.olcek + self.dx, y * self.olcek + self.dy
+
+    def ciz(self) -> None:
+        """Tüm katmanları baştan çizer"""
+        c = self.canvas
+        c.delete("all")
+        g = self.geometri
+        self._arka_plani_ciz()
+        for hat, parcalar in g.hat_parcalari.items():
+            for parca in parcalar:
+                c.create_line(*parca, fill=g.renkler[hat], width=3, tags=("hat",))
+        for parca in g.aktarma_parcalari:
+            c.create_line(*parca, dash=(4, 2), fill="black", width=1, tags=("aktarma",))
+        r = g.yaricap
+        for idx, x, y, renk in g.istasyonlar:
+            c.create_oval(x - r, y - r, x + r, y + r, fill=renk, outline="black", tags=("istasyon", idx))
+        if self.olcek != 1.0 or self.dx or self.dy:
+            c.scale("hat || aktarma || istasyon", 0, 0, self.olcek, self.olcek)
+            c.move("hat || aktarma || istasyon", self.dx, self.dy)
+        self._rotayi_ciz()
+        self._etiketleri_ciz()
+
+    def rota_goster(self, rota: Optional[List[Istasyon]]) -> None:
+        """Rotayı vurgular (None ya da boş liste vurguyu kaldırır); diğer katmanlara dokunmaz"""
+        self.rota = list(rota or [])
+        self._rotayi_ciz()
+
+    def yakinlastir(self, carpan: float, x: float, y: float) -> None:
+        """(x, y) ekran noktası sabit kalacak şekilde carpan kadar yakınlaştırır"""
+        yeni_olcek = min(max(self.olcek * carpan, 0.25), 40.0)
+        carpan = yeni_olcek / self.olcek
+        self.canvas.scale("hat || aktarma || istasyon || rota", x, y, carpan, carpan)
+        self.olcek = yeni_olcek
+        self.dx = x + carpan * (self.dx - x)
+        self.dy = y + carpan * (self.dy - y)
+        self._arka_plani_ciz()
+        self._etiketleri_ciz()
+
+    def kaydir(self, dx: float, dy: float) -> None:
+        self.canvas.move("hat || aktarma || istasyon || rota", dx, dy)
+        self.dx += dx
+        self.dy += dy
+        self._arka_plani_ciz()
+        self._etiketleri_ciz()
+
+    def _surukleme_basladi(self, olay) -> None:
+        self._surukleme = (olay.x, olay.y)
+
+    def _suruklendi(self, olay) -> None:
+        if self._surukleme is not None:
+            self.kaydir(olay.x - self._surukleme[0], olay.y - self._surukleme[1])
+            self._surukleme = (olay.x, olay.y)
+
+    def _arka_plani_ciz(self) -> None:
+        c = self.canvas
+        c.delete("arka_plan")
+        if not self.arka_plan:
+            return
+        g = self.geometri
+        if self.olcek == 1.0 and not self.dx and not self.dy:
+            resim, konum = arka_plan_resmi(self.arka_plan, (g.genislik, g.yukseklik)), (0, 0)
+        else:
+            # Görünen bölge özgün çözünürlükteki resimden kesilip ölçeklenir; yakınlaştırınca bulanıklaşmaz
+            resim = arka_plan_resmi(self.arka_plan)
+            if resim is None:
+                return
+            sol = max(-self.dx / self.olcek, 0.0)
+            ust = max(-self.dy / self.olcek, 0.0)
+            sag = min((g.genislik - self.dx) / self.olcek, g.genislik)
+            alt = min((g.yukseklik - self.dy) / self.olcek, g.yukseklik)
+            boyut = (round((sag - sol) * self.olcek), round((alt - ust) * self.olcek))
+            if boyut[0] < 1 or boyut[1] < 1:
+                return
+            ox, oy = resim.width / g.genislik, resim.height / g.yukseklik
+            resim = resim.resize(boyut, Image.BILINEAR, box=(sol * ox, ust * oy, sag * ox, alt * oy))
+            konum = (sol * self.olcek + self.dx, ust * self.olcek + self.dy)
+        if resim is None:
+            return
+        self._foto = ImageTk.PhotoImage(resim)
+        c.create_image(*konum, anchor=tk.NW, image=self._foto, tags=("arka_plan",))
+        c.tag_lower("arka_plan")
+
+    def _rotayi_ciz(self) -> None:
+        c = self.canvas
+        c.delete("rota")
+        if not self.rota:
+            return
+        noktalar = [v for ist in self.rota for v in self._ekran(ist.idx)]
+        if len(self.rota) > 1:
+            c.create_line(*noktalar, fill=ROTA_RENGI, width=7, capstyle=tk.ROUND, joinstyle=tk.ROUND,
+                          tags=("rota",))
+        r = self.geometri.yaricap * self.olcek + 3
+        for ist in (self.rota[0], self.rota[-1]):
+            x, y = self._ekran(ist.idx)
+            c.create_oval(x - r, y - r, x + r, y + r, outline=ROTA_RENGI, width=3, tags=("rota",))
+        if c.find_withtag("istasyon"):
+            c.tag_raise("rota", "istasyon")
+        c.tag_raise("etiket")
+
+    def _etiketleri_ciz(self) -> None:
+        c = self.canvas
+        c.delete("etiket")
+        for x, y, ad in self.geometri.gorunur_etiketler(self.olcek, self.dx, self.dy):
+            c.create_text(x, y, text=ad, fill="black", font=("Arial", 8, "bold"), tags=("etiket",))
+
+
+def _yazi_tipi(boyut: int = 10):
+    """Türkçe karakterleri çizebilen bir yazı tipi; bulunamazsa PIL'in varsayılanı"""
+    for ad in ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "arialbd.ttf"):
+        try:
+            return ImageFont.truetype(ad, boyut)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size=boyut)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def _kesikli_cizgi(ciz: "ImageDraw.ImageDraw", x1: float, y1: float, x2: float, y2: float,
+                   desen: Tuple[int, int] = (4, 2), **secenekler) -> None:
+    uzunluk = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    if uzunluk == 0:
+        return
+    ux, uy = (x2 - x1) / uzunluk, (y2 - y1) / uzunluk
+    konum = 0.0
+    while konum < uzunluk:
+        son = min(konum + desen[0], uzunluk)
+        ciz.line((x1 + ux * konum, y1 + uy * konum, x1 + ux * son, y1 + uy * son), **secenekler)
+        konum = son + desen[1]
+
+
+def png_ciz(metro: MetroAgi, rota: Optional[List[Istasyon]] = None, genislik: int = 900,
+            yukseklik: int = 600, arka_plan: Optional[str] = "ray.jpg",
+            etiketler: bool = True) -> "Image.Image":
+    """Haritayı Tkinter olmadan bir PIL resmine çizer; rota verilirse vurgulanır"""
+    if not PIL_AVAILABLE:
+        raise RuntimeError("PNG harita için PIL kütüphanesi gerekli.")
+    g = harita_geometrisi(metro, genislik, yukseklik)
+    resim = arka_plan_resmi(arka_plan, (genislik, yukseklik)) if arka_plan else None
+    resim = resim.copy() if resim is not None else Image.new("RGB", (genislik, yukseklik), "white")
+    ciz = ImageDraw.Draw(resim)
+    for hat, parcalar in g.hat_parcalari.items():
+        for parca in parcalar:
+            ciz.line(parca, fill=g.renkler[hat], width=3)
+    for parca in g.aktarma_parcalari:
+        _kesikli_cizgi(ciz, *parca, fill="black", width=1)
+    r = g.yaricap
+    for _, x, y, renk in g.istasyonlar:
+        ciz.ellipse((x - r, y - r, x + r, y + r), fill=renk, outline="black")
+    if rota:
+        noktalar = [g.konum[ist.idx] for ist in rota]
+        if len(noktalar) > 1:
+            ciz.line(noktalar, fill=ROTA_RENGI, width=7, joint="curve")
+        for x, y in (noktalar[0], noktalar[-1]):
+            ciz.ellipse((x - r - 3, y - r - 3, x + r + 3, y + r + 3), outline=ROTA_RENGI, width=3)
+    if etiketler:
+        yazi_tipi = _yazi_tipi()
+        for x, y, ad in g.gorunur_etiketler():
+            sol, ust, sag, alt = ciz.textbbox((0, 0), ad, font=yazi_tipi)
+            ciz.text((x - (sol + sag) / 2, y - (ust + alt) / 2), ad, fill="black", font=yazi_tipi)
+    return resim
+
+
+def png_kaydet(metro: MetroAgi, yol: str, rota: Optional[List[Istasyon]] = None, **secenekler) -> None:
+    """Haritayı (ve varsa rotayı) PNG dosyasına yazar; seçenekler png_ciz'e gider"""
+    png_ciz(metro, rota, **secenekler).save(yol, "PNG")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Metro haritasını (ve rotayı) PNG olarak çizer")
+    ag_kaynagi_ekle(parser)
+    parser.add_argument("--rota", nargs=2, metavar=("BASLANGIC", "HEDEF"),
+                        help="Vurgulanacak en hızlı rotanın uçları (istasyon ID'si ya da adı)")
+    parser.add_argument("--boyut", nargs=2, type=int, default=[900, 600], metavar=("GENISLIK", "YUKSEKLIK"))
+    parser.add_argument("--arka-plan", default="ray.jpg", help="Arka plan resmi (boş verilirse beyaz)")
+    parser.add_argument("--etiketsiz", action="store_true", help="İstasyon adlarını yazma")
+    parser.add_argument("--cikti", default="metro_haritasi.png", help="PNG dosyası")
+    args = parser.parse_args(argv)
+    if not PIL_AVAILABLE:
+        print("PNG harita için PIL kütüphanesi gerekli.", file=sys.stderr)
+        return 1
+
+    metro = ag_yukle(args)
+    rota = None
+    if args.rota:
+        baslangic, hedef = args.rota
+        if baslangic in metro.istasyonlar and hedef in metro.istasyonlar:
+            sonuc = metro.en_hizli_rota_bul(baslangic, hedef)
+        else:
+            sonuc = metro.kompleks_rotasi(baslangic, hedef)
+        if sonuc is None:
+            print(f"{baslangic} ile {hedef} arasında rota bulunamadı.", file=sys.stderr)
+            return 1
+        rota = sonuc[0]
+        print(f"En hızlı rota ({sonuc[1]} dakika): {' -> '.join(ist.ad for ist in rota)}")
+    png_kaydet(metro, args.cikti, rota, genislik=args.boyut[0], yukseklik=args.boyut[1],
+               arka_plan=args.arka_plan or None, etiketler=not args.etiketsiz)
+    print(f"Harita kaydedildi: {args.cikti}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""Metro ağı performans ölçüm paketi
+
+Yapay çok hatlı metro ağları (ışınsal, ızgara, rastgele düzlemsel) üretir ve
+rota aramalarının gecikme yüzdeliklerini, genişletilen istasyon sayılarını,
+tepe bellek kullanımını ve kurulum/derleme/yükleme sürelerini ölçer. Sonuçlar
+sürümler arasında karşılaştırılabilmesi için JSON olarak yazılır.
+
+Kullanım:
+    python metro_performans.py --duzen izgara isinsal --boyut 100 1000 10000 --cikti sonuc.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from ErtugrulSaritekin_MetroSimulation import AramaIstatistigi, DerlenmisAg, MetroAgi, YerIsaretleri, ornek_metro_agi
+
+# Sonuç JSON'unun biçim sürümü; alanlar değiştiğinde artırılır
+SONUC_SURUMU = 3
+
+# Ardışık istasyonlar arası ortalama mesafe (koordinat birimi) ve birim başına süre (dakika)
+ISTASYON_ARALIGI = 10.0
+DAKIKA_BIRIM = 0.2
+
+# Ölçülen arama motorları: (derlenmiş ağ, başlangıç, hedef, istatistik) -> sonuç
+MOTORLAR: Dict[str, Callable[[DerlenmisAg, int, int, AramaIstatistigi], object]] = {
+    "bfs": lambda ag, s, t, ist: ag.bfs(s, t, ist),
+    "cift_yonlu_bfs": lambda ag, s, t, ist: ag.cift_yonlu_bfs(s, t, ist),
+    "en_az_aktarma_dijkstra": lambda ag, s, t, ist: ag.en_az_aktarma_dijkstra(s, t, ist),
+    "a_yildiz": lambda ag, s, t, ist: ag.a_yildiz(s, t, ist),
+}
+
+# ALT ölçümünde kullanılan yer işareti sayısı
+YER_ISARETI_SAYISI = 8
+
+
+def _hat_ekle(metro: MetroAgi, hat_adi: str, noktalar: List[Tuple[float, float]]) -> None:
+    """Nokta dizisi boyunca istasyonları ekler ve ardışık olanları bağlar"""
+    onceki = None
+    for x, y in noktalar:
+        idx = f"{hat_adi}-{len(metro.hatlar[hat_adi]) + 1}"
+        metro.istasyon_ekle(idx, idx, hat_adi, x, y)
+        if onceki is not None:
+            mesafe = math.hypot(x - onceki[1], y - onceki[2])
+            metro.baglanti_ekle(onceki[0], idx, max(1, round(mesafe * DAKIKA_BIRIM)))
+        onceki = (idx, x, y)
+
+
+def _aktarmalari_ekle(metro: MetroAgi, yaricap: float, rng: random.Random) -> None:
+    """Farklı hatlarda olup yaricap içinde kalan istasyonları aktarma ile bağlar
+
+    Aktarma süreleri, örnek ağdaki aktarma bağlantıları gibi 2-3 dakikadır.
+    """
+    hucreler: Dict[Tuple[int, int], List] = defaultdict(list)
+    for istasyon in metro.istasyonlar.values():
+        hucreler[(int(istasyon.x // yaricap), int(istasyon.y // yaricap))].append(istasyon)
+    for (hx, hy), hucre in hucreler.items():
+        for istasyon in hucre:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for diger in hucreler.get((hx + dx, hy + dy), ()):
+                        if (diger.hat != istasyon.hat and istasyon.idx < diger.idx
+                                and math.hypot(istasyon.x - diger.x, istasyon.y - diger.y) <= yaricap):
+                            metro.baglanti_ekle(istasyon.idx, diger.idx, rng.choice((2, 3)))
+
+
+def isinsal_ag(istasyon_sayisi: int, rng: random.Random) -> MetroAgi:
+    """Merkezden geçen çap hatları ve bunları kesen çember hatlarından oluşan ağ"""
+    metro = MetroAgi()
+    hat_sayisi = max(2, min(16, round(istasyon_sayisi ** (1 / 3))))
+    cap_istasyon = max(3, int(0.7 * istasyon_sayisi / hat_sayisi)) | 1  # Tek sayı: merkez istasyonu olsun
+    yaricap = (cap_istasyon // 2) * ISTASYON_ARALIGI
+    for h in range(hat_sayisi):
+        aci = math.pi * h / hat_sayisi
+        noktalar = [((j - cap_istasyon // 2) * ISTASYON_ARALIGI * math.cos(aci),
+                     (j - cap_istasyon // 2) * ISTASYON_ARALIGI * math.sin(aci))
+                    for j in range(cap_istasyon)]
+        _hat_ekle(metro, f"Cap{h + 1}", noktalar)
+
+    # Çemberler çap hatlarının istasyonlarından geçer; kesişimler aktarma olur
+    cember_sayisi = max(1, hat_sayisi // 2)
+    kalan = max(0, istasyon_sayisi - len(metro.istasyonlar))
+    ara = max(1, kalan // (cember_sayisi * 2 * hat_sayisi))
+    for c in range(cember_sayisi):
+        r = yaricap * (c + 1) / (cember_sayisi + 1)
+        r = round(r / ISTASYON_ARALIGI) * ISTASYON_ARALIGI or ISTASYON_ARALIGI
+        adim = 2 * hat_sayisi * ara
+        noktalar = [(r * math.cos(2 * math.pi * i / adim), r * math.sin(2 * math.pi * i / adim))
+                    for i in range(adim)]
+        _hat_ekle(metro, f"Cember{c + 1}", noktalar)
+        # Çemberi kapat
+        hat = metro.hatlar[f"Cember{c + 1}"]
+        ilk, son = hat[0], hat[-1]
+        metro.baglanti_ekle(son.idx, ilk.idx, max(1, round(math.hypot(ilk.x - son.x, ilk.y - son.y) * DAKIKA_BIRIM)))
+    _aktarmalari_ekle(metro, ISTASYON_ARALIGI * 0.05, rng)
+    return metro
+
+
+def izgara_ag(istasyon_sayisi: int, rng: random.Random) -> MetroAgi:
+    """Birbirini dik kesen yatay ve dikey hatlardan oluşan ağ"""
+    metro = MetroAgi()
+    hat_sayisi = max(2, int(math.sqrt(istasyon_sayisi) / 3))  # Her yönde
+    hat_istasyon = max(2, istasyon_sayisi // (2 * hat_sayisi))
+    # Kesişimlerin istasyonlara denk gelmesi için (hat_istasyon - 1), (hat_sayisi - 1)'in katı olmalı
+    hat_istasyon = (hat_sayisi - 1) * max(1, round((hat_istasyon - 1) / (hat_sayisi - 1))) + 1
+    genislik = (hat_istasyon - 1) * ISTASYON_ARALIGI
+    hat_araligi = genislik / (hat_sayisi - 1)
+    for h in range(hat_sayisi):
+        sabit = h * hat_araligi
+        _hat_ekle(metro, f"Yatay{h + 1}", [(j * ISTASYON_ARALIGI, sabit) for j in range(hat_istasyon)])
+        _hat_ekle(metro, f"Dikey{h + 1}", [(sabit, j * ISTASYON_ARALIGI) for j in range(hat_istasyon)])
+    _aktarmalari_ekle(metro, ISTASYON_ARALIGI * 0.05, rng)
+    return metro
+
+
+def rastgele_duzlemsel_ag(istasyon_sayisi: int, rng: random.Random) -> MetroAgi:
+    """Rastgele yönlerde kıvrılan hatlardan ve yakın istasyon aktarmalarından oluşan ağ"""
+    metro = MetroAgi()
+    hat_sayisi = max(2, round(math.sqrt(istasyon_sayisi) / 2))
+    hat_istasyon = max(2, istasyon_sayisi // hat_sayisi)
+    genislik = math.sqrt(istasyon_sayisi) * ISTASYON_ARALIGI
+    for h in range(hat_sayisi):
+        x, y = rng.uniform(0, genislik), rng.uniform(0, genislik)
+        yon = rng.uniform(0, 2 * math.pi)
+        noktalar = []
+        for _ in range(hat_istasyon):
+            noktalar.append((x, y))
+            yon += rng.uniform(-0.3, 0.3)
+            adim = ISTASYON_ARALIGI * rng.uniform(0.7, 1.3)
+            x, y = x + adim * math.cos(yon), y + adim * math.sin(yon)
+            # Alanın dışına çıkan hat geri döner
+            if not 0 <= x <= genislik:
+                yon = math.pi - yon
+                x = min(max(x, 0), genislik)
+            if not 0 <= y <= genislik:
+                yon = -yon
+                y = min(max(y, 0), genislik)
+        _hat_ekle(metro, f"Hat{h + 1}", noktalar)
+    _aktarmalari_ekle(metro, ISTASYON_ARALIGI * 0.4, rng)
+    return metro
+
+
+DUZENLER: Dict[str, Callable[[int, random.Random], MetroAgi]] = {
+    "isinsal": isinsal_ag,
+    "izgara": izgara_ag,
+    "rastgele": rastgele_duzlemsel_ag,
+}
+
+
+def ag_uret(duzen: str, istasyon_sayisi: int, tohum: int = 0) -> MetroAgi:
+    """Verilen düzende yaklaşık istasyon_sayisi istasyonlu bir ağ üretir"""
+    return DUZENLER[duzen](istasyon_sayisi, random.Random(tohum))
+
+
+def ag_kaynagi_ekle(parser: argparse.ArgumentParser) -> None:
+    """Komut satırı araçlarının ortak ağ kaynağı seçeneklerini ekler (en fazla biri verilir)"""
+    kaynak = parser.add_mutually_exclusive_group()
+    kaynak.add_argument("--json", help="MetroAgi.from_json ile yüklenecek ağ dosyası")
+    kaynak.add_argument("--csv", nargs=2, metavar=("ISTASYONLAR", "BAGLANTILAR"),
+                        help="MetroAgi.from_csv ile yüklenecek CSV dosyaları")
+    kaynak.add_argument("--anlik-goruntu", help="MetroAgi.anlik_goruntu_yukle ile yüklenecek dosya")
+    kaynak.add_argument("--yapay", nargs=2, metavar=("DUZEN", "BOYUT"),
+                        help="ag_uret ile üretilecek yapay ağ (ör. izgara 10000)")
+
+
+def ag_yukle(args: argparse.Namespace) -> MetroAgi:
+    """ag_kaynagi_ekle seçeneklerine göre ağı yükler; seçenek yoksa örnek Ankara ağı"""
+    if args.json:
+        return MetroAgi.from_json(args.json)
+    if args.csv:
+        return MetroAgi.from_csv(*args.csv)
+    if args.anlik_goruntu:
+        return MetroAgi.anlik_goruntu_yukle(args.anlik_goruntu)
+    if args.yapay:
+        duzen, boyut = args.yapay
+        return ag_uret(duzen, int(boyut))
+    return ornek_metro_agi()
+
+
+def _yuzdelik(degerler: List[float], oran: float) -> float:
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik"""
+    if not degerler:
+        return 0.0
+    return degerler[min(len(degerler) - 1, max(0, math.ceil(oran * len(degerler)) - 1))]
+
+
+def motoru_olc(ag: DerlenmisAg, motor: Callable, ciftler: List[Tuple[int, int]]) -> Dict[str, float]:
+    """Bir arama motorunun gecikme, genişletme ve bellek değerlerini ölçer"""
+    gecikmeler = []
+    genisletilenler = []
+    istatistik = AramaIstatistigi()
+    for s, t in ciftler:
+        bas = time.perf_counter()
+        motor(ag, s, t, istatistik)
+        gecikmeler.append((time.perf_counter() - bas) * 1000)
+        genisletilenler.append(istatistik.genisletilen)
+    gecikmeler.sort()
+    genisletilenler.sort()
+
+    # Bellek ölçümü aramaları yavaşlattığından gecikmelerden ayrı, küçük bir örnekle yapılır
+    tracemalloc.start()
+    for s, t in ciftler[:20]:
+        motor(ag, s, t, istatistik)
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": _yuzdelik(gecikmeler, 0.50),
+        "p90_ms": _yuzdelik(gecikmeler, 0.90),
+        "p99_ms": _yuzdelik(gecikmeler, 0.99),
+        "ortalama_ms": sum(gecikmeler) / len(gecikmeler),
+        "genisletilen_ortalama": sum(genisletilenler) / len(genisletilenler),
+        "genisletilen_p50": _yuzdelik(genisletilenler, 0.50),
+        "genisletilen_p99": _yuzdelik(genisletilenler, 0.99),
+        "tepe_bellek_kb": tepe / 1024,
+    }
+
+
+def olc(duzen: str, istasyon_sayisi: int, sorgu_sayisi: int = 200, tohum: int = 0) -> Dict[str, object]:
+    """Bir ağ üretip kurulum, yükleme ve sorgu ölçümlerini döndürür"""
+    bas = time.perf_counter()
+    metro = ag_uret(duzen, istasyon_sayisi, tohum)
+    kurulum_sn = time.perf_counter() - bas
+
+    bas = time.perf_counter()
+    ag = metro.derlenmis_ag()
+    derleme_sn = time.perf_counter() - bas
+
+    with tempfile.TemporaryDirectory() as dizin:
+        yol = os.path.join(dizin, "ag.snp")
+        bas = time.perf_counter()
+        metro.anlik_goruntu_kaydet(yol)
+        kaydet_sn = time.perf_counter() - bas
+        bas = time.perf_counter()
+        MetroAgi.anlik_goruntu_yukle(yol)
+        yukle_sn = time.perf_counter() - bas
+        # Yüklenmiş ağın bellek kullanımı (istasyon nesneleri + diziler)
+        tracemalloc.start()
+        yuklenen = MetroAgi.anlik_goruntu_yukle(yol)
+        _, ag_bellek = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del yuklenen
+
+    rng = random.Random(tohum + 1)
+    n = len(ag)
+    ciftler = [(rng.randrange(n), rng.randrange(n)) for _ in range(sorgu_sayisi)]
+    motorlar = {ad: motoru_olc(ag, motor, ciftler) for ad, motor in MOTORLAR.items()}
+
+    # ALT: yer işareti hazırlığı ayrıca ölçülür, genişletme Öklid sezgiselli A* ile karşılaştırılır
+    bas = time.perf_counter()
+    yer_isaretleri = YerIsaretleri.olustur(ag, YER_ISARETI_SAYISI)
+    alt_hazirlama_sn = time.perf_counter() - bas
+    motorlar["alt"] = motoru_olc(ag, lambda ag, s, t, ist: ag.alt_a_yildiz(s, t, yer_isaretleri, ist), ciftler)
+    oklid = motorlar["a_yildiz"]["genisletilen_ortalama"]
+    return {
+        "duzen": duzen,
+        "istenen_istasyon": istasyon_sayisi,
+        "istasyon_sayisi": n,
+        "hat_sayisi": len(ag.hat_adlari),
+        "kenar_sayisi": len(ag.hedefler),
+        "kurulum_sn": kurulum_sn,
+        "derleme_sn": derleme_sn,
+        "anlik_goruntu_kaydet_sn": kaydet_sn,
+        "anlik_goruntu_yukle_sn": yukle_sn,
+        "ag_bellek_mb": ag_bellek / (1024 * 1024),
+        "sorgu_sayisi": sorgu_sayisi,
+        "alt_hazirlama_sn": alt_hazirlama_sn,
+        "alt_yer_isareti_sayisi": len(yer_isaretleri.yer_isaretleri),
+        # A*'a göre genişletilen istasyon sayısındaki ortalama azalma oranı
+        "alt_genisletme_azalmasi": 1 - motorlar["alt"]["genisletilen_ortalama"] / oklid if oklid else 0.0,
+        "motorlar": motorlar,
+    }
+
+
+def toplu_olc(duzen: str, istasyon_sayisi: int, cift_sayisi: int, isci_sayilari: List[int],
+              tohum: int = 0) -> Dict[str, object]:
+    """rota_toplu'nun farklı işçi sayılarıyla çift/saniye verimini ölçer
+
+    Çiftler küçük bir başlangıç kümesinden çekilir; böylece başlangıç başına
+    birden fazla hedef düşer ve gruplama ile süreç havuzu birlikte ölçülür.
+    """
+    metro = ag_uret(duzen, istasyon_sayisi, tohum)
+    idler = list(metro.istasyonlar)
+    rng = random.Random(tohum + 2)
+    baslangiclar = rng.sample(idler, min(len(idler), max(1, cift_sayisi // 50)))
+    ciftler = [(rng.choice(baslangiclar), rng.choice(idler)) for _ in range(cift_sayisi)]
+    metro.derlenmis_ag()
+    olcumler = {}
+    for isci_sayisi in isci_sayilari:
+        bas = time.perf_counter()
+        for _ in metro.rota_toplu(ciftler, isci_sayisi):
+            pass
+        sure = time.perf_counter() - bas
+        olcumler[str(isci_sayisi)] = {"sure_sn": sure, "cift_saniye": cift_sayisi / sure}
+    return {
+        "duzen": duzen,
+        "istasyon_sayisi": len(metro.istasyonlar),
+        "cift_sayisi": cift_sayisi,
+        "cpu_sayisi": os.cpu_count(),
+        "isciler": olcumler,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Metro ağı rota arama performans ölçümü")
+    parser.add_argument("--duzen", nargs="+", choices=sorted(DUZENLER), default=sorted(DUZENLER),
+                        help="Ölçülecek ağ düzenleri")
+    parser.add_argument("--boyut", nargs="+", type=int, default=[100, 1000, 10000],
+                        help="İstasyon sayıları (ör. 100 1000 10000 100000 1000000)")
+    parser.add_argument("--sorgu", type=int, default=200, help="Her motor için rastgele sorgu sayısı")
+    parser.add_argument("--tohum", type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument("--toplu", nargs="+", type=int, metavar="ISCI",
+                        help="rota_toplu verimini bu işçi sayılarıyla da ölç (ör. 1 2 4 8)")
+    parser.add_argument("--toplu-cift", type=int, default=20000, help="Toplu ölçümdeki çift sayısı")
+    parser.add_argument("--cikti", help="JSON çıktı dosyası (verilmezse standart çıktı)")
+    args = parser.parse_args(argv)
+
+    sonuclar = []
+    for duzen in args.duzen:
+        for boyut in args.boyut:
+            print(f"{duzen} / {boyut} istasyon ölçülüyor...", file=sys.stderr)
+            sonuclar.append(olc(duzen, boyut, args.sorgu, args.tohum))
+            if args.toplu:
+                sonuclar[-1]["toplu"] = toplu_olc(duzen, boyut, args.toplu_cift, args.toplu, args.tohum)
+
+    rapor = {
+        "surum": SONUC_SURUMU,
+        "zaman": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tohum": args.tohum,
+        "sonuclar": sonuclar,
+    }
+    metin = json.dumps(rapor, ensure_ascii=False, indent=2)
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            f.write(metin + "\n")
+    else:
+        print(metin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""Ayrık olaylı metro tren ve yolcu simülasyonu
+
+Trenler her hattın bağlantıları boyunca iki yönde, sabit sefer aralığı ve
+kapasiteyle çalışır; yolculara rota planlayıcının (MetroAgi.rota_toplu)
+bulduğu en hızlı rotalar atanır. Olay kuyruğunda yalnızca trenlerin
+istasyonlara varışları tutulur: bir varışta o trenden inen ve o perondan
+binen yolcuların tamamı tek seferde, NumPy dizileri üzerinde işlenir.
+Yolcu ve tren durumu nesneler yerine dizilerde tutulduğundan günde
+milyonlarca yolculuk dakikalar değil saniyeler içinde simüle edilir.
+Aynı tohum her zaman aynı sonucu verir.
+
+Kullanım:
+    python metro_simulasyon.py --yolcu 1000000 --aralik 4 --kapasite 1200
+    python metro_simulasyon.py --yapay izgara 1000 --yolcu 200000 --cikti sonuc.json
+"""
+import argparse
+import heapq
+import json
+import math
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Union
+
+from ErtugrulSaritekin_MetroSimulation import NUMPY_AVAILABLE, MetroAgi
+from metro_performans import ag_kaynagi_ekle, ag_yukle
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Simüle edilen işletme günü: 06:00'dan başlayarak dakika cinsinden
+GUN_BASLANGICI = 6 * 60
+GUN_SURESI = 18 * 60
+
+# Yolcu çıkış zamanı dağılımı: (oran, ortalama, standart sapma) dakika; kalanı gün boyu düzgün
+ZIRVELER = ((0.35, 2 * 60, 45.0), (0.35, 12 * 60, 60.0))
+
+
+def hizmetleri_cikar(metro: MetroAgi) -> List[Tuple[str, List[str], List[float]]]:
+    """Her hattın aynı hat bağlantılarını uçtan uca tren hizmetlerine böler
+
+    Doğrusal bir hat tek hizmet olur. Dallanan hatlarda (ör. Ray Hattı'nın
+    dört kollu Merkez istasyonu) yürüyüş tek dereceli uç istasyonlardan
+    başlar ve kavşakta en düz devam eden bağlantıyı seçer; her bağlantı tam
+    olarak bir hizmete düşer. (hat, istasyon_idleri, ara_sureleri) döndürür.
+    """
+    hizmetler = []
+    for hat, istasyonlar in metro.hatlar.items():
+        sira = {ist.idx: i for i, ist in enumerate(istasyonlar)}
+        konum = {ist.idx: (ist.x, ist.y) for ist in istasyonlar}
+        kalan: Dict[str, Dict[str, float]] = {ist.idx: {} for ist in istasyonlar}
+        for ist in istasyonlar:
+            for komsu, sure in ist.komsular:
+                if komsu.hat == hat and komsu is not ist:
+                    onceki = kalan[ist.idx].get(komsu.idx)
+                    kalan[ist.idx][komsu.idx] = sure if onceki is None else min(onceki, sure)
+
+        while True:
+            baslangic = next((ist.idx for ist in istasyonlar if len(kalan[ist.idx]) % 2 == 1), None)
+            if baslangic is None:
+                baslangic = next((ist.idx for ist in istasyonlar if kalan[ist.idx]), None)
+            if baslangic is None:
+                break
+            yol, sureler = [baslangic], []
+            while kalan[yol[-1]]:
+                guncel = yol[-1]
+                if len(yol) == 1:
+                    sonraki = min(kalan[guncel], key=sira.get)
+                else:
+                    # Kavşakta geliş yönüyle en küçük açıyı yapan bağlantı seçilir
+                    gx = konum[guncel][0] - konum[yol[-2]][0]
+                    gy = konum[guncel][1] - konum[yol[-2]][1]
+
+                    def sapma(aday):
+                        dx = konum[aday][0] - konum[guncel][0]
+                        dy = konum[aday][1] - konum[guncel][1]
+                        uzunluk = math.hypot(gx, gy) * math.hypot(dx, dy)
+                        return (-(gx * dx + gy * dy) / uzunluk if uzunluk else 0.0, sira[aday])
+                    sonraki = min(kalan[guncel], key=sapma)
+                sureler.append(kalan[guncel].pop(sonraki))
+                kalan[sonraki].pop(guncel, None)
+                yol.append(sonraki)
+            hizmetler.append((hat, yol, sureler))
+    return hizmetler
+
+
+def yolcu_uret(metro: MetroAgi, yolcu_sayisi: int, tohum: int = 0,
+               gun_suresi: float = GUN_SURESI) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Rastgele yolculuklar üretir: (baslangic, hedef, cikis_zamani) dizileri
+
+    Başlangıç ve hedefler istasyonun bağlantı sayısıyla orantılı seçilir;
+    böylece aktarma merkezleri daha çok yolcu çeker. Çıkış zamanları sabah
+    ve akşam zirvelidir. İstasyonlar derlenmiş ağ indeksleriyle verilir.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Simülasyon için NumPy kütüphanesi gerekli.")
+    ag = metro.derlenmis_ag()
+    n = len(ag)
+    if n < 2:
+        raise ValueError("Yolcu üretmek için en az iki istasyon gerekli.")
+    rng = np.random.default_rng(tohum)
+    agirlik = np.diff(np.asarray(ag.ofsetler, dtype=np.int64)).astype(np.float64) + 1.0
+    agirlik /= agirlik.sum()
+    baslangic = rng.choice(n, yolcu_sayisi, p=agirlik).astype(np.int32)
+    hedef = rng.choice(n, yolcu_sayisi, p=agirlik).astype(np.int32)
+    ayni = np.flatnonzero(baslangic == hedef)
+    while ayni.size:
+        hedef[ayni] = rng.choice(n, ayni.size, p=agirlik)
+        ayni = ayni[baslangic[ayni] == hedef[ayni]]
+
+    cikis = rng.uniform(0.0, gun_suresi - 60, yolcu_sayisi)
+    secim = rng.random(yolcu_sayisi)
+    alt = 0.0
+    for oran, ortalama, sapma in ZIRVELER:
+        maske = (secim >= alt) & (secim < alt + oran)
+        cikis[maske] = rng.normal(ortalama, sapma, int(maske.sum()))
+        alt += oran
+    np.clip(cikis, 0.0, gun_suresi - 1, out=cikis)
+    return baslangic, hedef, cikis
+
+
+class SimulasyonSonucu:
+    """Simülasyonun istasyon, saat ve tren bazlı sayaçları"""
+
+    def __init__(self, etiketler: List[str], saat_sayisi: int, tren_sayisi: int):
+        n = len(etiketler)
+        self.etiketler = etiketler
+        self.binis = np.zeros(n, dtype=np.int64)
+        self.inis = np.zeros(n, dtype=np.int64)
+        self.aktarma = np.zeros(n, dtype=np.int64)
+        self.bekleme_toplam = np.zeros(n, dtype=np.float64)
+        self.en_fazla_bekleyen = np.zeros(n, dtype=np.int64)
+        self.geride_kalan = np.zeros(n, dtype=np.int64)  # Dolu tren yüzünden binemeyenler
+        self.saatlik_binis = np.zeros((n, saat_sayisi), dtype=np.int64)
+        self.saatlik_en_fazla_bekleyen = np.zeros((n, saat_sayisi), dtype=np.int64)
+        self.tren_en_yuksek_yuk = np.zeros(tren_sayisi, dtype=np.int64)
+        self.yolcu_sayisi = 0
+        self.rotasiz = 0
+        self.tamamlanan = 0
+        self.yolculuk_suresi_toplam = 0.0
+        self.bekleme_suresi_toplam = 0.0
+        self.olay_sayisi = 0
+        self.sure_sn = 0.0
+
+    def ozet(self) -> Dict[str, object]:
+        """Genel sayaçları sözlük olarak döndürür"""
+        tamamlanan = max(1, self.tamamlanan)
+        return {
+            "yolcu": self.yolcu_sayisi,
+            "tamamlanan": self.tamamlanan,
+            "tamamlanamayan": self.yolcu_sayisi - self.rotasiz - self.tamamlanan,
+            "rotasiz": self.rotasiz,
+            "ortalama_yolculuk_dk": self.yolculuk_suresi_toplam / tamamlanan,
+            "ortalama_bekleme_dk": self.bekleme_suresi_toplam / tamamlanan,
+            "geride_kalan": int(self.geride_kalan.sum()),
+            "tren_sayisi": len(self.tren_en_yuksek_yuk),
+            "tren_en_yuksek_yuk": int(self.tren_en_yuksek_yuk.max(initial=0)),
+            "olay_sayisi": self.olay_sayisi,
+            "sure_sn": self.sure_sn,
+        }
+
+    def en_kalabalik(self, k: int = 5) -> List[Tuple[str, int, int, int]]:
+        """Aynı anda en çok yolcunun beklediği k istasyon: (etiket, en_fazla_bekleyen, binis, geride_kalan)"""
+        sira = np.argsort(-self.en_fazla_bekleyen, kind="stable")[:k]
+        return [(self.etiketler[i], int(self.en_fazla_bekleyen[i]), int(self.binis[i]),
+                 int(self.geride_kalan[i])) for i in sira]
+
+    def sozluk(self) -> Dict[str, object]:
+        """JSON'a yazılabilir tam sonuç"""
+        return {
+            "ozet": self.ozet(),
+            "istasyonlar": [
+                {
+                    "istasyon": etiket,
+                    "binis": int(self.binis[i]),
+                    "inis": int(self.inis[i]),
+                    "aktarma": int(self.aktarma[i]),
+                    "ortalama_bekleme_dk": float(self.bekleme_toplam[i] / max(1, self.binis[i])),
+                    "en_fazla_bekleyen": int(self.en_fazla_bekleyen[i]),
+                    "geride_kalan": int(self.geride_kalan[i]),
+                    "saatlik_binis": self.saatlik_binis[i].tolist(),
+                    "saatlik_en_fazla_bekleyen": self.saatlik_en_fazla_bekleyen[i].tolist(),
+                }
+                for i, etiket in enumerate(self.etiketler)
+            ],
+        }
+
+
+class MetroSimulasyonu:
+    """Bir metro ağı üzerinde tren seferlerini ve yolcu akışını simüle eder
+
+    Her hizmetin (bkz. hizmetleri_cikar) her yönündeki her durak bir
+    perondur. Bir yolcunun rotası, aynı hizmet ve yönde ardışık giden
+    bağlantılar birleştirilerek bacaklara bölünür: (binilen peron, inilen
+    durak, binmeden önceki yürüme süresi). Yürüme süresi rotadaki aktarma
+    bağlantılarının süresidir; aktarma cezası yerine gerçek bekleme ölçülür.
+    """
+
+    def __init__(self, metro: MetroAgi, aralik: Union[float, Dict[str, float]] = 5.0,
+                 kapasite: int = 1000, durak_suresi: float = 0.5, gun_suresi: float = GUN_SURESI):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Simülasyon için NumPy kütüphanesi gerekli.")
+        self.metro = metro
+        self.aralik = aralik
+        self.kapasite = kapasite
+        self.durak_suresi = durak_suresi
+        self.gun_suresi = gun_suresi
+        self.ag = metro.derlenmis_ag()
+        self.hizmetler = hizmetleri_cikar(metro)
+
+        # Peron numarası: hizmet_ofseti[h] + yön * uzunluk + durak (yön 0: ileri, 1: geri)
+        self.hizmet_ofseti = []
+        peron_istasyon = []
+        self._kenar_hizmeti: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        for h, (_, yol, _) in enumerate(self.hizmetler):
+            self.hizmet_ofseti.append(len(peron_istasyon))
+            duraklar = [self.ag.indeksler[idx] for idx in yol]
+            peron_istasyon.extend(duraklar * 2)
+            for i in range(len(duraklar) - 1):
+                self._kenar_hizmeti.setdefault((duraklar[i], duraklar[i + 1]), (h, 0, i))
+                self._kenar_hizmeti.setdefault((duraklar[i + 1], duraklar[i]), (h, 1, i + 1))
+        self.peron_istasyon = np.asarray(peron_istasyon, dtype=np.int32)
+
+    def _peron(self, h: int, yon: int, durak: int) -> int:
+        return self.hizmet_ofseti[h] + yon * len(self.hizmetler[h][1]) + durak
+
+    def _bacaklara_bol(self, rota: List[int]) -> Tuple[List[Tuple[int, int, float]], float]:
+        """İndeks rotasını [(peron, inis_duragi, yurume)] ve son yürüme süresine çevirir"""
+        bacaklar = []
+        yurume = 0.0
+        h = yon = durak = -1
+        for a, b in zip(rota, rota[1:]):
+            hizmet = self._kenar_hizmeti.get((a, b))
+            if hizmet is None:
+                # Aktarma bağlantısı: yolcu peronlar arasında yürür
+                yurume += min(self.ag.sureler[e] for e in self.ag.kenarlar(a, b))
+                h = -1
+                continue
+            yeni_h, yeni_yon, bas = hizmet
+            if bacaklar and (yeni_h, yeni_yon, bas) == (h, yon, durak):
+                # Aynı trende kalınır: bacağın iniş durağı uzar
+                durak = bas + (1 if yon == 0 else -1)
+                bacaklar[-1] = (bacaklar[-1][0], durak, bacaklar[-1][2])
+                continue
+            h, yon = yeni_h, yeni_yon
+            durak = bas + (1 if yon == 0 else -1)
+            bacaklar.append((self._peron(h, yon, bas), durak, yurume))
+            yurume = 0.0
+        return bacaklar, yurume
+
+    def calistir(self, baslangic: "np.ndarray", hedef: "np.ndarray", cikis: "np.ndarray",
+                 isci_sayisi: Optional[int] = 1) -> SimulasyonSonucu:
+        """Verilen yolculukları simüle eder (istasyonlar derlenmiş ağ indeksleri)"""
+        zaman_olcumu = time.perf_counter()
+        ag = self.ag
+        n = len(ag)
+        yolcu_sayisi = len(baslangic)
+
+        # Her benzersiz (başlangıç, hedef) çifti için rota bir kez planlanır
+        od = baslangic.astype(np.int64) * n + hedef
+        benzersiz, yolcu_od = np.unique(od, return_inverse=True)
+        od_sira = {(ag.idler[int(o) // n], ag.idler[int(o) % n]): i for i, o in enumerate(benzersiz)}
+        rota_ofset = np.zeros(len(benzersiz) + 1, dtype=np.int64)
+        rota_son_yurume = np.zeros(len(benzersiz), dtype=np.float64)
+        rota_var = np.zeros(len(benzersiz), dtype=bool)
+        rota_bacaklari: List[list] = [[] for _ in range(len(benzersiz))]
+        for baslangic_id, hedef_id, sonuc in self.metro.rota_toplu(od_sira.keys(), isci_sayisi):
+            if sonuc is None:
+                continue
+            i = od_sira[(baslangic_id, hedef_id)]
+            rota_bacaklari[i], rota_son_yurume[i] = self._bacaklara_bol(
+                [ag.indeksler[ist.idx] for ist in sonuc[0]])
+            rota_var[i] = True
+        rota_ofset[1:] = np.cumsum([len(b) for b in rota_bacaklari])
+        duz = [bacak for bacaklar in rota_bacaklari for bacak in bacaklar]
+        bacak_peron = np.fromiter((b[0] for b in duz), dtype=np.int32, count=len(duz))
+        bacak_inis = np.fromiter((b[1] for b in duz), dtype=np.int32, count=len(duz))
+        bacak_yurume = np.fromiter((b[2] for b in duz), dtype=np.float64, count=len(duz))
+        rota_bacak_sayisi = np.diff(rota_ofset)
+
+        # Yolcu durumu
+        yolcu_rota = yolcu_od.astype(np.int64)
+        yolcu_bacak = np.zeros(yolcu_sayisi, dtype=np.int32)
+        yolcu_varis = np.full(yolcu_sayisi, np.nan)
+        yolcu_bekleme = np.zeros(yolcu_sayisi, dtype=np.float64)
+
+        # Yalnızca yürüyerek (ör. K1 -> M2 aktarması) tamamlanan yolculuklar
+        yuruyen = rota_var[yolcu_rota] & (rota_bacak_sayisi[yolcu_rota] == 0)
+        yolcu_varis[yuruyen] = cikis[yuruyen] + rota_son_yurume[yolcu_rota[yuruyen]]
+
+        # İlk peronlarına hazır olma zamanına göre sıralı yolcular; her peron bir dilim
+        trende = np.flatnonzero(rota_var[yolcu_rota] & (rota_bacak_sayisi[yolcu_rota] > 0))
+        ilk_bacak = rota_ofset[yolcu_rota[trende]]
+        ilk_peron = bacak_peron[ilk_bacak]
+        ilk_hazir_tum = cikis[trende] + bacak_yurume[ilk_bacak]
+        sira = np.lexsort((ilk_hazir_tum, ilk_peron))
+        ilk_id = trende[sira]
+        ilk_hazir = ilk_hazir_tum[sira]
+        peron_sayisi = len(self.peron_istasyon)
+        ilk_sinir = np.searchsorted(ilk_peron[sira], np.arange(peron_sayisi + 1))
+        ilk_isaret = ilk_sinir[:-1].copy()
+
+        # Peron kuyrukları: hazır olma sırasına göre (kimlikler, hazır zamanları) parçaları
+        kuyruk = [deque() for _ in range(peron_sayisi)]
+        kuyruk_uzunlugu = np.zeros(peron_sayisi, dtype=np.int64)
+        aktaranlar: List[list] = [[] for _ in range(peron_sayisi)]
+
+        # Seferler: her hizmetin her iki ucundan gün boyunca aralikla kalkan trenler
+        olaylar = []
+        tren_hizmet, tren_yon = [], []
+        for h, (hat, yol, _) in enumerate(self.hizmetler):
+            aralik = self.aralik.get(hat, 5.0) if isinstance(self.aralik, dict) else self.aralik
+            kalkis = 0.0
+            while kalkis < self.gun_suresi:
+                for yon in (0, 1):
+                    olaylar.append((kalkis, len(tren_hizmet), 0 if yon == 0 else len(yol) - 1))
+                    tren_hizmet.append(h)
+                    tren_yon.append(yon)
+                kalkis += aralik
+        heapq.heapify(olaylar)
+        tren_yolcu = [np.empty(0, dtype=np.int64)] * len(tren_hizmet)
+        tren_inis = [np.empty(0, dtype=np.int32)] * len(tren_hizmet)
+
+        saat_sayisi = math.ceil(self.gun_suresi / 60) + 1
+        etiketler = [f"{self.metro.istasyonlar[idx].ad} ({self.metro.istasyonlar[idx].hat})" for idx in ag.idler]
+        sonuc = SimulasyonSonucu(etiketler, saat_sayisi, len(tren_hizmet))
+        sonuc.yolcu_sayisi = yolcu_sayisi
+        sonuc.rotasiz = int((~rota_var[yolcu_rota]).sum())
+
+        while olaylar:
+            T, tren, durak = heapq.heappop(olaylar)
+            sonuc.olay_sayisi += 1
+            h = tren_hizmet[tren]
+            yon = tren_yon[tren]
+            p = self._peron(h, yon, durak)
+            ist = self.peron_istasyon[p]
+            saat = min(int(T // 60), saat_sayisi - 1)
+
+            # İniş: bu durakta inecek yolcular bir sonraki bacağa ya da varışa geçer
+            yolcular = tren_yolcu[tren]
+            if yolcular.size:
+                inen_maske = tren_inis[tren] == durak
+                if inen_maske.any():
+                    inen = yolcular[inen_maske]
+                    tren_yolcu[tren] = yolcular[~inen_maske]
+                    tren_inis[tren] = tren_inis[tren][~inen_maske]
+                    sonuc.inis[ist] += inen.size
+                    bacak = yolcu_bacak[inen] + 1
+                    rota = yolcu_rota[inen]
+                    biten = bacak >= rota_bacak_sayisi[rota]
+                    yolcu_varis[inen[biten]] = T + rota_son_yurume[rota[biten]]
+                    devam = inen[~biten]
+                    if devam.size:
+                        sonuc.aktarma[ist] += devam.size
+                        yolcu_bacak[devam] = bacak[~biten]
+                        g = rota_ofset[rota[~biten]] + bacak[~biten]
+                        peronlar = bacak_peron[g]
+                        hazir = T + bacak_yurume[g]
+                        grup = np.argsort(peronlar, kind="stable")
+                        sinirlar = np.flatnonzero(np.diff(peronlar[grup])) + 1
+                        for parca in np.split(grup, sinirlar):
+                            aktaranlar[peronlar[parca[0]]].append((devam[parca], hazir[parca]))
+
+            # Perona yeni gelenler: ilk bacaktakiler ve hazır olan aktarmacılar
+            yeni_id, yeni_hazir = [], []
+            bas, son = ilk_isaret[p], ilk_sinir[p + 1]
+            if bas < son:
+                bitis = bas + int(np.searchsorted(ilk_hazir[bas:son], T, "right"))
+                if bitis > bas:
+                    yeni_id.append(ilk_id[bas:bitis])
+                    yeni_hazir.append(ilk_hazir[bas:bitis])
+                    ilk_isaret[p] = bitis
+            if aktaranlar[p]:
+                bekleyenler = []
+                for ids, hazir in aktaranlar[p]:
+                    hazir_maske = hazir <= T
+                    if hazir_maske.all():
+                        yeni_id.append(ids)
+                        yeni_hazir.append(hazir)
+                    else:
+                        yeni_id.append(ids[hazir_maske])
+                        yeni_hazir.append(hazir[hazir_maske])
+                        bekleyenler.append((ids[~hazir_maske], hazir[~hazir_maske]))
+                aktaranlar[p] = bekleyenler
+            if yeni_id:
+                ids = np.concatenate(yeni_id) if len(yeni_id) > 1 else yeni_id[0]
+                if ids.size:
+                    # Yeni gelenler kuyruktakilerden sonra hazır olduğundan yalnız kendi aralarında sıralanır
+                    hazir = np.concatenate(yeni_hazir) if len(yeni_hazir) > 1 else yeni_hazir[0]
+                    sira = np.argsort(hazir, kind="stable")
+                    kuyruk[p].append((ids[sira], hazir[sira]))
+                    kuyruk_uzunlugu[p] += ids.size
+
+            # Biniş: kuyruk sırasıyla trendeki boş yer kadar yolcu
+            bekleyen = int(kuyruk_uzunlugu[p])
+            if bekleyen:
+                if bekleyen > sonuc.en_fazla_bekleyen[ist]:
+                    sonuc.en_fazla_bekleyen[ist] = bekleyen
+                if bekleyen > sonuc.saatlik_en_fazla_bekleyen[ist, saat]:
+                    sonuc.saatlik_en_fazla_bekleyen[ist, saat] = bekleyen
+                alinacak = min(self.kapasite - tren_yolcu[tren].size, bekleyen)
+                binen_id, binen_hazir = [], []
+                while alinacak > 0:
+                    ids, hazir = kuyruk[p][0]
+                    if ids.size <= alinacak:
+                        kuyruk[p].popleft()
+                    else:
+                        kuyruk[p][0] = (ids[alinacak:], hazir[alinacak:])
+                        ids, hazir = ids[:alinacak], hazir[:alinacak]
+                    binen_id.append(ids)
+                    binen_hazir.append(hazir)
+                    alinacak -= ids.size
+                if binen_id:
+                    binen = np.concatenate(binen_id)
+                    bekleme = T - np.concatenate(binen_hazir)
+                    kuyruk_uzunlugu[p] -= binen.size
+                    yolcu_bekleme[binen] += bekleme
+                    sonuc.binis[ist] += binen.size
+                    sonuc.saatlik_binis[ist, saat] += binen.size
+                    sonuc.bekleme_toplam[ist] += bekleme.sum()
+                    inis = bacak_inis[rota_ofset[yolcu_rota[binen]] + yolcu_bacak[binen]]
+                    tren_yolcu[tren] = np.concatenate((tren_yolcu[tren], binen))
+                    tren_inis[tren] = np.concatenate((tren_inis[tren], inis))
+                    if tren_yolcu[tren].size > sonuc.tren_en_yuksek_yuk[tren]:
+                        sonuc.tren_en_yuksek_yuk[tren] = tren_yolcu[tren].size
+                sonuc.geride_kalan[ist] += kuyruk_uzunlugu[p]
+
+            # Sonraki durak; son durakta tren seferini tamamlar
+            sureler = self.hizmetler[h][2]
+            if yon == 0 and durak < len(sureler):
+                heapq.heappush(olaylar, (T + self.durak_suresi + sureler[durak], tren, durak + 1))
+            elif yon == 1 and durak > 0:
+                heapq.heappush(olaylar, (T + self.durak_suresi + sureler[durak - 1], tren, durak - 1))
+
+        tamamlanan = ~np.isnan(yolcu_varis)
+        sonuc.tamamlanan = int(tamamlanan.sum())
+        sonuc.yolculuk_suresi_toplam = float((yolcu_varis[tamamlanan] - cikis[tamamlanan]).sum())
+        sonuc.bekleme_suresi_toplam = float(yolcu_bekleme[tamamlanan].sum())
+        sonuc.sure_sn = time.perf_counter() - zaman_olcumu
+        return sonuc
+
+
+def simule_et(metro: MetroAgi, yolcu_sayisi: int, tohum: int = 0, isci_sayisi: Optional[int] = 1,
+              **ayarlar) -> SimulasyonSonucu:
+    """Yolcu üretip MetroSimulasyonu ile bir günü simüle eder; ayarlar MetroSimulasyonu'na gider"""
+    simulasyon = MetroSimulasyonu(metro, **ayarlar)
+    baslangic, hedef, cikis = yolcu_uret(metro, yolcu_sayisi, tohum, simulasyon.gun_suresi)
+    return simulasyon.calistir(baslangic, hedef, cikis, isci_sayisi)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ayrık olaylı metro tren ve yolcu simülasyonu")
+    ag_kaynagi_ekle(parser)
+    parser.add_argument("--yolcu", type=int, default=100000, help="Günlük yolculuk sayısı")
+    parser.add_argument("--aralik", type=float, default=5.0, help="Sefer aralığı (dakika)")
+    parser.add_argument("--kapasite", type=int, default=1000, help="Tren kapasitesi (yolcu)")
+    parser.add_argument("--durak-suresi", type=float, default=0.5, help="Durakta bekleme (dakika)")
+    parser.add_argument("--tohum", type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument("--isci", type=int, default=1, help="Rota planlama işçi sayısı")
+    parser.add_argument("--cikti", help="Tam sonucun yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    metro = ag_yukle(args)
+    sonuc = simule_et(metro, args.yolcu, args.tohum, args.isci, aralik=args.aralik,
+                      kapasite=args.kapasite, durak_suresi=args.durak_suresi)
+    for anahtar, deger in sonuc.ozet().items():
+        print(f"{anahtar}: {deger:.2f}" if isinstance(deger, float) else f"{anahtar}: {deger}")
+    print("\nEn kalabalık istasyonlar (en fazla bekleyen / biniş / geride kalan):")
+    for etiket, bekleyen, binis, geride in sonuc.en_kalabalik():
+        print(f"  {etiket}: {bekleyen} / {binis} / {geride}")
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(sonuc.sozluk(), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
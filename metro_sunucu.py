@@ -0,0 +1,471 @@
+"""Metro rota sunucusu
+
+Ağı bir kez yükleyip HTTP üzerinden JSON rota sorgularını yanıtlayan yerel
+asyncio sunucusu. Aramalar bir iş parçacığı ya da süreç havuzunda çalışır;
+aynı anda gelen özdeş sorgular tek bir hesaplamada birleştirilir ve bekleyen
+hesaplama sayısı sınırı aşıldığında istekler 503 ile reddedilir.
+
+Uç noktalar:
+    GET /rota?baslangic=K1&hedef=T3&tur=hizli   (tur: hizli, aktarma, hat_degisimi)
+    GET /metrikler
+    GET /saglik
+
+Kullanım:
+    python metro_sunucu.py --json ag.json --port 8080
+    python metro_sunucu.py --yapay izgara 10000 --havuz surec
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ErtugrulSaritekin_MetroSimulation import DerlenmisAg, Istasyon, MetroAgi, rota_formatla
+from metro_performans import ag_kaynagi_ekle, ag_yukle
+
+SORGU_TURLERI = ("hizli", "aktarma", "hat_degisimi")
+
+# İstek başlığı ve gövdesi için üst sınırlar (bayt)
+EN_FAZLA_BASLIK = 64 * 1024
+EN_FAZLA_GOVDE = 64 * 1024
+
+HTTP_DURUMLARI = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+# Süreç havuzundaki işçilerin derlenmiş ağı ve ön hesaplamaları (tablolar, CH,
+# yer işaretleri); başlatıcıda bir kez yüklenir
+_ISCI_AGI: Optional[DerlenmisAg] = None
+_ISCI_ON_HESAPLAMALARI: Tuple = (None, None, None)
+
+
+def _isci_baslat(ag: DerlenmisAg, tablolar=None, ch=None, yer_isaretleri=None) -> None:
+    global _ISCI_AGI, _ISCI_ON_HESAPLAMALARI
+    _ISCI_AGI = ag
+    _ISCI_ON_HESAPLAMALARI = (tablolar, ch, yer_isaretleri)
+
+
+def _isci_sorgu(tur: str, baslangic: int, hedef: int) -> Optional[Tuple[List[int], Optional[float]]]:
+    """Süreç işçisinde aramayı çalıştırır; (indeks listesi, süre) döndürür
+
+    En hızlı rota, MetroAgi.en_hizli_rota_bul ile aynı sırayla tablolar, CH,
+    yer işaretleri ve A* arasından ilk hazır olanla bulunur.
+    """
+    ag = _ISCI_AGI
+    if tur == "aktarma":
+        rota = ag.bfs(baslangic, hedef)
+        return None if rota is None else (rota, None)
+    if tur == "hat_degisimi":
+        sonuc = ag.en_az_aktarma_dijkstra(baslangic, hedef)
+        return None if sonuc is None else (sonuc[0], sonuc[2])
+    tablolar, ch, yer_isaretleri = _ISCI_ON_HESAPLAMALARI
+    if tablolar is not None:
+        return tablolar.rota(baslangic, hedef)
+    if ch is not None:
+        return ch.rota(baslangic, hedef)
+    if yer_isaretleri is not None:
+        return ag.alt_a_yildiz(baslangic, hedef, yer_isaretleri)
+    return ag.a_yildiz(baslangic, hedef)
+
+
+def _tasinabilir(on_hesaplama):
+    """Ön hesaplama nesnesini işçi süreçlerine gönderilebilir hale getirir
+
+    Dosyadan yüklenen nesnelerin dizileri mmap görünümleridir ve
+    serileştirilemez; bunlar diziye kopyalanır, mmap bağlantısı bırakılır.
+    """
+    if on_hesaplama is None:
+        return None
+    kopya = object.__new__(type(on_hesaplama))
+    for ad in type(on_hesaplama).__slots__:
+        deger = getattr(on_hesaplama, ad)
+        if ad == "_mmap":
+            deger = None
+        elif isinstance(deger, memoryview):
+            deger = array(deger.format, deger.tobytes())
+        setattr(kopya, ad, deger)
+    return kopya
+
+
+class SunucuMesgul(Exception):
+    """Bekleyen hesaplama sınırı aşıldığında yükseltilir (HTTP 503)"""
+
+
+class SunucuMetrikleri:
+    """İstek sayaçları, verim ve gecikme yüzdelikleri
+
+    Gecikmeler son `pencere` /rota isteği üzerinden hesaplanır; verim son
+    10 saniyede tamamlanan istek sayısından türetilir.
+    """
+
+    def __init__(self, pencere: int = 10000):
+        self.baslangic_zamani = time.monotonic()
+        self.istek = 0
+        self.durum_kodlari: Dict[int, int] = defaultdict(int)
+        self.hesaplama = 0  # Havuzda çalıştırılan benzersiz arama sayısı
+        self.birlestirilen = 0  # Uçuştaki özdeş bir aramaya bağlanan istekler
+        self.reddedilen = 0
+        self.hata = 0  # 500 ile yanıtlanan, hesaplaması hata veren istekler
+        self._gecikmeler: deque = deque(maxlen=pencere)  # ms
+        self._bitisler: deque = deque(maxlen=pencere)  # monotonic zaman
+
+    def kaydet(self, durum: int, gecikme_ms: Optional[float]) -> None:
+        self.istek += 1
+        self.durum_kodlari[durum] += 1
+        if gecikme_ms is not None:
+            self._gecikmeler.append(gecikme_ms)
+            self._bitisler.append(time.monotonic())
+
+    def sozluk(self, ucustaki: int) -> Dict[str, object]:
+        simdi = time.monotonic()
+        gecikmeler = sorted(self._gecikmeler)
+
+        def yuzdelik(oran: float) -> Optional[float]:
+            if not gecikmeler:
+                return None
+            return gecikmeler[min(len(gecikmeler) - 1, int(oran * len(gecikmeler)))]
+
+        son_10_sn = sum(1 for zaman in self._bitisler if simdi - zaman <= 10)
+        calisma_suresi = simdi - self.baslangic_zamani
+        return {
+            "calisma_suresi_sn": calisma_suresi,
+            "istek": self.istek,
+            "durum_kodlari": dict(self.durum_kodlari),
+            "hesaplama": self.hesaplama,
+            "birlestirilen": self.birlestirilen,
+            "reddedilen": self.reddedilen,
+            "hata": self.hata,
+            "ucustaki": ucustaki,
+            "verim_istek_sn": son_10_sn / min(10.0, calisma_suresi) if calisma_suresi > 0 else 0.0,
+            "gecikme_ms": {
+                "ornek": len(gecikmeler),
+                "p50": yuzdelik(0.50),
+                "p90": yuzdelik(0.90),
+                "p99": yuzdelik(0.99),
+                "en_fazla": gecikmeler[-1] if gecikmeler else None,
+            },
+        }
+
+
+class RotaSunucusu:
+    """MetroAgi'yi HTTP üzerinden sunan asyncio sunucusu
+
+    havuz="iplik" ise aramalar MetroAgi'nin kendi metotlarıyla bir iş parçacığı
+    havuzunda çalışır; hazırlanmış tablolar, CH, yer işaretleri ve rota
+    önbelleği kullanılır. havuz="surec" ise derlenmiş ağın ve hazırlanmış
+    ön hesaplamaların bir kopyası her işçi sürecine gönderilir ve aramalar
+    GIL'den bağımsız olarak paralel çalışır. Ağ değiştiğinde (metro.surum
+    artınca) ya da yeni bir ön hesaplama hazırlandığında sonraki istek havuzu
+    güncel kopyayla yeniden kurar; eski havuz uçuştaki işlerini bitirip
+    kapanır. Rota önbelleği süreç havuzunda kullanılmaz. İşçiler sunucu
+    başlarken ve havuz her yeniden kurulduğunda önceden başlatılır.
+
+    Aynı (tür, başlangıç, hedef) için hesaplama sürerken gelen istekler aynı
+    sonucu bekler. Havuza en fazla 2 * isci_sayisi arama gönderilir; uçuştaki
+    benzersiz arama sayısı en_fazla_bekleyen değerini aşarsa yeni istekler
+    SunucuMesgul ile reddedilir.
+    """
+
+    def __init__(self, metro: MetroAgi, havuz: str = "iplik", isci_sayisi: Optional[int] = None,
+                 en_fazla_bekleyen: int = 1024):
+        if havuz not in ("iplik", "surec"):
+            raise ValueError(f"Bilinmeyen havuz türü: {havuz}")
+        self.metro = metro
+        metro.derlenmis_ag()  # Sorgulardan önce bir kez derlenir
+        self.havuz_turu = havuz
+        self.isci_sayisi = isci_sayisi or os.cpu_count() or 1
+        self.en_fazla_bekleyen = en_fazla_bekleyen
+        self.metrikler = SunucuMetrikleri()
+        self._havuz: Optional[Executor] = None
+        self._havuz_anahtari: Optional[Tuple] = None  # Süreç havuzundaki kopyanın kaynağı
+        self._havuz_agi: Optional[DerlenmisAg] = None  # İşçilere gönderilen ağ; indeksler buna göredir
+        self._sinir: Optional[asyncio.Semaphore] = None
+        self._ucustakiler: Dict[Tuple[int, str, str, str], asyncio.Future] = {}
+
+    @property
+    def ag(self) -> DerlenmisAg:
+        """Güncel derlenmiş ağ (istasyon eklenmişse yeniden derlenir)"""
+        return self.metro.derlenmis_ag()
+
+    def _kopya_anahtari(self) -> Tuple:
+        metro = self.metro
+        return (metro.surum, metro._tablolar, metro._ch, metro._alt)
+
+    def _kopya_guncel(self) -> bool:
+        eski, yeni = self._havuz_anahtari, self._kopya_anahtari()
+        return eski is not None and eski[0] == yeni[0] and all(a is b for a, b in zip(eski[1:], yeni[1:]))
+
+    async def _havuzu_ac(self) -> None:
+        if self._sinir is None:
+            self._sinir = asyncio.Semaphore(2 * self.isci_sayisi)
+        if self.havuz_turu == "iplik":
+            if self._havuz is None:
+                self._havuz = ThreadPoolExecutor(max_workers=self.isci_sayisi)
+            return
+        if self._havuz is not None and self._kopya_guncel():
+            return
+        if self._havuz is not None:
+            self._havuz.shutdown(wait=False)  # Uçuştaki işler eski kopyayla tamamlanır
+        metro = self.metro
+        self._havuz_anahtari = self._kopya_anahtari()
+        self._havuz_agi = metro.derlenmis_ag()
+        # Olay döngüsü ve yardımcı iş parçacıkları çalışırken fork güvenli değildir
+        havuz = self._havuz = ProcessPoolExecutor(
+            max_workers=self.isci_sayisi, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_isci_baslat,
+            initargs=(self._havuz_agi, _tasinabilir(metro._tablolar), _tasinabilir(metro._ch),
+                      _tasinabilir(metro._alt)))
+        # spawn ile işçiler ilk işlerde tek tek başlar; başlatma gecikmesi isteklere yansımasın
+        dongu = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(dongu.run_in_executor(havuz, os.getpid) for _ in range(self.isci_sayisi)))
+        except Exception:
+            # Başlatılamayan havuz bırakılır; sonraki istek yeniden dener
+            havuz.shutdown(wait=False, cancel_futures=True)
+            if self._havuz is havuz:
+                self._havuz = None
+            raise
+
+    def kapat(self) -> None:
+        if self._havuz is not None:
+            self._havuz.shutdown(wait=False, cancel_futures=True)
+            self._havuz = None
+
+    def _yerel_sorgu(self, tur: str, baslangic_id: str,
+                     hedef_id: str) -> Optional[Tuple[List[Istasyon], Optional[float]]]:
+        """İş parçacığı havuzunda MetroAgi metotlarıyla aramayı çalıştırır"""
+        if tur == "aktarma":
+            rota = self.metro.en_az_aktarma_bul(baslangic_id, hedef_id)
+            return None if rota is None else (rota, None)
+        if tur == "hat_degisimi":
+            sonuc = self.metro.en_az_hat_degisimi_bul(baslangic_id, hedef_id)
+            return None if sonuc is None else (sonuc[0], sonuc[2])
+        return self.metro.en_hizli_rota_bul(baslangic_id, hedef_id)
+
+    @staticmethod
+    def _yanit(tur: str, baslangic_id: str, hedef_id: str,
+               sonuc: Optional[Tuple[List[Istasyon], Optional[float]]]) -> Dict[str, object]:
+        yanit = {"tur": tur, "baslangic": baslangic_id, "hedef": hedef_id, "bulundu": sonuc is not None}
+        if sonuc is not None:
+            rota, sure = sonuc
+            yanit["rota"] = [istasyon.idx for istasyon in rota]
+            yanit["metin"] = rota_formatla(rota)
+            yanit["aktarma_sayisi"] = sum(1 for a, b in zip(rota, rota[1:]) if a.hat != b.hat)
+            if sure is not None:
+                yanit["sure"] = int(sure) if sure == int(sure) else sure
+        return yanit
+
+    async def _hesapla(self, tur: str, baslangic_id: str, hedef_id: str) -> Dict[str, object]:
+        dongu = asyncio.get_running_loop()
+        async with self._sinir:
+            self.metrikler.hesaplama += 1
+            havuz, ag = self._havuz, self._havuz_agi
+            try:
+                if self.havuz_turu == "surec":
+                    sonuc = await dongu.run_in_executor(havuz, _isci_sorgu, tur,
+                                                       ag.indeksler[baslangic_id], ag.indeksler[hedef_id])
+                    if sonuc is not None:
+                        rota, sure = sonuc
+                        sonuc = ([self.metro.istasyonlar[ag.idler[i]] for i in rota], sure)
+                else:
+                    sonuc = await dongu.run_in_executor(havuz, self._yerel_sorgu, tur,
+                                                       baslangic_id, hedef_id)
+            except BrokenExecutor:
+                # Bozulan havuz (ör. başlatılamayan işçi) bırakılır; sonraki istek yenisini kurar
+                if self._havuz is havuz:
+                    havuz.shutdown(wait=False, cancel_futures=True)
+                    self._havuz = None
+                raise
+        return self._yanit(tur, baslangic_id, hedef_id, sonuc)
+
+    async def rota(self, tur: str, baslangic_id: str, hedef_id: str) -> Dict[str, object]:
+        """Sorguyu havuzda çalıştırır; özdeş uçuştaki sorguyla birleştirir
+
+        Yalnızca aynı ağ sürümündeki sorgular birleştirilir.
+        """
+        await self._havuzu_ac()
+        anahtar = (self.metro.surum, tur, baslangic_id, hedef_id)
+        gorev = self._ucustakiler.get(anahtar)
+        if gorev is not None:
+            self.metrikler.birlestirilen += 1
+        else:
+            if len(self._ucustakiler) >= self.en_fazla_bekleyen:
+                self.metrikler.reddedilen += 1
+                raise SunucuMesgul()
+            gorev = asyncio.ensure_future(self._hesapla(tur, baslangic_id, hedef_id))
+            self._ucustakiler[anahtar] = gorev
+            gorev.add_done_callback(lambda _: self._ucustakiler.pop(anahtar, None))
+        # Bir istemcinin iptali diğer bekleyenlerin hesaplamasını durdurmasın
+        return await asyncio.shield(gorev)
+
+    async def _istek_isle(self, yontem: str, hedef: str) -> Tuple[int, Dict[str, object]]:
+        url = urlsplit(hedef)
+        if yontem != "GET":
+            return 405, {"hata": "Yalnızca GET desteklenir."}
+        if url.path == "/saglik":
+            return 200, {"durum": "hazir", "istasyon": len(self.ag), "surum": self.metro.surum}
+        if url.path == "/metrikler":
+            metrikler = self.metrikler.sozluk(len(self._ucustakiler))
+            if self.metro.onbellek is not None:
+                metrikler["onbellek"] = self.metro.onbellek.istatistikler()
+            return 200, metrikler
+        if url.path != "/rota":
+            return 404, {"hata": f"Bilinmeyen yol: {url.path}"}
+
+        parametreler = parse_qs(url.query)
+        baslangic_id = parametreler.get("baslangic", [None])[0]
+        hedef_id = parametreler.get("hedef", [None])[0]
+        tur = parametreler.get("tur", ["hizli"])[0]
+        if not baslangic_id or not hedef_id:
+            return 400, {"hata": "baslangic ve hedef parametreleri gerekli."}
+        if tur not in SORGU_TURLERI:
+            return 400, {"hata": f"tur şunlardan biri olmalı: {', '.join(SORGU_TURLERI)}"}
+        for istasyon_id in (baslangic_id, hedef_id):
+            if istasyon_id not in self.ag.indeksler:
+                return 404, {"hata": f"Bilinmeyen istasyon: {istasyon_id}"}
+        try:
+            return 200, await self.rota(tur, baslangic_id, hedef_id)
+        except SunucuMesgul:
+            return 503, {"hata": "Sunucu meşgul, daha sonra tekrar deneyin."}
+
+    @staticmethod
+    async def _yaz(writer: asyncio.StreamWriter, durum: int, govde: Dict[str, object], acik_kal: bool) -> None:
+        veri = json.dumps(govde, ensure_ascii=False).encode("utf-8")
+        basliklar = [
+            f"HTTP/1.1 {durum} {HTTP_DURUMLARI[durum]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(veri)}",
+            f"Connection: {'keep-alive' if acik_kal else 'close'}",
+        ]
+        if durum == 503:
+            basliklar.append("Retry-After: 1")
+        writer.write(("\r\n".join(basliklar) + "\r\n\r\n").encode("latin-1") + veri)
+        await writer.drain()
+
+    async def _baglanti(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Tek bir bağlantı üzerindeki (keep-alive) istekleri sırayla işler"""
+        try:
+            while True:
+                try:
+                    istek_satiri = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not istek_satiri:
+                    break
+                bas = time.perf_counter()
+                parcalar = istek_satiri.decode("latin-1").split()
+                if len(parcalar) != 3:
+                    await self._yaz(writer, 400, {"hata": "Geçersiz istek satırı."}, False)
+                    self.metrikler.kaydet(400, None)
+                    break
+                yontem, hedef, surum = parcalar
+
+                basliklar: Dict[str, str] = {}
+                baslik_boyutu = 0
+                while True:
+                    try:
+                        satir = await reader.readline()
+                    except ValueError:
+                        # Tek bir başlık satırı akış sınırını aştı
+                        baslik_boyutu = EN_FAZLA_BASLIK + 1
+                        break
+                    baslik_boyutu += len(satir)
+                    if satir in (b"\r\n", b"\n", b"") or baslik_boyutu > EN_FAZLA_BASLIK:
+                        break
+                    ad, _, deger = satir.decode("latin-1").partition(":")
+                    basliklar[ad.strip().lower()] = deger.strip()
+                if baslik_boyutu > EN_FAZLA_BASLIK:
+                    await self._yaz(writer, 431, {"hata": "İstek başlıkları çok büyük."}, False)
+                    self.metrikler.kaydet(431, None)
+                    break
+                try:
+                    govde_uzunlugu = int(basliklar.get("content-length", "0"))
+                except ValueError:
+                    govde_uzunlugu = -1
+                if not 0 <= govde_uzunlugu <= EN_FAZLA_GOVDE:
+                    await self._yaz(writer, 413, {"hata": "İstek gövdesi kabul edilmiyor."}, False)
+                    self.metrikler.kaydet(413, None)
+                    break
+                if govde_uzunlugu:
+                    await reader.readexactly(govde_uzunlugu)  # Gövde kullanılmaz
+
+                baglanti = basliklar.get("connection", "").lower()
+                acik_kal = baglanti == "keep-alive" if surum == "HTTP/1.0" else baglanti != "close"
+                try:
+                    durum, govde = await self._istek_isle(yontem, hedef)
+                except Exception as hata:
+                    # Hesaplamadaki bir hata bağlantıyı yanıtsız kapatmasın
+                    print(f"İstek işlenemedi ({hedef}): {hata!r}", file=sys.stderr)
+                    self.metrikler.hata += 1
+                    durum, govde = 500, {"hata": f"Sunucu hatası: {type(hata).__name__}"}
+                await self._yaz(writer, durum, govde, acik_kal)
+                rota_istegi = hedef.startswith("/rota")
+                self.metrikler.kaydet(durum, (time.perf_counter() - bas) * 1000 if rota_istegi else None)
+                if not acik_kal:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def baslat(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Sunucuyu başlatır ve asyncio sunucu nesnesini döndürür"""
+        await self._havuzu_ac()
+        return await asyncio.start_server(self._baglanti, host, port, limit=EN_FAZLA_BASLIK)
+
+    async def calistir(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Sunucuyu başlatır ve kapatılana kadar istekleri yanıtlar"""
+        sunucu = await self.baslat(host, port)
+        adresler = ", ".join(f"{a[0]}:{a[1]}" for a in (s.getsockname() for s in sunucu.sockets))
+        print(f"Metro rota sunucusu dinleniyor: {adresler} ({len(self.ag)} istasyon, "
+              f"{self.havuz_turu} havuzu, {self.isci_sayisi} işçi)")
+        try:
+            async with sunucu:
+                await sunucu.serve_forever()
+        finally:
+            self.kapat()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Yerel metro rota sunucusu (JSON/HTTP)")
+    ag_kaynagi_ekle(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--havuz", choices=("iplik", "surec"), default="iplik")
+    parser.add_argument("--isci", type=int, help="Havuzdaki işçi sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--en-fazla-bekleyen", type=int, default=1024,
+                        help="Uçuştaki benzersiz arama sınırı; aşılınca 503 döner")
+    parser.add_argument("--onbellek", type=int, default=0,
+                        help="Rota önbelleği kapasitesi (0: kapalı; yalnızca iplik havuzunda)")
+    parser.add_argument("--ch", action="store_true", help="Contraction Hierarchies hazırla")
+    args = parser.parse_args(argv)
+
+    metro = ag_yukle(args)
+    if args.onbellek:
+        metro.onbellegi_etkinlestir(args.onbellek)
+    if args.ch:
+        metro.ch_hazirla()
+    sunucu = RotaSunucusu(metro, args.havuz, args.isci, args.en_fazla_bekleyen)
+    try:
+        asyncio.run(sunucu.calistir(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Sunucu kapatıldı.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())